@@ -0,0 +1,89 @@
+import csv
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from compute_backend import analysis_indices, count_distribution, get_backend, magnitude_mean
+from data_import import load_log
+from path_visualization import PathVisualization
+
+SUMMARY_FIELDS = ["file", "samples", "duration_hours", "g_magnitude", "analysis_g_magnitude", "distribution", "analysis_distribution", "error"]
+
+def expand_inputs(patterns):
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.csv"))
+        else:
+            matches = glob.glob(pattern)
+        files.extend(sorted(matches))
+    return list(dict.fromkeys(files))
+
+def process_log(file_path, start_analysis=None, end_analysis=None, backend=None):
+    return log_summary(file_path, log_results(file_path, start_analysis, end_analysis, backend), start_analysis, end_analysis)
+
+def log_results(file_path, start_analysis=None, end_analysis=None, backend=None):
+    time_in_hours, x, y, z = load_log(file_path)
+    if end_analysis is not None and end_analysis > time_in_hours[-1]:
+        raise ValueError("Upper bound for time period of analysis exceeds the final timestamp available in the CSV file.")
+    if start_analysis is not None and end_analysis is not None and end_analysis <= start_analysis:
+        raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
+
+    backend = get_backend(backend)
+    measurements = np.vstack([x, y, z])
+    sphere_coords = PathVisualization(file_path, [], [], [], backend=backend)._create_sphere()
+    return {
+        "time_in_hours": time_in_hours,
+        "measurements": measurements,
+        "averages": backend.time_average(measurements),
+        "segment_ids": backend.segment_ids(measurements[0], measurements[1], measurements[2], sphere_coords),
+    }
+
+def log_summary(file_path, results, start_analysis=None, end_analysis=None):
+    time_in_hours, averages, segment_ids = results["time_in_hours"], results["averages"], results["segment_ids"]
+    row = {
+        "file": file_path,
+        "samples": len(time_in_hours),
+        "duration_hours": float(time_in_hours[-1] - time_in_hours[0]),
+        "g_magnitude": float(magnitude_mean(averages)),
+        "distribution": count_distribution(segment_ids),
+    }
+    if start_analysis is not None and end_analysis is not None:
+        start_index, end_index = analysis_indices(time_in_hours, start_analysis, end_analysis)
+        row["analysis_g_magnitude"] = float(magnitude_mean(averages, start_index, end_index))
+        row["analysis_distribution"] = count_distribution(segment_ids[start_index:end_index])
+    return row
+
+def run_batch(files, start_analysis=None, end_analysis=None, backend=None, workers=None, progress=None):
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_log, file_path, start_analysis, end_analysis, backend): file_path for file_path in files}
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                row = {"file": file_path, "error": str(e) or type(e).__name__}
+            rows[file_path] = row
+            if progress:
+                progress(len(rows), len(files), row)
+    return [rows[file_path] for file_path in files]
+
+def format_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.3g}"
+    return str(value)
+
+def summary_table(rows):
+    header = ["File", "Samples", "Duration (h)", "Magnitude", "Magnitude (analysis)", "Distribution", "Distribution (analysis)", "Error"]
+    lines = [header] + [[os.path.basename(row["file"])] + [format_value(row.get(field)) for field in SUMMARY_FIELDS[1:]] for row in rows]
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in lines)
+
+def write_summary_csv(file_path, rows):
+    with open(file_path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
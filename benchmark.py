@@ -0,0 +1,300 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.animation as animation
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+from compute_backend import ParallelBackend, available_backends, count_distribution, get_backend
+from data_import import import_sci_spinner_format_data
+from instrumentation import peak_rss_bytes
+from math_model import MathModel
+from path_visualization import PathVisualization
+from gui import SCRIPT_DIR, configure_3d_axes, save_distribution_animation, write_components_csv, write_magnitude_csv
+
+MODEL_SCALES = {"1h": 1, "24h": 24, "7d": 168}
+CSV_SCALES = {"1e5": 10**5, "1e6": 10**6, "1e7": 10**7}
+ANIMATION_SCALES = {"100f": 100, "500f": 500}
+STARTUP_SCALES = {"import": "import", "window": "window"}
+STARTUP_TARGET_SECONDS = 2.0
+REFERENCE_HOURS = 0.5
+TOLERANCE = 1e-9
+REFERENCE_WORKERS = 4
+REFERENCE_BLOCK_SIZE = 1024
+CSV_CHUNK_ROWS = 10**6
+
+def synthetic_model(duration_hours):
+    return MathModel(2.0, 3.3, 0.05, 0.05, 0.05, duration_hours, 10.0, 25.0)
+
+def synthetic_series(rows):
+    time_in_seconds = np.arange(rows) * 0.1
+    theta = time_in_seconds * 0.3
+    return time_in_seconds, np.cos(theta) * 9.80665, np.sin(theta) * 9.80665, np.sin(theta * 0.7) * 9.80665
+
+def write_synthetic_csv(file_path, rows):
+    with open(file_path, 'w', newline='') as file:
+        file.write("timestamp,x_acc,y_acc,z_acc\n")
+        for start in range(0, rows, CSV_CHUNK_ROWS):
+            chunk = np.column_stack(synthetic_series(min(CSV_CHUNK_ROWS, rows - start)))
+            chunk[:, 0] += start * 0.1
+            np.savetxt(file, chunk, delimiter=',', fmt='%.6f')
+
+def timed(function, *args):
+    peak = traced_peak(function, *args)
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result, {"peak_alloc_mb": peak / 2**20}
+
+def traced_peak(function, *args):
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(1)
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    try:
+        function(*args)
+        return max(tracemalloc.get_traced_memory()[1] - base, 0)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+def bench_model(scale, backend):
+    model = synthetic_model(MODEL_SCALES[scale])
+    wall_time, (time_array, _, _), memory = timed(model.calculate_acceleration)
+    return wall_time, len(time_array), memory
+
+def bench_pipeline(scale, backend):
+    model = synthetic_model(MODEL_SCALES[scale])
+    backend = get_backend(backend)
+    sphere_coords = PathVisualization("benchmark", [], [], [], backend=backend)._create_sphere()
+    backend.run(synthetic_model(REFERENCE_HOURS), sphere_coords)
+    wall_time, result, memory = timed(backend.run, model, sphere_coords)
+    return wall_time, len(result[0]), memory
+
+def bench_distribution(scale, backend):
+    _, g_array, _ = synthetic_model(MODEL_SCALES[scale]).calculate_acceleration()
+    PathVisualization("benchmark", g_array[0][:100], g_array[1][:100], g_array[2][:100], backend=backend).get_distribution()
+    path_vis = PathVisualization("benchmark", g_array[0], g_array[1], g_array[2], backend=backend)
+    wall_time, _, memory = timed(path_vis.get_distribution)
+    return wall_time, g_array.shape[1], memory
+
+def bench_import(scale, backend):
+    rows = CSV_SCALES[scale]
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "import.csv")
+        write_synthetic_csv(file_path, rows)
+        wall_time, _, memory = timed(import_sci_spinner_format_data, file_path)
+    return wall_time, rows, memory
+
+def bench_export_magnitude(scale, backend):
+    rows = CSV_SCALES[scale]
+    time_in_seconds, x, y, z = synthetic_series(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        wall_time, _, memory = timed(write_magnitude_csv, os.path.join(directory, "magnitude.csv"), time_in_seconds / 3600, np.sqrt(x**2 + y**2 + z**2))
+    return wall_time, rows, memory
+
+def bench_export_components(scale, backend):
+    rows = CSV_SCALES[scale]
+    time_in_seconds, x, y, z = synthetic_series(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        wall_time, _, memory = timed(write_components_csv, os.path.join(directory, "components.csv"), time_in_seconds / 3600, x, y, z)
+    return wall_time, rows, memory
+
+def bench_export_animation(scale, backend):
+    bundled_ffmpeg = os.path.join(SCRIPT_DIR, 'ffmpeg', 'ffmpeg.exe')
+    if sys.platform == "win32" and os.path.exists(bundled_ffmpeg):
+        matplotlib.rcParams['animation.ffmpeg_path'] = bundled_ffmpeg
+    if not animation.FFMpegWriter.isAvailable():
+        raise RuntimeError("skipped: ffmpeg is not available")
+    frames = ANIMATION_SCALES[scale]
+    _, x, y, z = synthetic_series(frames)
+    with tempfile.TemporaryDirectory() as directory:
+        wall_time, _, memory = timed(save_distribution_animation, os.path.join(directory, "animation.mp4"), x / 9.80665, y / 9.80665, z / 9.80665)
+    return wall_time, frames, memory
+
+def bench_render(scale, backend):
+    time_array, g_array, _ = synthetic_model(MODEL_SCALES[scale]).calculate_acceleration()
+    magnitude = np.sqrt(np.sum((np.cumsum(g_array, axis=1) / np.arange(1, g_array.shape[1] + 1))**2, axis=0))
+
+    line_figure = plt.Figure()
+    FigureCanvasAgg(line_figure)
+    line_figure.add_subplot(1, 1, 1).plot(time_array / 3600, magnitude, color='#0066b2')
+    distribution_figure = plt.Figure()
+    FigureCanvasAgg(distribution_figure)
+    distribution_ax = distribution_figure.add_subplot(1, 1, 1, projection='3d')
+    distribution_ax.plot(g_array[0], g_array[1], g_array[2], color='#0066b2', linewidth=1)
+    configure_3d_axes(distribution_ax, "Orientation Distribution")
+
+    def draw():
+        line_figure.canvas.draw()
+        distribution_figure.canvas.draw()
+
+    wall_time, _, memory = timed(draw)
+    return wall_time, len(time_array), memory
+
+def bench_startup(scale, backend):
+    if scale == "import":
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import gui"], cwd=SCRIPT_DIR, check=True)
+        wall_time = time.perf_counter() - start
+    else:
+        if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+            raise RuntimeError("skipped: no display")
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = os.path.join(directory, "startup.json")
+            subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, "gui.py"), "--startup-report", report_path, "--exit-after-startup"], cwd=SCRIPT_DIR, check=True)
+            with open(report_path) as file:
+                wall_time = json.load(file)["time_to_interactive"]
+    return wall_time, None, {"target": STARTUP_TARGET_SECONDS, "met": wall_time <= STARTUP_TARGET_SECONDS}
+
+CASES = {
+    "model": (bench_model, MODEL_SCALES, False),
+    "pipeline": (bench_pipeline, MODEL_SCALES, True),
+    "distribution": (bench_distribution, MODEL_SCALES, True),
+    "import": (bench_import, CSV_SCALES, False),
+    "export_magnitude": (bench_export_magnitude, CSV_SCALES, False),
+    "export_components": (bench_export_components, CSV_SCALES, False),
+    "export_animation": (bench_export_animation, ANIMATION_SCALES, False),
+    "render": (bench_render, MODEL_SCALES, False),
+    "startup": (bench_startup, STARTUP_SCALES, False),
+}
+
+def run_case(case, scale, backend):
+    function = CASES[case][0]
+    result = {"case": case, "scale": scale, "backend": backend}
+    try:
+        wall_time, samples, *extra = function(scale, backend)
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+    for fields in extra:
+        result.update(fields)
+    result["wall_time"] = wall_time
+    result["samples"] = samples
+    result["throughput"] = samples / wall_time if samples and wall_time > 0 else None
+    result.setdefault("peak_alloc_mb", None)
+    peak = peak_rss_bytes()
+    result["peak_rss_mb"] = peak / 2**20 if peak is not None else None
+    return result
+
+def reference_backend(name):
+    backend = get_backend(name)
+    if isinstance(backend, ParallelBackend):
+        backend.workers, backend.min_samples, backend.block_size = REFERENCE_WORKERS, 0, REFERENCE_BLOCK_SIZE
+    return backend
+
+def verify_fast_paths():
+    model = synthetic_model(REFERENCE_HOURS)
+    time_array, g_ref, a_ref = model.calculate_acceleration()
+    counts = np.arange(1, len(time_array) + 1)
+    g_avg_ref = np.cumsum(g_ref, axis=1) / counts
+    a_avg_ref = np.cumsum(a_ref, axis=1) / counts
+    path_vis = PathVisualization("reference", g_ref[0], g_ref[1], g_ref[2])
+    sphere_coords = path_vis._create_sphere()
+    distribution_ref = path_vis._get_distribution_num(sphere_coords)
+
+    checks = []
+    for name in available_backends():
+        backend = reference_backend(name)
+        time_fast, g_array, a_array, g_avg, a_avg, segment_ids = backend.run(model, sphere_coords)
+        max_error = max(float(np.max(np.abs(fast - ref))) for fast, ref in [(time_fast, time_array), (g_array, g_ref), (a_array, a_ref), (g_avg, g_avg_ref), (a_avg, a_avg_ref)])
+        distribution = count_distribution(segment_ids)
+        distribution_path = count_distribution(backend.segment_ids(g_ref[0], g_ref[1], g_ref[2], sphere_coords))
+        checks.append({
+            "backend": name,
+            "samples": len(time_array),
+            "max_error": max_error,
+            "distribution": distribution,
+            "distribution_segment_search": distribution_path,
+            "distribution_reference": distribution_ref,
+            "passed": max_error <= TOLERANCE and distribution == distribution_ref and distribution_path == distribution_ref,
+        })
+    return checks
+
+def environment():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "backends": available_backends(),
+    }
+
+def compare(results, previous):
+    old = {(r["case"], r["scale"], r["backend"]): r for r in previous["results"] if "wall_time" in r}
+    for result in results:
+        key = (result["case"], result["scale"], result["backend"])
+        if key in old and "wall_time" in result:
+            speedup = old[key]["wall_time"] / result["wall_time"]
+            print(f"{result['case']:<18} {result['scale']:<6} {result['backend'] or '-':<10} {old[key]['wall_time']:>10.3f}s -> {result['wall_time']:>10.3f}s  x{speedup:.2f}")
+
+def print_result(result):
+    label = f"{result['case']:<18} {result['scale']:<6} {result['backend'] or '-':<10}"
+    if "error" in result:
+        print(f"{label} {result['error']}")
+    else:
+        throughput = f"{result['throughput']:>14,.0f} samples/s" if result["throughput"] is not None else f"{'-':>14}          "
+        memory = f"{result['peak_alloc_mb']:>10.1f} MB" if result["peak_alloc_mb"] is not None else f"{'-':>10}   "
+        line = f"{label} {result['wall_time']:>10.3f}s {throughput} {memory}"
+        if "target" in result:
+            line += f"  target {result['target']:.1f}s {'met' if result['met'] else 'MISSED'}"
+        print(line)
+
+def build_parser():
+    arg_parser = argparse.ArgumentParser(description="Kinematics Model benchmarks")
+    arg_parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    arg_parser.add_argument("--scales", nargs="+", help="limit to these scales (e.g. 1h 24h 1e5)")
+    arg_parser.add_argument("--quick", action="store_true", help="run only the smallest scale of each case")
+    arg_parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write results to")
+    arg_parser.add_argument("--compare", help="previous JSON results to compare against")
+    return arg_parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    checks = verify_fast_paths()
+    for check in checks:
+        status = "ok" if check["passed"] else "MISMATCH"
+        print(f"check {check['backend']:<6} max error {check['max_error']:.3g}, distribution {check['distribution']}/{check['distribution_reference']} {status}")
+
+    jobs = []
+    for case in args.cases:
+        _, scales, per_backend = CASES[case]
+        selected = list(scales)[:1] if args.quick else [s for s in scales if not args.scales or s in args.scales]
+        for scale in selected:
+            for backend in (available_backends() if per_backend else [None]):
+                jobs.append((case, scale, backend))
+
+    results = []
+    context = mp.get_context("spawn")
+    for job in jobs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_case, *job).result()
+        print_result(result)
+        results.append(result)
+
+    with open(args.output, 'w') as file:
+        json.dump({"environment": environment(), "checks": checks, "results": results}, file, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+    return 0 if all(check["passed"] for check in checks) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+import argparse
+import json
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+import numpy as np
+from batch import expand_inputs, run_batch, summary_table, write_summary_csv
+from comparison import compare, write_comparison_csv
+from compute_backend import DEFAULT_BACKEND, analysis_indices, count_distribution, get_backend, magnitude_mean
+from convergence import DEFAULT_THRESHOLD, DEFAULT_WINDOWS_HOURS, convergence, write_convergence_csv
+from data_import import load_log
+from identification import fit_parameters
+from field_map import FIELD_GRID_POINTS, field_grid, offset_grid, write_field_csv
+from instrumentation import DEFAULT_LOG_DIR, NullInstrumentation, PipelineInstrumentation, ProfileCapture
+from math_model import MathModel
+from memory_budget import budget_bytes, estimate_run, estimate_text, load_calibration, lower_sample_interval, record_run
+from optimizer import DEFAULT_WEIGHTS, OperatingPointOptimizer
+from path_visualization import PathVisualization
+from progressive import preview_run, preview_strides, preview_summary
+from spectrum import DEFAULT_SEGMENT_SECONDS, spectrum, write_spectrum_csv
+from sphere_index import DEFAULT_LEVELS, coverage_profile
+from streaming import DEFAULT_REFRESH_HZ, UNIT_SCALES, StreamAccumulator, StreamReader, open_source
+
+def run_theoretical(inner_rpm, outer_rpm, distance_cm, duration_hours, inner_position=0.0, outer_position=0.0, start_analysis=None, end_analysis=None, backend=None, instrumentation=None, scratch_dir=None, coverage_levels=None, preview=False, sample_interval=0.1):
+    instrumentation = instrumentation or NullInstrumentation()
+    if start_analysis is not None and end_analysis is not None:
+        if end_analysis <= start_analysis:
+            raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
+        if end_analysis > duration_hours:
+            raise ValueError("Upper bound for time period of analysis must be ≤ the simulation duration.")
+
+    delta_m = distance_cm / 100
+    model = MathModel(inner_rpm, outer_rpm, delta_m, delta_m, delta_m, duration_hours, inner_position, outer_position, sample_interval, scratch_dir)
+    backend = get_backend(backend)
+    sphere_coords = PathVisualization("theoretical", [], [], [], backend=backend)._create_sphere()
+    if preview:
+        strides = preview_strides(model)
+        if not strides:
+            print(f"Preview skipped: {model.sample_count()} samples is small enough to run exactly.", file=sys.stderr)
+        for stride in strides:
+            with instrumentation.stage("preview") as stage:
+                result = preview_run(model, stride, sphere_coords, backend)
+                stage["samples"] = len(result["time_array"])
+            print(json.dumps({"preview": preview_summary(result)}), file=sys.stderr)
+    time_array, g_array, a_array, g_avg, a_avg, segment_ids = backend.run(model, sphere_coords, instrumentation)
+    summary = theoretical_summary(backend.name, time_array, g_avg, a_avg, segment_ids, start_analysis, end_analysis)
+    if coverage_levels is not None:
+        with instrumentation.stage("coverage", len(time_array)):
+            summary["coverage_profile"] = coverage_profile(g_array, coverage_levels)
+    return summary
+
+def theoretical_summary(backend_name, time_array, g_avg, a_avg, segment_ids, start_analysis=None, end_analysis=None):
+    summary = {
+        "backend": backend_name,
+        "samples": len(time_array),
+        "g_magnitude": float(magnitude_mean(g_avg)),
+        "non_g_magnitude": float(magnitude_mean(a_avg)),
+        "distribution": count_distribution(segment_ids),
+    }
+
+    if start_analysis is not None and end_analysis is not None:
+        start_index, end_index = analysis_indices(time_array, start_analysis, end_analysis, 3600)
+        summary["analysis_g_magnitude"] = float(magnitude_mean(g_avg, start_index, end_index))
+        summary["analysis_non_g_magnitude"] = float(magnitude_mean(a_avg, start_index, end_index))
+        summary["analysis_distribution"] = count_distribution(segment_ids[start_index:end_index])
+
+    return summary
+
+def check_memory_budget(args):
+    calibration = load_calibration()
+    budget = budget_bytes(calibration) if args.memory_budget is None else args.memory_budget * 2**20
+    backend_name = get_backend(args.backend).name
+    samples = MathModel(0.0, 0.0, 0.0, 0.0, 0.0, args.duration, 0.0, 0.0, args.sample_interval).sample_count()
+    estimate = estimate_run(samples, backend_name, args.scratch_dir is not None, calibration)
+    if not budget or estimate["peak_bytes"] <= budget:
+        return estimate
+    print(f"Estimated {estimate_text(estimate, budget)}.", file=sys.stderr)
+    disk_estimate = estimate_run(samples, backend_name, True, calibration)
+    if args.scratch_dir is None and disk_estimate["peak_bytes"] <= budget:
+        print(f"Store the results on disk with --scratch-dir DIR ({estimate_text(disk_estimate)}).", file=sys.stderr)
+    interval = lower_sample_interval(args.duration, args.sample_interval, backend_name, budget, calibration)
+    if interval is not None:
+        print(f"Or sample less often with --sample-interval {interval:g}.", file=sys.stderr)
+    print("Pass --memory-budget 0 to run anyway.", file=sys.stderr)
+    return None
+
+def build_parser():
+    arg_parser = argparse.ArgumentParser(description="Kinematics Model (headless)")
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    theoretical = subparsers.add_parser("theoretical", help="run the theoretical model")
+    theoretical.add_argument("--inner-rpm", type=float, default=0.0)
+    theoretical.add_argument("--outer-rpm", type=float, default=0.0)
+    theoretical.add_argument("--inner-position", type=float, default=0.0, help="initial inner angular position (deg)")
+    theoretical.add_argument("--outer-position", type=float, default=0.0, help="initial outer angular position (deg)")
+    theoretical.add_argument("--distance", type=float, default=0.0, help="distance from center (cm)")
+    theoretical.add_argument("--duration", type=float, required=True, help="simulation duration (h)")
+    theoretical.add_argument("--start-analysis", type=float, help="start of the time period of analysis (h)")
+    theoretical.add_argument("--end-analysis", type=float, help="end of the time period of analysis (h)")
+    theoretical.add_argument("--coverage-levels", type=int, nargs="?", const=DEFAULT_LEVELS, metavar="LEVELS", help="also report coverage at every level of the subdivided-icosahedron sphere index up to LEVELS")
+    theoretical.add_argument("--sample-interval", type=float, default=0.1, help="seconds between model samples")
+    theoretical.add_argument("--memory-budget", type=float, metavar="MB", help="refuse runs estimated to need more memory (default: configured budget or half of physical memory; 0 disables the check)")
+    theoretical.add_argument("--preview", action="store_true", help="print subsampled estimates with error bars to stderr before the exact run")
+    theoretical.add_argument("--backend", choices=["auto", "numpy", "numba", "parallel", "recurrence"], default=DEFAULT_BACKEND)
+    theoretical.add_argument("--log-file", help="append per-stage timings as JSON lines to this file")
+    theoretical.add_argument("--scratch-dir", help="store results in memory-mapped files under this directory instead of RAM")
+    theoretical.add_argument("--profile", nargs="?", const=DEFAULT_LOG_DIR, metavar="DIR", help="write a cProfile/tracemalloc report of the run to DIR")
+
+    batch = subparsers.add_parser("batch", help="process a folder or glob of experimental CSV logs")
+    batch.add_argument("inputs", nargs="+", help="folders (all *.csv inside) or glob patterns")
+    batch.add_argument("--start-analysis", type=float, help="start of the time period of analysis (h)")
+    batch.add_argument("--end-analysis", type=float, help="end of the time period of analysis (h)")
+    batch.add_argument("--backend", choices=["auto", "numpy", "numba", "parallel", "recurrence"], default=DEFAULT_BACKEND)
+    batch.add_argument("--workers", type=int, help="number of worker processes (default: CPU count)")
+    batch.add_argument("--output", help="write the summary table to this CSV file")
+
+    field = subparsers.add_parser("field", help="map the time-averaged non-gravitational acceleration over a grid of offsets")
+    field.add_argument("--inner-rpm", type=float, default=0.0)
+    field.add_argument("--outer-rpm", type=float, default=0.0)
+    field.add_argument("--inner-position", type=float, default=0.0, help="initial inner angular position (deg)")
+    field.add_argument("--outer-position", type=float, default=0.0, help="initial outer angular position (deg)")
+    field.add_argument("--duration", type=float, required=True, help="simulation duration (h)")
+    field.add_argument("--half-extent", type=float, required=True, help="half-size of the cubic sample volume (cm)")
+    field.add_argument("--points", type=int, default=FIELD_GRID_POINTS, help="grid points per axis")
+    field.add_argument("--output", help="write x, y, z (cm) and magnitude (g) per grid point to this CSV file")
+
+    optimize = subparsers.add_parser("optimize", help="recommend inner/outer rpm for a sample distance and duration")
+    optimize.add_argument("--distance", type=float, default=0.0, help="distance from center (cm)")
+    optimize.add_argument("--duration", type=float, required=True, help="simulation duration (h)")
+    optimize.add_argument("--inner-range", type=float, nargs=2, default=(0.5, 10.0), metavar=("MIN", "MAX"), help="inner rpm search range")
+    optimize.add_argument("--outer-range", type=float, nargs=2, default=(0.5, 10.0), metavar=("MIN", "MAX"), help="outer rpm search range")
+    optimize.add_argument("--step", type=float, default=0.5, help="rpm grid step before refinement")
+    optimize.add_argument("--angle-step", type=float, help="also search initial angular positions in steps of this many degrees")
+    optimize.add_argument("--weights", type=float, nargs=3, default=DEFAULT_WEIGHTS, metavar=("G", "NON_G", "COVERAGE"), help="cost weights for g magnitude, non-g magnitude and (1 - coverage)")
+    optimize.add_argument("--finalists", type=int, default=5, help="candidates refined at full resolution")
+    optimize.add_argument("--workers", type=int, help="evaluation threads (default: CPU count)")
+    optimize.add_argument("--backend", choices=["auto", "numpy", "numba", "parallel", "recurrence"], default=DEFAULT_BACKEND)
+
+    comparison = subparsers.add_parser("compare", help="compare an experimental CSV log with the model evaluated at its timestamps")
+    comparison.add_argument("log", help="experimental CSV log")
+    comparison.add_argument("--inner-rpm", type=float, default=0.0)
+    comparison.add_argument("--outer-rpm", type=float, default=0.0)
+    comparison.add_argument("--inner-position", type=float, default=0.0, help="initial inner angular position (deg)")
+    comparison.add_argument("--outer-position", type=float, default=0.0, help="initial outer angular position (deg)")
+    comparison.add_argument("--distance", type=float, default=0.0, help="distance from center (cm)")
+    comparison.add_argument("--output", help="write time, measured, theory and residual components to this CSV file")
+
+    report = subparsers.add_parser("convergence", help="report how quickly the time-averaged gravity settles, cumulatively and over sliding windows")
+    source = report.add_mutually_exclusive_group(required=True)
+    source.add_argument("--log", help="experimental CSV log")
+    source.add_argument("--duration", type=float, help="simulation duration (h) of a theoretical run")
+    report.add_argument("--inner-rpm", type=float, default=0.0)
+    report.add_argument("--outer-rpm", type=float, default=0.0)
+    report.add_argument("--inner-position", type=float, default=0.0, help="initial inner angular position (deg)")
+    report.add_argument("--outer-position", type=float, default=0.0, help="initial outer angular position (deg)")
+    report.add_argument("--distance", type=float, default=0.0, help="distance from center (cm)")
+    report.add_argument("--windows", type=float, nargs="+", default=DEFAULT_WINDOWS_HOURS, metavar="HOURS", help="sliding window lengths (h)")
+    report.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="time-averaged magnitude regarded as converged (g)")
+    report.add_argument("--output", help="write the cumulative and sliding-window magnitudes over time to this CSV file")
+
+    psd = subparsers.add_parser("spectrum", help="Welch power spectral density of the x/y/z acceleration components")
+    source = psd.add_mutually_exclusive_group(required=True)
+    source.add_argument("--log", help="experimental CSV log")
+    source.add_argument("--duration", type=float, help="simulation duration (h) of a theoretical run")
+    psd.add_argument("--inner-rpm", type=float, default=0.0)
+    psd.add_argument("--outer-rpm", type=float, default=0.0)
+    psd.add_argument("--inner-position", type=float, default=0.0, help="initial inner angular position (deg)")
+    psd.add_argument("--outer-position", type=float, default=0.0, help="initial outer angular position (deg)")
+    psd.add_argument("--distance", type=float, default=0.0, help="distance from center (cm)")
+    psd.add_argument("--start-analysis", type=float, help="start of the analysis window (h)")
+    psd.add_argument("--end-analysis", type=float, help="end of the analysis window (h)")
+    psd.add_argument("--segment-seconds", type=float, default=DEFAULT_SEGMENT_SECONDS, help="Welch segment length (s); longer segments resolve finer frequencies")
+    psd.add_argument("--output", help="write the frequency and x/y/z power spectral densities to this CSV file")
+
+    fit = subparsers.add_parser("fit", help="estimate rpm, initial positions and sensor offset from an experimental CSV log")
+    fit.add_argument("log", help="experimental CSV log")
+
+    live = subparsers.add_parser("live", help="analyse accelerometer samples as they stream in")
+    live.add_argument("source", help="tcp://host:port, udp://host:port, or a growing file / named pipe")
+    live.add_argument("--units", choices=list(UNIT_SCALES), default="g", help="units of the x, y, z columns")
+    live.add_argument("--from-start", action="store_true", help="read a growing file from the beginning instead of tailing it")
+    live.add_argument("--duration", type=float, help="stop after this many seconds")
+    live.add_argument("--refresh-rate", type=float, default=DEFAULT_REFRESH_HZ, help="status updates per second")
+    live.add_argument("--backend", choices=["auto", "numpy", "numba", "parallel", "recurrence"], default=DEFAULT_BACKEND)
+    return arg_parser
+
+def run_field(inner_rpm, outer_rpm, half_extent_cm, duration_hours, inner_position=0.0, outer_position=0.0, points=FIELD_GRID_POINTS):
+    model = MathModel(inner_rpm, outer_rpm, 0.0, 0.0, 0.0, duration_hours, inner_position, outer_position)
+    axis, values = field_grid(model, half_extent_cm / 100, points)
+    _, offsets = offset_grid(half_extent_cm / 100, points)
+    magnitudes = values.ravel()
+    summary = {
+        "points": len(magnitudes),
+        "mean": float(np.mean(magnitudes)),
+        "max": float(np.max(magnitudes)),
+        "max_offset_cm": (offsets[np.argmax(magnitudes)] * 100).tolist(),
+    }
+    return summary, offsets, magnitudes
+
+def run_compare(file_path, inner_rpm, outer_rpm, distance_cm, inner_position=0.0, outer_position=0.0):
+    time_in_hours, x, y, z = load_log(file_path)
+    delta_m = distance_cm / 100
+    model = MathModel(inner_rpm, outer_rpm, delta_m, delta_m, delta_m, time_in_hours[-1] - time_in_hours[0], inner_position, outer_position)
+    return compare(model, time_in_hours, x, y, z)
+
+def run_convergence(args):
+    if args.log is not None:
+        time_in_hours, x, y, z = load_log(args.log)
+        return convergence(time_in_hours, np.vstack([x, y, z]), args.windows, args.threshold)
+    delta_m = args.distance / 100
+    model = MathModel(args.inner_rpm, args.outer_rpm, delta_m, delta_m, delta_m, args.duration, args.inner_position, args.outer_position)
+    time_array, g_array, _ = model.calculate_acceleration()
+    return convergence(time_array, g_array, args.windows, args.threshold, scale=3600)
+
+def run_spectrum(args):
+    if args.log is not None:
+        time_values, x, y, z = load_log(args.log)
+        components, scale = np.vstack([x, y, z]), 1
+    else:
+        delta_m = args.distance / 100
+        model = MathModel(args.inner_rpm, args.outer_rpm, delta_m, delta_m, delta_m, args.duration, args.inner_position, args.outer_position)
+        time_values, components, _ = model.calculate_acceleration()
+        scale = 3600
+    start, end = 0, None
+    if args.start_analysis is not None and args.end_analysis is not None:
+        if args.end_analysis <= args.start_analysis:
+            raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
+        start, end = analysis_indices(time_values, args.start_analysis, args.end_analysis, scale)
+    return spectrum(time_values, components, start, end, 3600 / scale, args.segment_seconds)
+
+def run_live(args):
+    reader = StreamReader(open_source(args.source, args.from_start), UNIT_SCALES[args.units]).start()
+    accumulator = StreamAccumulator(args.backend)
+    start = time.perf_counter()
+    try:
+        while not reader.finished and (args.duration is None or time.perf_counter() - start < args.duration):
+            time.sleep(1 / args.refresh_rate)
+            accumulator.update(reader.drain())
+            print(f"\r{accumulator.count} samples  magnitude {accumulator.mean_magnitude:.3g}  distribution {accumulator.distribution}", end="", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    reader.stop()
+    print(file=sys.stderr)
+    print(json.dumps(accumulator.summary(), indent=2))
+    if reader.error is not None:
+        print(f"Stream error: {reader.error}", file=sys.stderr)
+        return 1
+    return 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "theoretical":
+        estimate = check_memory_budget(args)
+        if estimate is None:
+            return 1
+        instrumentation = PipelineInstrumentation(args.log_file)
+        instrumentation.start_run("Theoretical", backend=args.backend)
+        profile = ProfileCapture(args.profile) if args.profile else None
+        scratch = tempfile.TemporaryDirectory(prefix="kinematics-", dir=args.scratch_dir) if args.scratch_dir else nullcontext()
+        with profile or nullcontext(), scratch as scratch_dir:
+            summary = run_theoretical(args.inner_rpm, args.outer_rpm, args.distance, args.duration, args.inner_position, args.outer_position, args.start_analysis, args.end_analysis, args.backend, instrumentation, scratch_dir, args.coverage_levels, args.preview, args.sample_interval)
+        run = instrumentation.finish_run()
+        if profile is None:
+            record_run(summary["backend"], args.scratch_dir is not None, summary["samples"], instrumentation.run_peak_bytes(), run["wall_time"])
+        summary["estimate"] = estimate
+        summary["run_peak_mb"] = run["run_peak_mb"]
+        summary["stages"] = instrumentation.stages
+        print(json.dumps(summary, indent=2))
+        if profile is not None:
+            print(f"Profile saved to {profile.report_path}")
+    elif args.command == "batch":
+        files = expand_inputs(args.inputs)
+        if not files:
+            print("No CSV files found.", file=sys.stderr)
+            return 1
+        rows = run_batch(files, args.start_analysis, args.end_analysis, args.backend, args.workers,
+                         progress=lambda done, total, row: print(f"[{done}/{total}] {row['file']}" + (f": {row['error']}" if "error" in row else ""), file=sys.stderr))
+        print(summary_table(rows))
+        if args.output:
+            write_summary_csv(args.output, rows)
+            print(f"Summary saved to {args.output}")
+        return 1 if any("error" in row for row in rows) else 0
+    elif args.command == "field":
+        summary, offsets, magnitudes = run_field(args.inner_rpm, args.outer_rpm, args.half_extent, args.duration, args.inner_position, args.outer_position, args.points)
+        print(json.dumps(summary, indent=2))
+        if args.output:
+            write_field_csv(args.output, offsets, magnitudes)
+            print(f"Field saved to {args.output}")
+    elif args.command == "optimize":
+        optimizer = OperatingPointOptimizer(args.distance, args.duration, tuple(args.weights), args.backend, args.workers)
+        print(json.dumps(optimizer.run(tuple(args.inner_range), tuple(args.outer_range), args.step, args.angle_step, args.finalists), indent=2))
+    elif args.command == "compare":
+        result = run_compare(args.log, args.inner_rpm, args.outer_rpm, args.distance, args.inner_position, args.outer_position)
+        print(json.dumps(result["stats"], indent=2))
+        if args.output:
+            write_comparison_csv(args.output, result)
+            print(f"Comparison saved to {args.output}")
+    elif args.command == "convergence":
+        result = run_convergence(args)
+        print(json.dumps(result["stats"], indent=2))
+        if args.output:
+            write_convergence_csv(args.output, result)
+            print(f"Convergence saved to {args.output}")
+    elif args.command == "spectrum":
+        result = run_spectrum(args)
+        print(json.dumps(result["stats"], indent=2))
+        if args.output:
+            write_spectrum_csv(args.output, result)
+            print(f"Spectrum saved to {args.output}")
+    elif args.command == "fit":
+        time_in_hours, x, y, z = load_log(args.log)
+        result = fit_parameters(time_in_hours, x, y, z, progress=lambda stage, total, info: print(f"[{stage}/{total}] {info['span_hours']:.3g} h, {info['samples']} samples, RMS {info['rms']:.3g} g", file=sys.stderr))
+        print(json.dumps(result, indent=2))
+    elif args.command == "live":
+        return run_live(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
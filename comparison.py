@@ -0,0 +1,50 @@
+import numpy as np
+
+COMPONENTS = ("x", "y", "z")
+
+def time_average(values):
+    return np.cumsum(values, axis=-1) / np.arange(1, values.shape[-1] + 1)
+
+def residual_stats(measured, predicted):
+    residual = measured - predicted
+    correlated = np.std(measured) > 0 and np.std(predicted) > 0
+    return {
+        "bias": float(np.mean(residual)),
+        "rms": float(np.sqrt(np.mean(residual**2))),
+        "max_abs": float(np.max(np.abs(residual))),
+        "correlation": float(np.corrcoef(measured, predicted)[0, 1]) if correlated else None,
+    }
+
+def compare(model, time_in_hours, x, y, z):
+    time_in_hours = np.asarray(time_in_hours, dtype=np.float64)
+    measured = np.vstack([x, y, z]).astype(np.float64)
+    _, g_array, a_array = model.calculate_acceleration((time_in_hours - time_in_hours[0]) * 3600)
+    theory = g_array + a_array
+
+    measured_magnitude = np.sqrt(np.sum(time_average(measured)**2, axis=0))
+    theory_magnitude = np.sqrt(np.sum(time_average(theory)**2, axis=0))
+    stats = {component: residual_stats(measured[i], theory[i]) for i, component in enumerate(COMPONENTS)}
+    stats["magnitude"] = residual_stats(measured_magnitude, theory_magnitude)
+    stats["samples"] = len(time_in_hours)
+    return {
+        "time_in_hours": time_in_hours,
+        "measured": measured,
+        "theory": theory,
+        "measured_magnitude": measured_magnitude,
+        "theory_magnitude": theory_magnitude,
+        "stats": stats,
+    }
+
+def stats_text(stats):
+    lines = []
+    for key, label in (("x", "X"), ("y", "Y"), ("z", "Z"), ("magnitude", "Magnitude (time-averaged)")):
+        entry = stats[key]
+        correlation = "n/a" if entry["correlation"] is None else f"{entry['correlation']:.3f}"
+        lines.append(f"{label}: bias {entry['bias']:.3g} g, RMS {entry['rms']:.3g} g, max {entry['max_abs']:.3g} g, r = {correlation}")
+    return "\n".join(lines)
+
+def write_comparison_csv(file_path, result):
+    measured, theory = result["measured"], result["theory"]
+    columns = [result["time_in_hours"], *measured, *theory, *(measured - theory)]
+    header = "Time (h),X (g),Y (g),Z (g),Theory X (g),Theory Y (g),Theory Z (g),Residual X (g),Residual Y (g),Residual Z (g)"
+    np.savetxt(file_path, np.column_stack(columns), delimiter=',', header=header, comments='', fmt='%.9g')
@@ -0,0 +1,331 @@
+import contextlib
+import importlib.util
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+import numpy as np
+from instrumentation import NullInstrumentation
+from math_model import ANCHOR_INTERVAL
+
+OCTANTS = ['posI', 'posII', 'posIII', 'posIV', 'negI', 'negII', 'negIII', 'negIV']
+DEFAULT_BACKEND = "auto"
+SEGMENT_CHUNK_SIZE = 16384
+RESULT_CHUNK_SIZE = 1 << 20
+PARALLEL_MIN_SAMPLES = 1 << 20
+PARALLEL_BLOCK_SIZE = 1 << 18
+
+def octant_codes(x, y, z):
+    quadrant = np.where(y > 0, np.where(x > 0, 0, 1), np.where(x > 0, 3, 2))
+    return np.where(z > 0, 0, 4) + quadrant
+
+def octant_table(sphere_coords):
+    vertices = np.asarray(sphere_coords, dtype=np.float64).reshape(-1, 3)
+    codes = octant_codes(vertices[:, 0], vertices[:, 1], vertices[:, 2])
+    counts = np.bincount(codes, minlength=len(OCTANTS)).astype(np.int64)
+    table = np.full((len(OCTANTS), max(int(counts.max(initial=0)), 1)), -1, dtype=np.int64)
+    for code in range(len(OCTANTS)):
+        members = np.flatnonzero(codes == code)
+        table[code, :len(members)] = members
+    return vertices, table, counts
+
+def count_distribution(segment_ids):
+    if len(segment_ids) <= RESULT_CHUNK_SIZE:
+        return len(np.unique(segment_ids))
+    unique = np.empty(0, dtype=segment_ids.dtype)
+    for start in range(0, len(segment_ids), RESULT_CHUNK_SIZE):
+        unique = np.union1d(unique, segment_ids[start:start + RESULT_CHUNK_SIZE])
+    return len(unique)
+
+def segment_vertices(segment_ids, vertex_count):
+    base = vertex_count + 1
+    segment_ids = np.asarray(segment_ids, dtype=np.int64)
+    return np.stack([segment_ids // base**2, segment_ids // base % base, segment_ids % base], axis=-1)
+
+def segment_totals(segment_ids, weights=1.0):
+    unique, totals = np.empty(0, dtype=np.int64), np.empty(0)
+    for start in range(0, len(segment_ids), RESULT_CHUNK_SIZE):
+        chunk = np.asarray(segment_ids[start:start + RESULT_CHUNK_SIZE])
+        chunk_weights = np.asarray(weights[start:start + RESULT_CHUNK_SIZE]) if np.ndim(weights) else np.full(len(chunk), float(weights))
+        chunk_unique, inverse = np.unique(chunk, return_inverse=True)
+        unique, merged = np.unique(np.concatenate([unique, chunk_unique]), return_inverse=True)
+        totals = np.bincount(merged, weights=np.concatenate([totals, np.bincount(inverse, weights=chunk_weights, minlength=len(chunk_unique))]), minlength=len(unique))
+    return unique, totals
+
+def first_index_at(time_values, bound, scale=1):
+    index = int(np.searchsorted(time_values, bound * scale, side='left'))
+    while index > 0 and time_values[index - 1] / scale >= bound:
+        index -= 1
+    while index < len(time_values) and time_values[index] / scale < bound:
+        index += 1
+    return index
+
+def analysis_indices(time_values, start_analysis, end_analysis, scale=1):
+    return first_index_at(time_values, start_analysis, scale), first_index_at(time_values, end_analysis, scale)
+
+def magnitude_mean(components, start=0, end=None):
+    end = components.shape[-1] if end is None else end
+    total = 0.0
+    for chunk_start in range(start, end, RESULT_CHUNK_SIZE):
+        chunk = np.asarray(components[:, chunk_start:min(chunk_start + RESULT_CHUNK_SIZE, end)])
+        total += np.sum(np.sqrt(np.sum(chunk**2, axis=0)))
+    return total / (end - start) if end > start else np.nan
+
+def prefix_sums(components):
+    samples = components.shape[-1]
+    sums = np.empty((components.shape[0] + 1, samples + 1))
+    sums[:, 0] = 0.0
+    for start in range(0, samples, RESULT_CHUNK_SIZE):
+        chunk = np.asarray(components[:, start:start + RESULT_CHUNK_SIZE], dtype=np.float64)
+        end = start + chunk.shape[-1]
+        np.cumsum(np.vstack([np.sqrt(np.sum(chunk**2, axis=0)), chunk]), axis=1, out=sums[:, start + 1:end + 1])
+        sums[:, start + 1:end + 1] += sums[:, start:start + 1]
+    return sums
+
+def cumulative_sums(components):
+    sums = np.empty((components.shape[0], components.shape[-1] + 1))
+    sums[:, 0] = 0.0
+    for k, values in enumerate(components):
+        for start in range(0, len(values), RESULT_CHUNK_SIZE):
+            end = min(start + RESULT_CHUNK_SIZE, len(values))
+            np.cumsum(values[start:end], dtype=np.float64, out=sums[k, start + 1:end + 1])
+            sums[k, start + 1:end + 1] += sums[k, start]
+    return sums
+
+def window_means(sums, start, end):
+    if end <= start:
+        return np.full(len(sums), np.nan)
+    return (sums[:, end] - sums[:, start]) / (end - start)
+
+def decimated(values, max_points):
+    stride = max(1, -(-values.shape[-1] // max_points))
+    return np.asarray(values[..., ::stride])
+
+class NumpyBackend:
+    name = "numpy"
+    max_error = None
+
+    def calculate_acceleration(self, model):
+        return model.calculate_acceleration()
+
+    def time_average(self, components, out=None):
+        components = np.asarray(components, dtype=np.float64)
+        if out is None:
+            return np.cumsum(components, axis=-1) / np.arange(1, components.shape[-1] + 1)
+        carry = np.zeros(components.shape[:-1])
+        for start in range(0, components.shape[-1], RESULT_CHUNK_SIZE):
+            chunk = np.array(components[..., start:start + RESULT_CHUNK_SIZE])
+            chunk[..., 0] += carry
+            np.cumsum(chunk, axis=-1, out=chunk)
+            carry = chunk[..., -1].copy()
+            out[..., start:start + RESULT_CHUNK_SIZE] = chunk / np.arange(start + 1, start + chunk.shape[-1] + 1)
+        return out
+
+    def segment_ids(self, x, y, z, sphere_coords):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        z = np.asarray(z, dtype=np.float64)
+        vertices, table, counts = octant_table(sphere_coords)
+        base = len(vertices) + 1
+        codes = octant_codes(x, y, z)
+        ids = np.empty(len(x), dtype=np.int64)
+
+        for code in range(len(OCTANTS)):
+            members = table[code, :counts[code]]
+            oct_vertices = vertices[members]
+            sample_index = np.flatnonzero(codes == code)
+            for start in range(0, len(sample_index), SEGMENT_CHUNK_SIZE):
+                index = sample_index[start:start + SEGMENT_CHUNK_SIZE]
+                dist = np.sqrt((x[index, None] - oct_vertices[:, 0])**2 + (y[index, None] - oct_vertices[:, 1])**2 + (z[index, None] - oct_vertices[:, 2])**2)
+                nearest = members[np.argsort(dist, axis=1, kind='stable')[:, :3]]
+                key = np.zeros(len(index), dtype=np.int64)
+                for k in range(3):
+                    key = key * base + (nearest[:, k] if k < nearest.shape[1] else base - 1)
+                ids[index] = key
+        return ids
+
+    def run(self, model, sphere_coords, instrumentation=None):
+        instrumentation = instrumentation or NullInstrumentation()
+        with instrumentation.stage("model") as stage:
+            time_array, g_array, a_array = self.calculate_acceleration(model)
+            stage["samples"] = len(time_array)
+            if self.max_error is not None:
+                stage["max_error"] = self.max_error
+        with instrumentation.stage("averages", len(time_array)):
+            model.check_cancelled()
+            g_avg = self.time_average(g_array, model.allocate("g_avg", g_array.shape))
+            model.check_cancelled()
+            a_avg = self.time_average(a_array, model.allocate("a_avg", a_array.shape))
+        with instrumentation.stage("scoring", len(time_array)):
+            segments = model.allocate("segment_ids", len(time_array), np.int64)
+            for start in range(0, len(time_array), RESULT_CHUNK_SIZE):
+                model.check_cancelled()
+                chunk = g_array[:, start:start + RESULT_CHUNK_SIZE]
+                segments[start:start + RESULT_CHUNK_SIZE] = self.segment_ids(chunk[0], chunk[1], chunk[2], sphere_coords)
+        return time_array, g_array, a_array, g_avg, a_avg, segments
+
+class NumbaBackend(NumpyBackend):
+    name = "numba"
+
+    def segment_ids(self, x, y, z, sphere_coords):
+        vertices, table, counts = octant_table(sphere_coords)
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        out = np.empty(len(x), dtype=np.int64)
+        from numba_kernels import segment_kernel
+        segment_kernel(x, np.ascontiguousarray(y, dtype=np.float64), np.ascontiguousarray(z, dtype=np.float64), vertices, table, counts, out)
+        return out
+
+    def run(self, model, sphere_coords, instrumentation=None):
+        from numba_kernels import fused_kernel
+        instrumentation = instrumentation or NullInstrumentation()
+        time_array = model.time_array()
+        vertices, table, counts = octant_table(sphere_coords)
+        n = len(time_array)
+        model.check_cancelled()
+        with instrumentation.stage("model+averages+scoring (fused)", n):
+            g_array, a_array = model.allocate("g", (3, n)), model.allocate("a", (3, n))
+            g_avg, a_avg = model.allocate("g_avg", (3, n)), model.allocate("a_avg", (3, n))
+            segments = model.allocate("segment_ids", n, np.int64)
+            fused_kernel(time_array, model.rpm_to_rad_sec(model.inner_rpm), model.rpm_to_rad_sec(model.outer_rpm),
+                          float(model.theta_1_init), float(model.theta_2_init),
+                          float(model.delta_x), float(model.delta_y), float(model.delta_z),
+                          vertices, table, counts, g_array, a_array, g_avg, a_avg, segments)
+        return time_array, g_array, a_array, g_avg, a_avg, segments
+
+class RecurrenceBackend(NumpyBackend):
+    name = "recurrence"
+    anchor_interval = ANCHOR_INTERVAL
+
+    def calculate_acceleration(self, model):
+        time_array, g_array, a_array, self.max_error = model.calculate_acceleration_recurrence(self.anchor_interval)
+        return time_array, g_array, a_array
+
+def output_buffer(model, name, shape, dtype, blocks):
+    dtype = np.dtype(dtype)
+    if model.scratch_dir is not None:
+        array = model.allocate(name, shape, dtype)
+        return array, ("file", array.filename, shape, dtype.str)
+    block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+    blocks.append(block)
+    return np.ndarray(shape, dtype, buffer=block.buf), ("shared", block.name, shape, dtype.str)
+
+def attach_buffers(specs):
+    arrays, blocks = [], []
+    for kind, name, shape, dtype in specs:
+        if kind == "file":
+            arrays.append(np.memmap(name, dtype=dtype, mode='r+', shape=shape))
+        else:
+            blocks.append(shared_memory.SharedMemory(name=name))
+            arrays.append(np.ndarray(shape, dtype, buffer=blocks[-1].buf))
+    return arrays, blocks
+
+def release_blocks(blocks, unlink=False):
+    for block in blocks:
+        if unlink:
+            block.unlink()
+        with contextlib.suppress(BufferError):
+            block.close()
+
+def evaluate_partition(model, specs, start, end, sphere_coords, segment_backend, block_size=PARALLEL_BLOCK_SIZE):
+    arrays, blocks = attach_buffers(specs)
+    try:
+        return evaluate_blocks(model, *arrays, start, end, sphere_coords, get_backend(segment_backend), block_size)
+    finally:
+        arrays = None
+        release_blocks(blocks)
+
+def evaluate_blocks(model, g_array, a_array, g_sum, a_sum, segments, start, end, sphere_coords, backend, block_size=PARALLEL_BLOCK_SIZE):
+    totals = np.zeros((2, 3))
+    for block_start in range(start, end, block_size):
+        block_end = min(block_start + block_size, end)
+        _, g_block, a_block = model.calculate_acceleration(model.time_values(block_start, block_end))
+        g_array[:, block_start:block_end] = g_block
+        a_array[:, block_start:block_end] = a_block
+        segments[block_start:block_end] = backend.segment_ids(g_block[0], g_block[1], g_block[2], sphere_coords)
+        for k, (values, out) in enumerate(((g_block, g_sum), (a_block, a_sum))):
+            values[:, 0] += totals[k]
+            np.cumsum(values, axis=1, out=values)
+            totals[k] = values[:, -1]
+            out[:, block_start:block_end] = values
+    return totals
+
+def finish_partition(specs, start, end, carry, block_size=PARALLEL_BLOCK_SIZE):
+    arrays, blocks = attach_buffers(specs)
+    try:
+        for k, running_sum in enumerate(arrays):
+            for block_start in range(start, end, block_size):
+                block_end = min(block_start + block_size, end)
+                window = running_sum[:, block_start:block_end]
+                window += carry[k][:, None]
+                window /= np.arange(block_start + 1, block_end + 1)
+    finally:
+        arrays = window = running_sum = None
+        release_blocks(blocks)
+
+class ParallelBackend(NumpyBackend):
+    name = "parallel"
+    workers = None
+    segment_backend = DEFAULT_BACKEND
+    min_samples = PARALLEL_MIN_SAMPLES
+    block_size = PARALLEL_BLOCK_SIZE
+
+    def run(self, model, sphere_coords, instrumentation=None):
+        instrumentation = instrumentation or NullInstrumentation()
+        workers = self.workers or os.cpu_count() or 1
+        if workers < 2 or model.sample_count() < self.min_samples:
+            return super().run(model, sphere_coords, instrumentation)
+        blocks = []
+        try:
+            return self.run_partitions(model, sphere_coords, instrumentation, workers, blocks)
+        finally:
+            release_blocks(blocks, unlink=True)
+
+    def run_partitions(self, model, sphere_coords, instrumentation, workers, blocks):
+        n = model.sample_count()
+        time_array = model.time_array()
+        bounds = np.linspace(0, n, workers + 1).astype(np.int64)
+        outputs = [output_buffer(model, name, shape, dtype, blocks) for name, shape, dtype in
+                   (("g", (3, n), np.float64), ("a", (3, n), np.float64), ("g_avg", (3, n), np.float64), ("a_avg", (3, n), np.float64), ("segment_ids", n, np.int64))]
+        specs = [spec for _, spec in outputs]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            with instrumentation.stage("model+scoring (parallel)", n):
+                totals = list(executor.map(evaluate_partition, repeat(model), repeat(specs), bounds[:-1], bounds[1:], repeat(sphere_coords), repeat(self.segment_backend), repeat(self.block_size)))
+            model.check_cancelled()
+            with instrumentation.stage("averages (parallel scan)", n):
+                carries = np.cumsum([np.zeros((2, 3))] + totals[:-1], axis=0)
+                list(executor.map(finish_partition, repeat(specs[2:4]), bounds[:-1], bounds[1:], carries, repeat(self.block_size)))
+
+        results = []
+        for k, (array, _) in enumerate(outputs):
+            outputs[k] = None
+            if model.scratch_dir is None:
+                array = np.array(array)
+                release_blocks([blocks.pop(0)], unlink=True)
+            results.append(array)
+        g_array, a_array, g_avg, a_avg, segments = results
+        return time_array, g_array, a_array, g_avg, a_avg, segments
+
+BACKENDS = {"numpy": NumpyBackend, "numba": NumbaBackend, "parallel": ParallelBackend, "recurrence": RecurrenceBackend}
+
+def numba_available():
+    return importlib.util.find_spec("numba") is not None
+
+def available_backends():
+    return [name for name in BACKENDS if name != "numba" or numba_available()]
+
+def get_backend(backend=None):
+    if not isinstance(backend, (str, type(None))):
+        return backend
+    name = (backend or DEFAULT_BACKEND).lower()
+    if name == "auto":
+        name = "numba" if numba_available() else "numpy"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown compute backend: {name}")
+    if name == "numba":
+        try:
+            importlib.import_module("numba_kernels")
+        except ImportError:
+            warnings.warn("Numba is not installed; falling back to the NumPy backend.")
+            name = "numpy"
+    return BACKENDS[name]()
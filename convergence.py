@@ -0,0 +1,112 @@
+import numpy as np
+from compute_backend import RESULT_CHUNK_SIZE, cumulative_sums
+
+DEFAULT_WINDOWS_HOURS = (0.25, 1.0, 4.0)
+DEFAULT_THRESHOLD = 1e-3
+SERIES_POINTS = 2000
+
+def trailing_means(sums, time_values, ends, hours=None, scale=1):
+    if hours is None:
+        starts = np.zeros_like(ends)
+    else:
+        starts = np.searchsorted(time_values, time_values[ends] - hours * scale, side='left')
+    return np.sqrt(np.sum((sums[:, ends + 1] - sums[:, starts])**2, axis=0)) / (ends + 1 - starts)
+
+def first_window_end(time_values, hours=None, scale=1):
+    if hours is None:
+        return 0
+    return int(np.searchsorted(time_values, time_values[0] + hours * scale, side='left'))
+
+def window_summary(sums, time_values, threshold, hours=None, scale=1):
+    samples = len(time_values)
+    first = first_window_end(time_values, hours, scale)
+    summary = {"window_hours": hours, "window_count": max(samples - first, 0)}
+    if first >= samples:
+        return summary
+
+    worst, best, below = (-np.inf, 0), (np.inf, 0), 0
+    first_below, last_above = None, None
+    for start in range(first, samples, RESULT_CHUNK_SIZE):
+        ends = np.arange(start, min(start + RESULT_CHUNK_SIZE, samples))
+        means = trailing_means(sums, time_values, ends, hours, scale)
+        k = int(np.argmax(means))
+        if means[k] > worst[0]:
+            worst = (float(means[k]), ends[k])
+        k = int(np.argmin(means))
+        if means[k] < best[0]:
+            best = (float(means[k]), ends[k])
+        is_below = means < threshold
+        below += int(np.count_nonzero(is_below))
+        if first_below is None and is_below.any():
+            first_below = ends[np.argmax(is_below)]
+        above = np.flatnonzero(~is_below)
+        if len(above):
+            last_above = ends[above[-1]]
+
+    if last_above is None:
+        settled = first
+    elif last_above < samples - 1:
+        settled = last_above + 1
+    else:
+        settled = None
+    summary.update({
+        "final": float(means[-1]),
+        "max": worst[0],
+        "max_hours": float(time_values[worst[1]]) / scale,
+        "min": best[0],
+        "min_hours": float(time_values[best[1]]) / scale,
+        "fraction_below": below / summary["window_count"],
+        "first_below_hours": None if first_below is None else float(time_values[first_below]) / scale,
+        "settled_hours": None if settled is None else float(time_values[settled]) / scale,
+    })
+    return summary
+
+def convergence(time_values, components, windows_hours=DEFAULT_WINDOWS_HOURS, threshold=DEFAULT_THRESHOLD, points=SERIES_POINTS, scale=1):
+    windows_hours = sorted(set(float(hours) for hours in windows_hours))
+    if len(time_values) < 2:
+        raise ValueError("At least two samples are needed for a convergence report.")
+    if any(hours <= 0 for hours in windows_hours):
+        raise ValueError("Window lengths must be > 0.")
+    if threshold <= 0:
+        raise ValueError("Threshold must be > 0.")
+
+    sums = cumulative_sums(components)
+    ends = np.unique(np.append(np.arange(0, len(time_values), max(1, -(-len(time_values) // points))), len(time_values) - 1))
+    rolling = np.full((len(windows_hours), len(ends)), np.nan)
+    for k, hours in enumerate(windows_hours):
+        valid = ends >= first_window_end(time_values, hours, scale)
+        rolling[k, valid] = trailing_means(sums, time_values, ends[valid], hours, scale)
+
+    stats = {
+        "threshold": threshold,
+        "samples": len(time_values),
+        "cumulative": window_summary(sums, time_values, threshold, scale=scale),
+        "windows": [window_summary(sums, time_values, threshold, hours, scale) for hours in windows_hours],
+    }
+    return {
+        "time_in_hours": np.asarray(time_values[ends], dtype=np.float64) / scale,
+        "cumulative": trailing_means(sums, time_values, ends),
+        "windows_hours": windows_hours,
+        "rolling": rolling,
+        "stats": stats,
+    }
+
+def format_hours(value):
+    return "never" if value is None else f"{value:.3g} h"
+
+def report_text(stats):
+    cumulative = stats["cumulative"]
+    lines = [f"Threshold {stats['threshold']:.3g} g over {stats['samples']} samples",
+             f"Cumulative: final {cumulative['final']:.3g} g, first below {format_hours(cumulative['first_below_hours'])}, settled {format_hours(cumulative['settled_hours'])}"]
+    for entry in stats["windows"]:
+        if not entry["window_count"]:
+            lines.append(f"{entry['window_hours']:.3g} h window: longer than the run")
+            continue
+        lines.append(f"{entry['window_hours']:.3g} h window: worst {entry['max']:.3g} g at {entry['max_hours']:.3g} h, best {entry['min']:.3g} g, "
+                     f"{100 * entry['fraction_below']:.1f}% below, settled {format_hours(entry['settled_hours'])}")
+    return "\n".join(lines)
+
+def write_convergence_csv(file_path, result):
+    columns = [result["time_in_hours"], result["cumulative"], *result["rolling"]]
+    header = ",".join(["Time (h)", "Cumulative (g)"] + [f"{hours:g} h Window (g)" for hours in result["windows_hours"]])
+    np.savetxt(file_path, np.column_stack(columns), delimiter=',', header=header, comments='', fmt='%.9g')
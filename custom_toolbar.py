@@ -0,0 +1,34 @@
+from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+
+class CustomToolbar(NavigationToolbar2Tk):
+    def __init__(self, canvas, parent, export_magnitude_callback=None, export_components_callback=None, export_distribution_callback=None, export_animation_callback=None):
+        self.toolitems = list(NavigationToolbar2Tk.toolitems)
+        if export_magnitude_callback:
+            self.toolitems.append(("ExportMagnitude", "Export the data to a CSV file", "export", "export_magnitude_data"))
+        if export_components_callback:
+            self.toolitems.append(("ExportComponents", "Export the data to a CSV file", "export", "export_components_data"))
+        if export_distribution_callback:
+            self.toolitems.append(("ExportDistribution", "Export the data to a CSV file", "export", "export_distribution_data"))
+        if export_animation_callback:
+            self.toolitems.append(("ExportAnimation", "Export the animation to an MP4 file", "export", "export_animation_data"))
+        super().__init__(canvas, parent)
+        self.export_magnitude_callback = export_magnitude_callback
+        self.export_components_callback = export_components_callback
+        self.export_distribution_callback = export_distribution_callback
+        self.export_animation_callback = export_animation_callback
+
+    def export_magnitude_data(self):
+        if self.export_magnitude_callback:
+            self.export_magnitude_callback()
+
+    def export_components_data(self):
+        if self.export_components_callback:
+            self.export_components_callback()
+
+    def export_distribution_data(self):
+        if self.export_distribution_callback:
+            self.export_distribution_callback()
+
+    def export_animation_data(self):
+        if self.export_animation_callback:
+            self.export_animation_callback()
@@ -0,0 +1,84 @@
+import csv
+
+def parse_date_time_data(main_array):
+    from dateutil import parser
+
+    datetime_str = []
+    x, y, z = [], [], []
+    for k in range(0, len(main_array) - 4, 5):
+        try:
+            dt = parser.parse(main_array[k] + " " + main_array[k + 1])
+        except ValueError:
+            dt = parser.parse(main_array[k + 1] + " " + main_array[k])
+        datetime_str.append(dt)
+        x.append(float(main_array[k + 2]))
+        y.append(float(main_array[k + 3]))
+        z.append(float(main_array[k + 4]))
+    time_in_seconds = [(dt - datetime_str[0]).total_seconds() for dt in datetime_str]
+    time_in_hours = [t / 3600 for t in time_in_seconds]
+    return time_in_hours, x, y, z
+
+def import_sci_spinner_format_data(file_path):
+    import numpy as np
+
+    try:
+        time_in_seconds = []
+        x = []
+        y = []
+        z = []
+
+        with open(file_path, 'r') as file:
+            csv_reader = csv.DictReader(file)
+            for row in csv_reader:
+                time_in_seconds.append(float(row['timestamp']))
+                x.append(float(row['x_acc']))
+                y.append(float(row['y_acc']))
+                z.append(float(row['z_acc']))
+
+        time_in_hours = [t / 3600 for t in time_in_seconds]
+
+        def normalize_vectors(x, y, z):
+            g_const = 9.80665
+            normalized_x = np.array(x) / g_const
+            normalized_y = np.array(y) / g_const
+            normalized_z = np.array(z) / g_const
+            return normalized_x, normalized_y, normalized_z
+
+        x, y, z = normalize_vectors(x, y, z)
+        return time_in_hours, x, y, z
+
+    except KeyError:
+        raise ValueError(
+            "Error",
+            "Invalid CSV file format.\n\n"
+            "Supported CSV file formats:\n"
+            "(1) Date (yyyy-mm-dd), Time (hh:mm:ss), X, Y, Z\n"
+            "     Example: 2001-11-21, 1:00:00, 0.5, 0.5, 0.5\n\n"
+            "OR\n\n"
+            "(2) Time (s), X, Y, Z\n"
+            "     Example: 3600, 0.5, 0.5, 0.5"
+        )
+
+def read_main_array(file_path):
+    with open(file_path, 'r') as file:
+        return file.read().replace("   ", " ").replace('\t', ' ').replace('\n', ' ').replace(',', ' ').split(' ')
+
+def load_experimental_data(file_path):
+    try:
+        return import_sci_spinner_format_data(file_path)
+    except ValueError:
+        return read_main_array(file_path)
+
+def experimental_arrays(data):
+    import numpy as np
+
+    if isinstance(data, tuple):
+        time_in_hours, x, y, z = data
+    else:
+        time_in_hours, x, y, z = parse_date_time_data(data)
+    if len(time_in_hours) == 0 or not any(x) or not any(y) or not any(z):
+        raise ValueError("Invalid CSV file format.")
+    return tuple(np.asarray(values, dtype=np.float64) for values in (time_in_hours, x, y, z))
+
+def load_log(file_path):
+    return experimental_arrays(load_experimental_data(file_path))
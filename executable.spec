@@ -18,6 +18,18 @@ a = Analysis(
         (os.path.join(project_dir, 'images/asterisk.png'), 'images'),
         (os.path.join(project_dir, 'path_visualization.py'), '.'),
         (os.path.join(project_dir, 'math_model.py'), '.'),
+        (os.path.join(project_dir, 'compute_backend.py'), '.'),
+        (os.path.join(project_dir, 'instrumentation.py'), '.'),
+        (os.path.join(project_dir, 'numba_kernels.py'), '.'),
+        (os.path.join(project_dir, 'custom_toolbar.py'), '.'),
+        (os.path.join(project_dir, 'data_import.py'), '.'),
+        (os.path.join(project_dir, 'batch.py'), '.'),
+        (os.path.join(project_dir, 'comparison.py'), '.'),
+        (os.path.join(project_dir, 'identification.py'), '.'),
+        (os.path.join(project_dir, 'session.py'), '.'),
+        (os.path.join(project_dir, 'streaming.py'), '.'),
+        (os.path.join(project_dir, 'field_map.py'), '.'),
+        (os.path.join(project_dir, 'optimizer.py'), '.'),
         (os.path.join(project_dir, 'ffmpeg/avcodec-61.dll'), 'ffmpeg'),
         (os.path.join(project_dir, 'ffmpeg/avdevice-61.dll'), 'ffmpeg'),
         (os.path.join(project_dir, 'ffmpeg/avfilter-10.dll'), 'ffmpeg'),
@@ -0,0 +1,42 @@
+import numpy as np
+
+FIELD_GRID_POINTS = 11
+FIELD_CHUNK_ELEMENTS = 2**22
+
+def offset_grid(half_extent, points_per_axis=FIELD_GRID_POINTS):
+    axis = np.linspace(-half_extent, half_extent, points_per_axis)
+    x, y, z = np.meshgrid(axis, axis, axis, indexing='ij')
+    return axis, np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+
+def time_averaged_gram(model, time_array, start, carry):
+    _, basis = model.calculate_field_basis(time_array)
+    basis[..., 0] += carry
+    np.cumsum(basis, axis=-1, out=basis)
+    carry[...] = basis[..., -1]
+    basis /= np.arange(start + 1, start + len(time_array) + 1)
+    return np.einsum('ijn,ikn->jkn', basis, basis)
+
+def field_magnitudes(model, offsets):
+    offsets = np.asarray(offsets, dtype=np.float64).reshape(-1, 3)
+    x, y, z = offsets.T
+    features = np.column_stack([x * x, y * y, z * z, x * y, x * z, y * z])
+    time_array = model.time_array()
+    chunk = max(1, FIELD_CHUNK_ELEMENTS // len(offsets))
+    totals = np.zeros(len(offsets))
+    carry = np.zeros((3, 3))
+    for start in range(0, len(time_array), chunk):
+        gram = time_averaged_gram(model, time_array[start:start + chunk], start, carry)
+        squared = features @ np.array([gram[0, 0], gram[1, 1], gram[2, 2], 2 * gram[0, 1], 2 * gram[0, 2], 2 * gram[1, 2]])
+        np.maximum(squared, 0, out=squared)
+        totals += np.sum(np.sqrt(squared, out=squared), axis=1)
+    return totals / len(time_array)
+
+def field_grid(model, half_extent, points_per_axis=FIELD_GRID_POINTS):
+    axis, offsets = offset_grid(half_extent, points_per_axis)
+    half = (len(offsets) + 1) // 2
+    magnitudes = field_magnitudes(model, offsets[:half])
+    magnitudes = np.concatenate([magnitudes, magnitudes[:len(offsets) - half][::-1]])
+    return axis, magnitudes.reshape(points_per_axis, points_per_axis, points_per_axis)
+
+def write_field_csv(file_path, offsets, magnitudes):
+    np.savetxt(file_path, np.column_stack([np.asarray(offsets) * 100, magnitudes]), delimiter=',', header="x (cm),y (cm),z (cm),Non-Gravitational Acceleration (g)", comments='', fmt='%.9g')
@@ -1,65 +1,43 @@
 # Author: Edward Romero, OSTEM Intern, NASA Kennedy Space Center, Spring 2025
 
+import time
+PROCESS_START = time.perf_counter()
+
+import argparse
+import atexit
 import csv
+import json
+import multiprocessing
 import os
+import queue
 import re
+import shutil
+import tempfile
+import threading
 import webbrowser
-import matplotlib
-import matplotlib.animation as animation
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-from matplotlib.animation import FFMpegWriter
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import numpy as np
-from dateutil import parser
-from PIL import Image, ImageTk
+from contextlib import nullcontext
 import tkinter as tk
 import tkinter.ttk as ttk
-from tkinter import messagebox, filedialog
-from math_model import MathModel
-from path_visualization import PathVisualization
+from tkinter import messagebox, filedialog, simpledialog
+from data_import import experimental_arrays, load_experimental_data, parse_date_time_data
+from instrumentation import DEFAULT_LOG_FILE, PipelineInstrumentation, ProfileCapture
 
 SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
 
+PLOT_MAX_POINTS = 1000000
+DENSITY_PATH_POINTS = 5000
+COMPONENT_STYLES = (('X', '#6EAE39'), ('Y', '#EF7A35'), ('Z', 'mediumorchid'))
+SESSION_ENTRIES = ("inner_velocity", "outer_velocity", "inner_position", "outer_position", "distance", "simulation_duration",
+                   "start_analysis_theo", "end_analysis_theo", "start_analysis_exp", "end_analysis_exp")
+SESSION_LAST = ("mode", "inner_velocity", "outer_velocity", "inner_position", "outer_position", "simulation_duration", "distance",
+                "start_analysis_theo", "end_analysis_theo", "start_analysis_exp", "end_analysis_exp")
+
 def validate_float(value):
     return re.fullmatch(r"-?\d*\.?\d*", value) is not None
 
 def validate_positive_float(value):
     return re.fullmatch(r"\d*\.?\d*", value) is not None
 
-class CustomToolbar(NavigationToolbar2Tk):
-    def __init__(self, canvas, parent, export_magnitude_callback=None, export_components_callback=None, export_distribution_callback=None, export_animation_callback=None):
-        self.toolitems = list(NavigationToolbar2Tk.toolitems)
-        if export_magnitude_callback:
-            self.toolitems.append(("ExportMagnitude", "Export the data to a CSV file", "export", "export_magnitude_data"))
-        if export_components_callback:
-            self.toolitems.append(("ExportComponents", "Export the data to a CSV file", "export", "export_components_data"))
-        if export_distribution_callback:
-            self.toolitems.append(("ExportDistribution", "Export the data to a CSV file", "export", "export_distribution_data"))
-        if export_animation_callback:
-            self.toolitems.append(("ExportAnimation", "Export the animation to an MP4 file", "export", "export_animation_data"))
-        super().__init__(canvas, parent)
-        self.export_magnitude_callback = export_magnitude_callback
-        self.export_components_callback = export_components_callback
-        self.export_distribution_callback = export_distribution_callback
-        self.export_animation_callback = export_animation_callback
-
-    def export_magnitude_data(self):
-        if self.export_magnitude_callback:
-            self.export_magnitude_callback()
-
-    def export_components_data(self):
-        if self.export_components_callback:
-            self.export_components_callback()
-
-    def export_distribution_data(self):
-        if self.export_distribution_callback:
-            self.export_distribution_callback()
-
-    def export_animation_data(self):
-        if self.export_animation_callback:
-            self.export_animation_callback()
-
 class ToolTip:
     def __init__(self, widget, text, x_offset, y_offset):
         self.widget = widget
@@ -88,15 +66,30 @@ class ToolTip:
             self.tip_window = None
 
 class GUI:
-    def __init__(self, master):
+    def __init__(self, master, backend=None, log_file=DEFAULT_LOG_FILE, profile_next_run=False, scratch_root=None):
         self.master = master
         self.master.title("Microgravity Simulation Support Facility - NASA")
         self.master.configure(bg="#f1f1f1")
         self.master.state('zoomed')
         self.master.wm_minsize(1280, 720)
         self.current_mode = "Theoretical"
+        self.backend_var = tk.StringVar(value=backend or "auto")
+        self.profile_var = tk.BooleanVar(value=profile_next_run)
+        self.out_of_core_var = tk.BooleanVar(value=scratch_root is not None)
+        self.progressive_var = tk.BooleanVar(value=False)
+        self.refinement = None
+        self.run_estimate = None
+        self.distribution_view_var = tk.StringVar(value="path")
+        self.plot_artists = {}
+        self.distribution_animations = {}
+        self.window_sources = {}
+        self.scratch_root = scratch_root
+        self.scratch_dir = None
+        atexit.register(self.remove_scratch_dir)
+        self.instrumentation = PipelineInstrumentation(log_file)
         self.register_validations()
         self.setup_gui_elements()
+        self.create_status_bar()
         self.setup_plot_frames()
         self.show_theoretical_inputs()
         self.last_mode = "Theoretical"
@@ -111,6 +104,7 @@ class GUI:
         self.last_end_analysis_theo = None
         self.last_start_analysis_exp = None
         self.last_end_analysis_exp = None
+        self.session_results = None
 
     def setup_gui_elements(self):
         self.load_images()
@@ -135,6 +129,8 @@ class GUI:
         self.create_start_button(center_frame, font_style)
 
     def load_images(self):
+        from PIL import Image, ImageTk
+
         nasa_image = Image.open(os.path.join(SCRIPT_DIR, 'images', 'NASA_logo.png')).resize((60, 50), Image.LANCZOS)
         self.nasa_logo = ImageTk.PhotoImage(nasa_image)
         mssf_image = Image.open(os.path.join(SCRIPT_DIR, 'images', 'MSSF_logo.png')).resize((56, 50), Image.LANCZOS)
@@ -179,8 +175,76 @@ class GUI:
         menu_button.config(menu=self.mode_menu)
         self.mode_menu.add_radiobutton(label="Theoretical", variable=self.mode_var, value="Theoretical", command=lambda: self.switch_mode("Theoretical"))
         self.mode_menu.add_radiobutton(label="Experimental", variable=self.mode_var, value="Experimental", command=lambda: self.switch_mode("Experimental"))
+        self.mode_menu.add_separator()
+        self.backend_menu = tk.Menu(self.mode_menu, tearoff=0, postcommand=self.refresh_backend_menu)
+        self.backend_menu.config(font=("Calibri", 9), bg="#d6d7d9")
+        self.backend_menu.add_radiobutton(label="Auto", variable=self.backend_var, value="auto")
+        self.backend_menu.add_radiobutton(label="NumPy", variable=self.backend_var, value="numpy")
+        self.backend_menu.add_radiobutton(label="Numba (JIT)", variable=self.backend_var, value="numba")
+        self.backend_menu.add_radiobutton(label="Parallel (Multi-Core)", variable=self.backend_var, value="parallel")
+        self.backend_menu.add_radiobutton(label="Rotation Recurrence (Trig-Free)", variable=self.backend_var, value="recurrence")
+        self.mode_menu.add_cascade(label="Compute Backend", menu=self.backend_menu)
+        self.distribution_view_menu = tk.Menu(self.mode_menu, tearoff=0)
+        self.distribution_view_menu.config(font=("Calibri", 9), bg="#d6d7d9")
+        self.distribution_view_menu.add_radiobutton(label="Path", variable=self.distribution_view_var, value="path", command=self.redraw_orientation_distribution)
+        self.distribution_view_menu.add_radiobutton(label="Dwell-Time Density", variable=self.distribution_view_var, value="density", command=self.redraw_orientation_distribution)
+        self.distribution_view_menu.add_radiobutton(label="Density + Path", variable=self.distribution_view_var, value="density+path", command=self.redraw_orientation_distribution)
+        self.mode_menu.add_cascade(label="Distribution View", menu=self.distribution_view_menu)
+        self.mode_menu.add_checkbutton(label="Profile Next Run", variable=self.profile_var)
+        self.mode_menu.add_checkbutton(label="Out-of-Core Storage", variable=self.out_of_core_var)
+        self.mode_menu.add_checkbutton(label="Progressive Preview", variable=self.progressive_var)
+        self.mode_menu.add_command(label="Memory Budget...", command=self.set_memory_budget)
+        self.mode_menu.add_separator()
+        self.mode_menu.add_command(label="Recommend Operating Point...", command=self.start_optimizer)
+        self.mode_menu.add_command(label="Compare with Theory...", command=self.compare_with_theory)
+        self.mode_menu.add_command(label="Convergence Report...", command=self.start_convergence_report)
+        self.mode_menu.add_command(label="Coverage Profile...", command=self.start_coverage_profile)
+        self.mode_menu.add_command(label="Identify Parameters from Log...", command=self.start_identification)
+        self.mode_menu.add_separator()
+        self.mode_menu.add_command(label="Open Session...", command=self.open_session)
+        self.mode_menu.add_command(label="Save Session...", command=self.save_session)
         menu_button.pack()
 
+    def refresh_backend_menu(self):
+        from compute_backend import available_backends
+
+        self.backend_menu.entryconfigure("Numba (JIT)", state=tk.NORMAL if "numba" in available_backends() else tk.DISABLED)
+
+    def get_compute_backend(self):
+        from compute_backend import get_backend
+
+        return get_backend(self.backend_var.get())
+
+    def report_startup(self, report_path, exit_after=False):
+        report = {"time_to_interactive": time.perf_counter() - PROCESS_START}
+        with open(report_path, 'w') as file:
+            json.dump(report, file)
+        if exit_after:
+            self.master.destroy()
+
+    def new_scratch_dir(self):
+        self.remove_scratch_dir()
+        self.scratch_dir = tempfile.mkdtemp(prefix="kinematics-", dir=self.scratch_root)
+        return self.scratch_dir
+
+    def cancel_refinement(self):
+        refinement, self.refinement = self.refinement, None
+        if refinement is not None:
+            refinement["cancel"].set()
+            if refinement["scratch_dir"] is not None and refinement["scratch_dir"] == self.scratch_dir:
+                self.scratch_dir = None
+                atexit.register(shutil.rmtree, refinement["scratch_dir"], ignore_errors=True)
+
+    def remove_scratch_dir(self):
+        if self.scratch_dir is not None:
+            shutil.rmtree(self.scratch_dir, ignore_errors=True)
+            self.scratch_dir = None
+
+    def mode_results(self, mode):
+        if self.session_results is not None and self.session_results[0] == mode:
+            return self.session_results[1]
+        return None
+
     def register_validations(self):
         self.validate_float_cmd = self.master.register(validate_float)
         self.validate_positive_float_cmd = self.master.register(validate_positive_float)
@@ -266,6 +330,10 @@ class GUI:
         
         self.upload_file_button = tk.Button(self.experimental_data_frame, text="Upload CSV File", command=self.import_data, font=font_style, bg="#aeb0b5", activebackground="#d6d7d9")
         self.upload_file_button.pack()
+        self.batch_button = tk.Button(self.experimental_data_frame, text="Batch Process Folder", command=self.start_batch, font=font_style, bg="#aeb0b5", activebackground="#d6d7d9")
+        self.batch_button.pack(pady=(4, 0))
+        self.live_button = tk.Button(self.experimental_data_frame, text="Live Stream", command=self.toggle_live_stream, font=font_style, bg="#aeb0b5", activebackground="#d6d7d9")
+        self.live_button.pack(pady=(4, 0))
 
         self.experimental_analysis_period_frame = tk.Frame(parent, padx=1, pady=1)
         self.experimental_analysis_period_frame.grid(row=0, column=5, padx=15)
@@ -283,28 +351,96 @@ class GUI:
         self.start_button = tk.Button(parent, text="Start", command=self.start_simulation, font=font_style, bg="#0066b2", fg="#ffffff", activebackground="#3380cc", activeforeground="#ffffff")
         self.start_button.grid(row=1, column=0, columnspan=6, pady=(10, 5))
 
+    def create_status_bar(self):
+        self.status_var = tk.StringVar(value="")
+        self.status_bar = tk.Label(self.master, textvariable=self.status_var, font=("Calibri", 9), bg="#f1f1f1", anchor=tk.W)
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=(8, 8))
+
     def setup_plot_frames(self):
         plot_frame = tk.Frame(self.master, padx=5, pady=5, bg="#f1f1f1")
         plot_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True, padx=(5, 5), pady=(0, 5))
 
         self.notebook = ttk.Notebook(plot_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        self.tab_builders = {}
+        self.built_tabs = set()
+        self.canvas_tabs = {}
+        self.dirty_canvases = {}
+        self.setup_theoretical_plot_frames()
+        self.setup_experimental_plot_frames()
+
+    def on_tab_changed(self, event):
+        selected = self.notebook.select()
+        if selected:
+            self.master.after_idle(lambda: self.show_tab(selected))
+
+    def show_tab(self, tab):
+        self.ensure_tabs_built(tab)
+        if str(tab) == str(self.theoretical_field_map_frame) and self.pending_field_model is not None:
+            self.update_field_map_plot()
+        for mode in tuple(self.pending_spectra):
+            if str(tab) == str(self.spectrum_frame(mode)):
+                self.update_spectrum_plots(mode)
+        for canvas in self.dirty_canvases.pop(str(tab), []):
+            canvas.draw_idle()
+
+    def draw_canvas(self, canvas):
+        tab = self.canvas_tabs[canvas]
+        if self.notebook.select() == tab:
+            canvas.draw()
+        elif canvas not in self.dirty_canvases.setdefault(tab, []):
+            self.dirty_canvases[tab].append(canvas)
+
+    def ensure_tabs_built(self, *tabs):
+        for tab in tabs:
+            if str(tab) not in self.built_tabs:
+                self.built_tabs.add(str(tab))
+                self.tab_builders[str(tab)]()
+
+    def is_tab_built(self, tab):
+        return str(tab) in self.built_tabs
+
+    def create_plot(self, parent, title, projection=None):
+        from matplotlib import rcParams
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
 
         rcParams['font.family'] = 'Calibri'
         rcParams['font.size'] = 9
+        figure = Figure()
+        ax = figure.add_subplot(1, 1, 1, projection=projection)
+        if projection == '3d':
+            configure_3d_axes(ax, title)
+        else:
+            ax.set_title(title)
+            ax.set_xlabel('Time (h)')
+            ax.set_ylabel('Acceleration (g)')
+        canvas = FigureCanvasTkAgg(figure, parent)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas_tabs[canvas] = str(parent.master)
+        return figure, ax, canvas
 
-        self.setup_theoretical_plot_frames()
-        self.setup_experimental_plot_frames()
-        self.clear_theoretical_plots()
+    def create_toolbar(self, canvas, parent, *args, **kwargs):
+        from custom_toolbar import CustomToolbar
+
+        toolbar = CustomToolbar(canvas, parent, *args, **kwargs)
+        toolbar.update()
+        return toolbar
 
     def setup_theoretical_plot_frames(self):
         self.theoretical_g_acceleration_frame = tk.Frame(self.notebook, borderwidth=0, relief=tk.SOLID)
         self.theoretical_non_g_acceleration_frame = tk.Frame(self.notebook, borderwidth=0, relief=tk.SOLID)
         self.theoretical_acceleration_distribution_frame = tk.Frame(self.notebook, borderwidth=0, relief=tk.SOLID)
+        self.theoretical_field_map_frame = tk.Frame(self.notebook, borderwidth=0, relief=tk.SOLID)
+        self.theoretical_spectrum_frame = tk.Frame(self.notebook, borderwidth=0, relief=tk.SOLID)
 
         self.notebook.add(self.theoretical_g_acceleration_frame, text="Gravitational Acceleration")
         self.notebook.add(self.theoretical_non_g_acceleration_frame, text="Non-Gravitational Acceleration")
         self.notebook.add(self.theoretical_acceleration_distribution_frame, text="Orientation Distribution")
+        self.notebook.add(self.theoretical_field_map_frame, text="Field Map")
+        self.notebook.add(self.theoretical_spectrum_frame, text="Spectrum")
 
         self.theoretical_g_acceleration_frame_left = tk.Frame(self.theoretical_g_acceleration_frame, borderwidth=1, relief=tk.SOLID)
         self.theoretical_g_acceleration_frame_left.grid(row=0, column=0, sticky="nsew")
@@ -320,27 +456,6 @@ class GUI:
         self.theoretical_g_acceleration_frame.grid_columnconfigure(1, weight=1)
         self.theoretical_g_acceleration_frame.grid_rowconfigure(0, weight=1)
 
-        self.theoretical_g_acceleration_figure = plt.Figure()
-        self.theoretical_g_acceleration_ax = self.theoretical_g_acceleration_figure.add_subplot(1, 1, 1)
-        self.theoretical_g_acceleration_ax.set_title("Time-Averaged Gravitational Acceleration")
-        self.theoretical_g_acceleration_ax.set_xlabel('Time (h)')
-        self.theoretical_g_acceleration_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_g_acceleration_canvas = FigureCanvasTkAgg(self.theoretical_g_acceleration_figure, self.theoretical_g_acceleration_frame_left)
-        self.theoretical_g_acceleration_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.theoretical_g_components_figure = plt.Figure()
-        self.theoretical_g_components_ax = self.theoretical_g_components_figure.add_subplot(1, 1, 1)
-        self.theoretical_g_components_ax.set_title("Time-Averaged Gravitational Acceleration")
-        self.theoretical_g_components_ax.set_xlabel('Time (h)')
-        self.theoretical_g_components_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_g_components_canvas = FigureCanvasTkAgg(self.theoretical_g_components_figure, self.theoretical_g_acceleration_frame_right)
-        self.theoretical_g_components_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.theoretical_g_acceleration_toolbar = CustomToolbar(self.theoretical_g_acceleration_canvas, self.theoretical_g_acceleration_toolbar_frame_left, self.export_theoretical_g_magnitude_data)
-        self.theoretical_g_acceleration_toolbar.update()
-        self.theoretical_g_components_toolbar = CustomToolbar(self.theoretical_g_components_canvas, self.theoretical_g_acceleration_toolbar_frame_right, export_components_callback=self.export_theoretical_g_components_data)
-        self.theoretical_g_components_toolbar.update()
-
         self.theoretical_non_g_acceleration_frame_left = tk.Frame(self.theoretical_non_g_acceleration_frame, borderwidth=1, relief=tk.SOLID)
         self.theoretical_non_g_acceleration_frame_left.grid(row=0, column=0, sticky="nsew")
         self.theoretical_non_g_acceleration_toolbar_frame_left = tk.Frame(self.theoretical_non_g_acceleration_frame_left, borderwidth=0, relief=tk.SOLID)
@@ -355,27 +470,6 @@ class GUI:
         self.theoretical_non_g_acceleration_frame.grid_columnconfigure(1, weight=1)
         self.theoretical_non_g_acceleration_frame.grid_rowconfigure(0, weight=1)
 
-        self.theoretical_non_g_acceleration_figure = plt.Figure()
-        self.theoretical_non_g_acceleration_ax = self.theoretical_non_g_acceleration_figure.add_subplot(1, 1, 1)
-        self.theoretical_non_g_acceleration_ax.set_title("Time-Averaged Non-Gravitational Acceleration")
-        self.theoretical_non_g_acceleration_ax.set_xlabel('Time (h)')
-        self.theoretical_non_g_acceleration_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_non_g_acceleration_canvas = FigureCanvasTkAgg(self.theoretical_non_g_acceleration_figure, self.theoretical_non_g_acceleration_frame_left)
-        self.theoretical_non_g_acceleration_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.theoretical_non_g_components_figure = plt.Figure()
-        self.theoretical_non_g_components_ax = self.theoretical_non_g_components_figure.add_subplot(1, 1, 1)
-        self.theoretical_non_g_components_ax.set_title("Time-Averaged Non-Gravitational Acceleration")
-        self.theoretical_non_g_components_ax.set_xlabel('Time (h)')
-        self.theoretical_non_g_components_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_non_g_components_canvas = FigureCanvasTkAgg(self.theoretical_non_g_components_figure, self.theoretical_non_g_acceleration_frame_right)
-        self.theoretical_non_g_components_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.theoretical_non_g_acceleration_toolbar = CustomToolbar(self.theoretical_non_g_acceleration_canvas, self.theoretical_non_g_acceleration_toolbar_frame_left, self.export_theoretical_non_g_magnitude_data)
-        self.theoretical_non_g_acceleration_toolbar.update()
-        self.theoretical_non_g_components_toolbar = CustomToolbar(self.theoretical_non_g_components_canvas, self.theoretical_non_g_acceleration_toolbar_frame_right, export_components_callback=self.export_theoretical_non_g_components_data)
-        self.theoretical_non_g_components_toolbar.update()
-
         self.theoretical_acceleration_distribution_frame_left = tk.Frame(self.theoretical_acceleration_distribution_frame, borderwidth=1, relief=tk.SOLID)
         self.theoretical_acceleration_distribution_frame_left.grid(row=0, column=0, sticky="nsew")
         self.theoretical_acceleration_distribution_toolbar_frame_left = tk.Frame(self.theoretical_acceleration_distribution_frame_left, borderwidth=0, relief=tk.SOLID)
@@ -390,26 +484,80 @@ class GUI:
         self.theoretical_acceleration_distribution_frame.grid_columnconfigure(1, weight=1)
         self.theoretical_acceleration_distribution_frame.grid_rowconfigure(0, weight=1)
 
-        self.theoretical_acceleration_distribution_figure = plt.Figure()
-        self.theoretical_acceleration_distribution_ax = self.theoretical_acceleration_distribution_figure.add_subplot(1, 1, 1, projection='3d')
-        self.configure_3d_axes(self.theoretical_acceleration_distribution_ax, "Orientation Distribution")
-        self.theoretical_acceleration_distribution_canvas = FigureCanvasTkAgg(self.theoretical_acceleration_distribution_figure, self.theoretical_acceleration_distribution_frame_left)
-        self.theoretical_acceleration_distribution_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.theoretical_acceleration_distribution_analysis_figure = plt.Figure()
-        self.theoretical_acceleration_distribution_analysis_ax = self.theoretical_acceleration_distribution_analysis_figure.add_subplot(1, 1, 1, projection='3d')
-        self.configure_3d_axes(self.theoretical_acceleration_distribution_analysis_ax, "Orientation Distribution")
-        self.theoretical_acceleration_distribution_analysis_canvas = FigureCanvasTkAgg(self.theoretical_acceleration_distribution_analysis_figure, self.theoretical_acceleration_distribution_frame_right)
-        self.theoretical_acceleration_distribution_analysis_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.theoretical_acceleration_distribution_toolbar = CustomToolbar(self.theoretical_acceleration_distribution_canvas, self.theoretical_acceleration_distribution_toolbar_frame_left, export_distribution_callback=self.export_theoretical_distribution_data)
-        self.theoretical_acceleration_distribution_toolbar.update()
-        self.theoretical_acceleration_distribution_analysis_toolbar = CustomToolbar(self.theoretical_acceleration_distribution_analysis_canvas, self.theoretical_acceleration_distribution_toolbar_frame_right, export_animation_callback=self.export_animation_data)
-        self.theoretical_acceleration_distribution_analysis_toolbar.update()
+        self.theoretical_spectrum_frame_left = tk.Frame(self.theoretical_spectrum_frame, borderwidth=1, relief=tk.SOLID)
+        self.theoretical_spectrum_frame_left.grid(row=0, column=0, sticky="nsew")
+        self.theoretical_spectrum_toolbar_frame_left = tk.Frame(self.theoretical_spectrum_frame_left, borderwidth=0, relief=tk.SOLID)
+        self.theoretical_spectrum_toolbar_frame_left.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.theoretical_spectrum_frame_right = tk.Frame(self.theoretical_spectrum_frame, borderwidth=1, relief=tk.SOLID)
+        self.theoretical_spectrum_frame_right.grid(row=0, column=1, sticky="nsew")
+        self.theoretical_spectrum_toolbar_frame_right = tk.Frame(self.theoretical_spectrum_frame_right, borderwidth=0, relief=tk.SOLID)
+        self.theoretical_spectrum_toolbar_frame_right.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.theoretical_spectrum_frame.grid_columnconfigure(0, weight=1)
+        self.theoretical_spectrum_frame.grid_columnconfigure(1, weight=1)
+        self.theoretical_spectrum_frame.grid_rowconfigure(0, weight=1)
+
+        self.tab_builders[str(self.theoretical_g_acceleration_frame)] = self.build_theoretical_g_acceleration_tab
+        self.tab_builders[str(self.theoretical_non_g_acceleration_frame)] = self.build_theoretical_non_g_acceleration_tab
+        self.theoretical_field_map_frame_plot = tk.Frame(self.theoretical_field_map_frame, borderwidth=1, relief=tk.SOLID)
+        self.theoretical_field_map_frame_plot.pack(fill=tk.BOTH, expand=True)
+        self.theoretical_field_map_toolbar_frame = tk.Frame(self.theoretical_field_map_frame_plot, borderwidth=0, relief=tk.SOLID)
+        self.theoretical_field_map_toolbar_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.field_slice_var = tk.DoubleVar(value=0.0)
+        self.field_slice_scale = tk.Scale(self.theoretical_field_map_frame_plot, variable=self.field_slice_var, orient=tk.HORIZONTAL, label="Slice Offset (cm)", font=("Calibri", 9), command=self.draw_field_map_slices)
+        self.field_slice_scale.pack(side=tk.BOTTOM, fill=tk.X, padx=(10, 10))
+        self.pending_field_model = None
+        self.field_values = None
+        self.field_images = None
+
+        self.tab_builders[str(self.theoretical_acceleration_distribution_frame)] = self.build_theoretical_acceleration_distribution_tab
+        self.tab_builders[str(self.theoretical_field_map_frame)] = self.build_theoretical_field_map_tab
+        self.tab_builders[str(self.theoretical_spectrum_frame)] = self.build_theoretical_spectrum_tab
+        self.pending_spectra = set()
+        self.spectra = {}
+
+    def build_theoretical_g_acceleration_tab(self):
+        self.theoretical_g_acceleration_figure, self.theoretical_g_acceleration_ax, self.theoretical_g_acceleration_canvas = self.create_plot(self.theoretical_g_acceleration_frame_left, "Time-Averaged Gravitational Acceleration")
+        self.theoretical_g_components_figure, self.theoretical_g_components_ax, self.theoretical_g_components_canvas = self.create_plot(self.theoretical_g_acceleration_frame_right, "Time-Averaged Gravitational Acceleration")
+        self.theoretical_g_acceleration_toolbar = self.create_toolbar(self.theoretical_g_acceleration_canvas, self.theoretical_g_acceleration_toolbar_frame_left, self.export_theoretical_g_magnitude_data)
+        self.theoretical_g_components_toolbar = self.create_toolbar(self.theoretical_g_components_canvas, self.theoretical_g_acceleration_toolbar_frame_right, export_components_callback=self.export_theoretical_g_components_data)
+
+    def build_theoretical_non_g_acceleration_tab(self):
+        self.theoretical_non_g_acceleration_figure, self.theoretical_non_g_acceleration_ax, self.theoretical_non_g_acceleration_canvas = self.create_plot(self.theoretical_non_g_acceleration_frame_left, "Time-Averaged Non-Gravitational Acceleration")
+        self.theoretical_non_g_components_figure, self.theoretical_non_g_components_ax, self.theoretical_non_g_components_canvas = self.create_plot(self.theoretical_non_g_acceleration_frame_right, "Time-Averaged Non-Gravitational Acceleration")
+        self.theoretical_non_g_acceleration_toolbar = self.create_toolbar(self.theoretical_non_g_acceleration_canvas, self.theoretical_non_g_acceleration_toolbar_frame_left, self.export_theoretical_non_g_magnitude_data)
+        self.theoretical_non_g_components_toolbar = self.create_toolbar(self.theoretical_non_g_components_canvas, self.theoretical_non_g_acceleration_toolbar_frame_right, export_components_callback=self.export_theoretical_non_g_components_data)
+
+    def build_theoretical_acceleration_distribution_tab(self):
+        self.theoretical_acceleration_distribution_figure, self.theoretical_acceleration_distribution_ax, self.theoretical_acceleration_distribution_canvas = self.create_plot(self.theoretical_acceleration_distribution_frame_left, "Orientation Distribution", projection='3d')
+        self.theoretical_acceleration_distribution_analysis_figure, self.theoretical_acceleration_distribution_analysis_ax, self.theoretical_acceleration_distribution_analysis_canvas = self.create_plot(self.theoretical_acceleration_distribution_frame_right, "Orientation Distribution", projection='3d')
+        self.theoretical_acceleration_distribution_toolbar = self.create_toolbar(self.theoretical_acceleration_distribution_canvas, self.theoretical_acceleration_distribution_toolbar_frame_left, export_distribution_callback=self.export_theoretical_distribution_data)
+        self.theoretical_acceleration_distribution_analysis_toolbar = self.create_toolbar(self.theoretical_acceleration_distribution_analysis_canvas, self.theoretical_acceleration_distribution_toolbar_frame_right, export_animation_callback=self.export_animation_data)
+
+    def build_theoretical_field_map_tab(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.theoretical_field_map_figure = Figure()
+        self.theoretical_field_map_canvas = FigureCanvasTkAgg(self.theoretical_field_map_figure, self.theoretical_field_map_frame_plot)
+        self.theoretical_field_map_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas_tabs[self.theoretical_field_map_canvas] = str(self.theoretical_field_map_frame)
+        self.theoretical_field_map_toolbar = self.create_toolbar(self.theoretical_field_map_canvas, self.theoretical_field_map_toolbar_frame, self.export_theoretical_field_map_data)
+        self.clear_theoretical_field_map_tab()
+
+    def build_theoretical_spectrum_tab(self):
+        self.theoretical_spectrum_figure, self.theoretical_spectrum_ax, self.theoretical_spectrum_canvas = self.create_plot(self.theoretical_spectrum_frame_left, "Power Spectral Density")
+        self.theoretical_spectrum_analysis_figure, self.theoretical_spectrum_analysis_ax, self.theoretical_spectrum_analysis_canvas = self.create_plot(self.theoretical_spectrum_frame_right, "Power Spectral Density (Time Period of Analysis)")
+        configure_spectrum_axes(self.theoretical_spectrum_ax)
+        configure_spectrum_axes(self.theoretical_spectrum_analysis_ax)
+        self.theoretical_spectrum_toolbar = self.create_toolbar(self.theoretical_spectrum_canvas, self.theoretical_spectrum_toolbar_frame_left, export_components_callback=lambda: self.export_spectrum_data("Theoretical", 0))
+        self.theoretical_spectrum_analysis_toolbar = self.create_toolbar(self.theoretical_spectrum_analysis_canvas, self.theoretical_spectrum_toolbar_frame_right, export_components_callback=lambda: self.export_spectrum_data("Theoretical", 1))
 
     def setup_experimental_plot_frames(self):
         self.experimental_g_acceleration_frame = tk.Frame(self.notebook, borderwidth=0, relief=tk.SOLID)
         self.experimental_acceleration_distribution_frame = tk.Frame(self.notebook, borderwidth=0, relief=tk.SOLID)
+        self.experimental_spectrum_frame = tk.Frame(self.notebook, borderwidth=0, relief=tk.SOLID)
 
         self.experimental_g_acceleration_frame_left = tk.Frame(self.experimental_g_acceleration_frame, borderwidth=1, relief=tk.SOLID)
         self.experimental_g_acceleration_frame_left.grid(row=0, column=0, sticky="nsew")
@@ -425,27 +573,6 @@ class GUI:
         self.experimental_g_acceleration_frame.grid_columnconfigure(1, weight=1)
         self.experimental_g_acceleration_frame.grid_rowconfigure(0, weight=1)
 
-        self.experimental_g_acceleration_figure_left = plt.Figure()
-        self.experimental_g_acceleration_ax_left = self.experimental_g_acceleration_figure_left.add_subplot(1, 1, 1)
-        self.experimental_g_acceleration_ax_left.set_title("Time-Averaged Gravitational Acceleration")
-        self.experimental_g_acceleration_ax_left.set_xlabel('Time (h)')
-        self.experimental_g_acceleration_ax_left.set_ylabel('Acceleration (g)')
-        self.experimental_g_acceleration_canvas_left = FigureCanvasTkAgg(self.experimental_g_acceleration_figure_left, self.experimental_g_acceleration_frame_left)
-        self.experimental_g_acceleration_canvas_left.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.experimental_g_acceleration_figure_right = plt.Figure()
-        self.experimental_g_acceleration_ax_right = self.experimental_g_acceleration_figure_right.add_subplot(1, 1, 1)
-        self.experimental_g_acceleration_ax_right.set_title("Time-Averaged Gravitational Acceleration")
-        self.experimental_g_acceleration_ax_right.set_xlabel('Time (h)')
-        self.experimental_g_acceleration_ax_right.set_ylabel('Acceleration (g)')
-        self.experimental_g_acceleration_canvas_right = FigureCanvasTkAgg(self.experimental_g_acceleration_figure_right, self.experimental_g_acceleration_frame_right)
-        self.experimental_g_acceleration_canvas_right.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.experimental_g_acceleration_toolbar_left = CustomToolbar(self.experimental_g_acceleration_canvas_left, self.experimental_g_acceleration_toolbar_frame_left, self.export_experimental_g_magnitude_data)
-        self.experimental_g_acceleration_toolbar_left.update()
-        self.experimental_g_acceleration_toolbar_right = CustomToolbar(self.experimental_g_acceleration_canvas_right, self.experimental_g_acceleration_toolbar_frame_right, export_components_callback=self.export_experimental_g_components_data)
-        self.experimental_g_acceleration_toolbar_right.update()
-
         self.experimental_acceleration_distribution_frame_left = tk.Frame(self.experimental_acceleration_distribution_frame, borderwidth=1, relief=tk.SOLID)
         self.experimental_acceleration_distribution_frame_left.grid(row=0, column=0, sticky="nsew")
         self.experimental_acceleration_distribution_toolbar_frame_left = tk.Frame(self.experimental_acceleration_distribution_frame_left, borderwidth=0, relief=tk.SOLID)
@@ -460,47 +587,43 @@ class GUI:
         self.experimental_acceleration_distribution_frame.grid_columnconfigure(1, weight=1)
         self.experimental_acceleration_distribution_frame.grid_rowconfigure(0, weight=1)
 
-        self.experimental_acceleration_distribution_figure = plt.Figure()
-        self.experimental_acceleration_distribution_ax = self.experimental_acceleration_distribution_figure.add_subplot(1, 1, 1, projection='3d')
-        self.configure_3d_axes(self.experimental_acceleration_distribution_ax, "Orientation Distribution")
-        self.experimental_acceleration_distribution_canvas = FigureCanvasTkAgg(self.experimental_acceleration_distribution_figure, self.experimental_acceleration_distribution_frame_left)
-        self.experimental_acceleration_distribution_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.experimental_acceleration_distribution_analysis_figure = plt.Figure()
-        self.experimental_acceleration_distribution_analysis_ax = self.experimental_acceleration_distribution_analysis_figure.add_subplot(1, 1, 1, projection='3d')
-        self.configure_3d_axes(self.experimental_acceleration_distribution_analysis_ax, "Orientation Distribution")
-        self.experimental_acceleration_distribution_analysis_canvas = FigureCanvasTkAgg(self.experimental_acceleration_distribution_analysis_figure, self.experimental_acceleration_distribution_frame_right)
-        self.experimental_acceleration_distribution_analysis_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        self.experimental_acceleration_distribution_toolbar = CustomToolbar(self.experimental_acceleration_distribution_canvas, self.experimental_acceleration_distribution_toolbar_frame_left, export_distribution_callback=self.export_experimental_distribution_data)
-        self.experimental_acceleration_distribution_toolbar.update()
-        self.experimental_acceleration_distribution_analysis_toolbar = CustomToolbar(self.experimental_acceleration_distribution_analysis_canvas, self.experimental_acceleration_distribution_toolbar_frame_right, export_animation_callback=self.export_animation_data)
-        self.experimental_acceleration_distribution_analysis_toolbar.update()
-
-    def configure_3d_axes(self, ax, title):
-        ax.set_xlabel('X (g)')
-        ax.set_ylabel('Y (g)')
-        ax.set_zlabel('Z (g)')
-        ax.set_xlim(1, -1)
-        ax.set_ylim(1, -1)
-        ax.set_zlim(-1, 1)
-        ax.set_xticks([-1, -0.5, 0, 0.5, 1])
-        ax.set_yticks([-1, -0.5, 0, 0.5, 1])
-        ax.set_zticks([-1, -0.5, 0, 0.5, 1])
-        ax.set_title(title)
-        ax.set_box_aspect([1, 1, 1])
-        ax.grid(False)
-
-        ax.xaxis.set_pane_color((1.0, 1.0, 1.0, 0.0)) 
-        ax.yaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))  
-        ax.zaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))  
-
-        u = np.linspace(0, 2 * np.pi, 25)
-        v = np.linspace(0, np.pi, 25)
-        x = np.outer(np.cos(u), np.sin(v))
-        y = np.outer(np.sin(u), np.sin(v))
-        z = np.outer(np.ones(np.size(u)), np.cos(v))
-        ax.plot_wireframe(x, y, z, color='#aeb0b5', linewidth=0.5, alpha=0.5, label='_nolegend_')
+        self.experimental_spectrum_frame_left = tk.Frame(self.experimental_spectrum_frame, borderwidth=1, relief=tk.SOLID)
+        self.experimental_spectrum_frame_left.grid(row=0, column=0, sticky="nsew")
+        self.experimental_spectrum_toolbar_frame_left = tk.Frame(self.experimental_spectrum_frame_left, borderwidth=0, relief=tk.SOLID)
+        self.experimental_spectrum_toolbar_frame_left.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.experimental_spectrum_frame_right = tk.Frame(self.experimental_spectrum_frame, borderwidth=1, relief=tk.SOLID)
+        self.experimental_spectrum_frame_right.grid(row=0, column=1, sticky="nsew")
+        self.experimental_spectrum_toolbar_frame_right = tk.Frame(self.experimental_spectrum_frame_right, borderwidth=0, relief=tk.SOLID)
+        self.experimental_spectrum_toolbar_frame_right.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.experimental_spectrum_frame.grid_columnconfigure(0, weight=1)
+        self.experimental_spectrum_frame.grid_columnconfigure(1, weight=1)
+        self.experimental_spectrum_frame.grid_rowconfigure(0, weight=1)
+
+        self.tab_builders[str(self.experimental_g_acceleration_frame)] = self.build_experimental_g_acceleration_tab
+        self.tab_builders[str(self.experimental_acceleration_distribution_frame)] = self.build_experimental_acceleration_distribution_tab
+        self.tab_builders[str(self.experimental_spectrum_frame)] = self.build_experimental_spectrum_tab
+
+    def build_experimental_g_acceleration_tab(self):
+        self.experimental_g_acceleration_figure_left, self.experimental_g_acceleration_ax_left, self.experimental_g_acceleration_canvas_left = self.create_plot(self.experimental_g_acceleration_frame_left, "Time-Averaged Gravitational Acceleration")
+        self.experimental_g_acceleration_figure_right, self.experimental_g_acceleration_ax_right, self.experimental_g_acceleration_canvas_right = self.create_plot(self.experimental_g_acceleration_frame_right, "Time-Averaged Gravitational Acceleration")
+        self.experimental_g_acceleration_toolbar_left = self.create_toolbar(self.experimental_g_acceleration_canvas_left, self.experimental_g_acceleration_toolbar_frame_left, self.export_experimental_g_magnitude_data)
+        self.experimental_g_acceleration_toolbar_right = self.create_toolbar(self.experimental_g_acceleration_canvas_right, self.experimental_g_acceleration_toolbar_frame_right, export_components_callback=self.export_experimental_g_components_data)
+
+    def build_experimental_acceleration_distribution_tab(self):
+        self.experimental_acceleration_distribution_figure, self.experimental_acceleration_distribution_ax, self.experimental_acceleration_distribution_canvas = self.create_plot(self.experimental_acceleration_distribution_frame_left, "Orientation Distribution", projection='3d')
+        self.experimental_acceleration_distribution_analysis_figure, self.experimental_acceleration_distribution_analysis_ax, self.experimental_acceleration_distribution_analysis_canvas = self.create_plot(self.experimental_acceleration_distribution_frame_right, "Orientation Distribution", projection='3d')
+        self.experimental_acceleration_distribution_toolbar = self.create_toolbar(self.experimental_acceleration_distribution_canvas, self.experimental_acceleration_distribution_toolbar_frame_left, export_distribution_callback=self.export_experimental_distribution_data)
+        self.experimental_acceleration_distribution_analysis_toolbar = self.create_toolbar(self.experimental_acceleration_distribution_analysis_canvas, self.experimental_acceleration_distribution_toolbar_frame_right, export_animation_callback=self.export_animation_data)
+
+    def build_experimental_spectrum_tab(self):
+        self.experimental_spectrum_figure, self.experimental_spectrum_ax, self.experimental_spectrum_canvas = self.create_plot(self.experimental_spectrum_frame_left, "Power Spectral Density")
+        self.experimental_spectrum_analysis_figure, self.experimental_spectrum_analysis_ax, self.experimental_spectrum_analysis_canvas = self.create_plot(self.experimental_spectrum_frame_right, "Power Spectral Density (Time Period of Analysis)")
+        configure_spectrum_axes(self.experimental_spectrum_ax)
+        configure_spectrum_axes(self.experimental_spectrum_analysis_ax)
+        self.experimental_spectrum_toolbar = self.create_toolbar(self.experimental_spectrum_canvas, self.experimental_spectrum_toolbar_frame_left, export_components_callback=lambda: self.export_spectrum_data("Experimental", 0))
+        self.experimental_spectrum_analysis_toolbar = self.create_toolbar(self.experimental_spectrum_analysis_canvas, self.experimental_spectrum_toolbar_frame_right, export_components_callback=lambda: self.export_spectrum_data("Experimental", 1))
 
     def create_custom_theme(self):
         style = ttk.Style()
@@ -548,6 +671,8 @@ class GUI:
         self.notebook.add(self.theoretical_g_acceleration_frame, text="Gravitational Acceleration")
         self.notebook.add(self.theoretical_non_g_acceleration_frame, text="Non-Gravitational Acceleration")
         self.notebook.add(self.theoretical_acceleration_distribution_frame, text="Orientation Distribution")
+        self.notebook.add(self.theoretical_field_map_frame, text="Field Map")
+        self.notebook.add(self.theoretical_spectrum_frame, text="Spectrum")
         self.clear_theoretical_plots()
 
     def show_experimental_inputs(self):
@@ -565,19 +690,20 @@ class GUI:
 
         self.notebook.add(self.experimental_g_acceleration_frame, text="Gravitational Acceleration")
         self.notebook.add(self.experimental_acceleration_distribution_frame, text="Orientation Distribution")
+        self.notebook.add(self.experimental_spectrum_frame, text="Spectrum")
         self.clear_experimental_plots()
 
     def export_theoretical_g_magnitude_data(self):
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                if not self.theoretical_g_acceleration_ax.lines:
+                if not self.has_plot_data(self.theoretical_g_acceleration_ax):
                     raise ValueError("No data available to export.")
-                with open(file_path, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Time (h)", "Acceleration (g)"])
-                    for time, mag in zip(self.theoretical_g_acceleration_ax.lines[0].get_xdata(), self.theoretical_g_acceleration_ax.lines[0].get_ydata()):
-                        writer.writerow([time, mag])
+                results = self.mode_results("Theoretical")
+                if results is not None:
+                    write_magnitude_csv(file_path, result_hours(results), chunked_magnitude(results["g_avg"]))
+                else:
+                    write_magnitude_csv(file_path, self.theoretical_g_acceleration_ax.lines[0].get_xdata(), self.theoretical_g_acceleration_ax.lines[0].get_ydata())
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -586,17 +712,14 @@ class GUI:
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                if not self.theoretical_g_components_ax.lines:
+                if not self.has_plot_data(self.theoretical_g_components_ax):
                     raise ValueError("No data available to export.")
-                with open(file_path, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
-                    time_data = self.theoretical_g_components_ax.lines[0].get_xdata()
-                    x_data = self.theoretical_g_components_ax.lines[0].get_ydata()
-                    y_data = self.theoretical_g_components_ax.lines[1].get_ydata()
-                    z_data = self.theoretical_g_components_ax.lines[2].get_ydata()
-                    for time, x, y, z in zip(time_data, x_data, y_data, z_data):
-                        writer.writerow([time, x, y, z])
+                results = self.mode_results("Theoretical")
+                if results is not None:
+                    write_components_csv(file_path, result_hours(results), *chunked_components(results["g_avg"]))
+                else:
+                    lines = self.theoretical_g_components_ax.lines
+                    write_components_csv(file_path, lines[0].get_xdata(), lines[0].get_ydata(), lines[1].get_ydata(), lines[2].get_ydata())
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -605,13 +728,13 @@ class GUI:
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                if not self.theoretical_non_g_acceleration_ax.lines:
+                if not self.has_plot_data(self.theoretical_non_g_acceleration_ax):
                     raise ValueError("No data available to export.")
-                with open(file_path, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Time (h)", "Acceleration (g)"])
-                    for time, mag in zip(self.theoretical_non_g_acceleration_ax.lines[0].get_xdata(), self.theoretical_non_g_acceleration_ax.lines[0].get_ydata()):
-                        writer.writerow([time, mag])
+                results = self.mode_results("Theoretical")
+                if results is not None:
+                    write_magnitude_csv(file_path, result_hours(results), chunked_magnitude(results["a_avg"]))
+                else:
+                    write_magnitude_csv(file_path, self.theoretical_non_g_acceleration_ax.lines[0].get_xdata(), self.theoretical_non_g_acceleration_ax.lines[0].get_ydata())
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -620,17 +743,14 @@ class GUI:
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                if not self.theoretical_non_g_components_ax.lines:
+                if not self.has_plot_data(self.theoretical_non_g_components_ax):
                     raise ValueError("No data available to export.")
-                with open(file_path, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
-                    time_data = self.theoretical_non_g_components_ax.lines[0].get_xdata()
-                    x_data = self.theoretical_non_g_components_ax.lines[0].get_ydata()
-                    y_data = self.theoretical_non_g_components_ax.lines[1].get_ydata()
-                    z_data = self.theoretical_non_g_components_ax.lines[2].get_ydata()
-                    for time, x, y, z in zip(time_data, x_data, y_data, z_data):
-                        writer.writerow([time, x, y, z])
+                results = self.mode_results("Theoretical")
+                if results is not None:
+                    write_components_csv(file_path, result_hours(results), *chunked_components(results["a_avg"]))
+                else:
+                    lines = self.theoretical_non_g_components_ax.lines
+                    write_components_csv(file_path, lines[0].get_xdata(), lines[0].get_ydata(), lines[1].get_ydata(), lines[2].get_ydata())
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -639,16 +759,43 @@ class GUI:
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                if not self.theoretical_acceleration_distribution_ax.lines:
+                results = self.mode_results("Theoretical")
+                if results is None and not self.has_plot_data(self.theoretical_acceleration_distribution_ax):
+                    raise ValueError("No data available to export.")
+                if results is not None:
+                    write_components_csv(file_path, result_hours(results), *chunked_components(results["g_array"]))
+                else:
+                    line = self.theoretical_acceleration_distribution_ax.lines[0]
+                    x_data, y_data, z_data = line.get_data_3d()
+                    time_data = self.theoretical_non_g_acceleration_ax.lines[0].get_xdata()
+                    write_components_csv(file_path, time_data, x_data, y_data, z_data)
+                messagebox.showinfo("Success", "Data exported successfully.")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def export_theoretical_field_map_data(self):
+        from field_map import write_field_csv
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            try:
+                if self.field_values is None:
                     raise ValueError("No data available to export.")
-                line = self.theoretical_acceleration_distribution_ax.lines[0]
-                x_data, y_data, z_data = line.get_data_3d()
-                time_data = self.theoretical_non_g_acceleration_ax.lines[0].get_xdata()
-                with open(file_path, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
-                    for time, x, y, z in zip(time_data, x_data, y_data, z_data):
-                        writer.writerow([time, x, y, z])
+                write_field_csv(file_path, self.field_offsets, self.field_values.ravel())
+                messagebox.showinfo("Success", "Data exported successfully.")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def export_spectrum_data(self, mode, index):
+        from spectrum import write_spectrum_csv
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            try:
+                spectra = self.spectra.get(mode, [])
+                if index >= len(spectra):
+                    raise ValueError("No data available to export.")
+                write_spectrum_csv(file_path, spectra[index])
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -657,13 +804,13 @@ class GUI:
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                if not self.experimental_g_acceleration_ax_left.lines:
+                if not self.has_plot_data(self.experimental_g_acceleration_ax_left):
                     raise ValueError("No data available to export.")
-                with open(file_path, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Time (h)", "Acceleration (g)"])
-                    for time, mag in zip(self.experimental_g_acceleration_ax_left.lines[0].get_xdata(), self.experimental_g_acceleration_ax_left.lines[0].get_ydata()):
-                        writer.writerow([time, mag])
+                results = self.mode_results("Experimental")
+                if results is not None:
+                    write_magnitude_csv(file_path, result_hours(results), chunked_magnitude(results["averages"]))
+                else:
+                    write_magnitude_csv(file_path, self.experimental_g_acceleration_ax_left.lines[0].get_xdata(), self.experimental_g_acceleration_ax_left.lines[0].get_ydata())
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -672,17 +819,14 @@ class GUI:
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                if not self.experimental_g_acceleration_ax_right.lines:
+                if not self.has_plot_data(self.experimental_g_acceleration_ax_right):
                     raise ValueError("No data available to export.")
-                with open(file_path, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
-                    time_data = self.experimental_g_acceleration_ax_right.lines[0].get_xdata()
-                    x_data = self.experimental_g_acceleration_ax_right.lines[0].get_ydata()
-                    y_data = self.experimental_g_acceleration_ax_right.lines[1].get_ydata()
-                    z_data = self.experimental_g_acceleration_ax_right.lines[2].get_ydata()
-                    for time, x, y, z in zip(time_data, x_data, y_data, z_data):
-                        writer.writerow([time, x, y, z])
+                results = self.mode_results("Experimental")
+                if results is not None:
+                    write_components_csv(file_path, result_hours(results), *chunked_components(results["averages"]))
+                else:
+                    lines = self.experimental_g_acceleration_ax_right.lines
+                    write_components_csv(file_path, lines[0].get_xdata(), lines[0].get_ydata(), lines[1].get_ydata(), lines[2].get_ydata())
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -691,21 +835,26 @@ class GUI:
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                if not self.experimental_acceleration_distribution_ax.lines:
+                results = self.mode_results("Experimental")
+                if results is None and not self.has_plot_data(self.experimental_acceleration_distribution_ax):
                     raise ValueError("No data available to export.")
-                line = self.experimental_acceleration_distribution_ax.lines[0]
-                x_data, y_data, z_data = line.get_data_3d()
-                time_data = self.experimental_g_acceleration_ax_left.lines[0].get_xdata()
-                with open(file_path, mode='w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
-                    for time, x, y, z in zip(time_data, x_data, y_data, z_data):
-                        writer.writerow([time, x, y, z])
+                if results is not None:
+                    write_components_csv(file_path, result_hours(results), *chunked_components(results["measurements"]))
+                else:
+                    line = self.experimental_acceleration_distribution_ax.lines[0]
+                    x_data, y_data, z_data = line.get_data_3d()
+                    time_data = self.experimental_g_acceleration_ax_left.lines[0].get_xdata()
+                    write_components_csv(file_path, time_data, x_data, y_data, z_data)
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
     def export_animation_data(self):
+        import matplotlib
+        import numpy as np
+        from compute_backend import analysis_indices
+        from math_model import MathModel
+
         file_path = filedialog.asksaveasfilename(defaultextension=".mp4", filetypes=[("MP4 files", "*.mp4")])
         if file_path:
             try:
@@ -713,8 +862,14 @@ class GUI:
                 start_analysis = self.last_start_analysis_theo if self.mode_var.get() == "Theoretical" else self.last_start_analysis_exp
                 end_analysis = self.last_end_analysis_theo if self.mode_var.get() == "Theoretical" else self.last_end_analysis_exp
 
-                if self.last_mode == "Theoretical":
-                    if not self.theoretical_acceleration_distribution_analysis_ax.lines:
+                results = self.mode_results(self.last_mode)
+                scale = 1
+                if self.last_mode == "Theoretical" and results is not None:
+                    if not self.has_plot_data(self.theoretical_acceleration_distribution_analysis_ax):
+                        raise ValueError("No data available to export.")
+                    time_data, (x_data, y_data, z_data), scale = results["time_array"], results["g_array"], 3600
+                elif self.last_mode == "Theoretical":
+                    if not self.has_plot_data(self.theoretical_acceleration_distribution_analysis_ax):
                         raise ValueError("No data available to export.")
                     inner_rpm = self.last_inner_velocity if self.last_inner_velocity is not None else 0.0
                     outer_rpm = self.last_outer_velocity if self.last_outer_velocity is not None else 0.0
@@ -728,27 +883,15 @@ class GUI:
                     time_data = time_array / 3600
 
                 elif self.last_mode == "Experimental":
-                    if not self.experimental_acceleration_distribution_analysis_ax.lines:
+                    if not self.has_plot_data(self.experimental_acceleration_distribution_analysis_ax):
                         raise ValueError("No data available to export.")
                     
                     if isinstance(self.last_experimental_data, tuple): 
                         time_data, x_data, y_data, z_data = self.last_experimental_data
                     else: 
-                        datetime_str = []
-                        x_data, y_data, z_data = [], [], []
-                        for k in range(0, len(self.last_experimental_data) - 4, 5):
-                            try:
-                                dt = parser.parse(self.last_experimental_data[k] + " " + self.last_experimental_data[k + 1])
-                            except ValueError:
-                                dt = parser.parse(self.last_experimental_data[k + 1] + " " + self.last_experimental_data[k])
-                            datetime_str.append(dt)
-                            x_data.append(float(self.last_experimental_data[k + 2]))
-                            y_data.append(float(self.last_experimental_data[k + 3]))
-                            z_data.append(float(self.last_experimental_data[k + 4]))
-                        time_data = [(dt - datetime_str[0]).total_seconds() / 3600 for dt in datetime_str]
-
-                start_index = next(i for i, t in enumerate(time_data) if t >= start_analysis)
-                end_index = next(i for i, t in enumerate(time_data) if t >= end_analysis)
+                        time_data, x_data, y_data, z_data = parse_date_time_data(self.last_experimental_data)
+
+                start_index, end_index = analysis_indices(time_data, start_analysis, end_analysis, scale)
                 sliced_x = np.array(x_data[start_index:end_index])
                 sliced_y = np.array(y_data[start_index:end_index])
                 sliced_z = np.array(z_data[start_index:end_index])
@@ -756,115 +899,595 @@ class GUI:
                 if sliced_x.size == 0 or sliced_y.size == 0 or sliced_z.size == 0:
                     raise ValueError("No data available to export.")
 
-                fig = plt.Figure(figsize=(8, 6), dpi=100)
-                ax = fig.add_subplot(111, projection='3d')
-                self.configure_3d_axes(ax, "Orientation Distribution")
-
-                def update(num):
-                    ax.clear()
-                    self.configure_3d_axes(ax, "Orientation Distribution")
-                    ax.plot(sliced_x[:num], sliced_y[:num], sliced_z[:num], color='#ec1c24', linewidth=1)
-                    return ax,
-
-                ani = animation.FuncAnimation(fig, update, frames=len(sliced_x), interval=10, blit=False)
-                writer = FFMpegWriter(fps=10, metadata=dict(artist='NASA'), bitrate=1800)
-                ani.save(file_path, writer=writer)
-
-                plt.close(fig)
+                save_distribution_animation(file_path, sliced_x, sliced_y, sliced_z)
                 messagebox.showinfo("Success", "Animation exported successfully.")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
     def clear_theoretical_plots(self):
-        self.theoretical_g_acceleration_ax.clear()
-        self.theoretical_g_acceleration_ax.set_title("Time-Averaged Gravitational Acceleration")
-        self.theoretical_g_acceleration_ax.set_xlabel('Time (h)')
-        self.theoretical_g_acceleration_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_g_acceleration_canvas.draw()
-
-        self.theoretical_g_components_ax.clear()
-        self.theoretical_g_components_ax.set_title("Time-Averaged Gravitational Acceleration")
-        self.theoretical_g_components_ax.set_xlabel('Time (h)')
-        self.theoretical_g_components_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_g_components_canvas.draw()
-
-        self.theoretical_non_g_acceleration_ax.clear()
-        self.theoretical_non_g_acceleration_ax.set_title("Time-Averaged Non-Gravitational Acceleration")
-        self.theoretical_non_g_acceleration_ax.set_xlabel('Time (h)')
-        self.theoretical_non_g_acceleration_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_non_g_acceleration_canvas.draw()
-
-        self.theoretical_non_g_components_ax.clear()
-        self.theoretical_non_g_components_ax.set_title("Time-Averaged Non-Gravitational Acceleration")
-        self.theoretical_non_g_components_ax.set_xlabel('Time (h)')
-        self.theoretical_non_g_components_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_non_g_components_canvas.draw()
-
-        self.theoretical_acceleration_distribution_ax.clear()
-        self.configure_3d_axes(self.theoretical_acceleration_distribution_ax, "Orientation Distribution")
-        self.theoretical_acceleration_distribution_canvas.draw()
-
-        self.theoretical_acceleration_distribution_analysis_ax.clear()
-        self.configure_3d_axes(self.theoretical_acceleration_distribution_analysis_ax, "Orientation Distribution")
-        self.theoretical_acceleration_distribution_analysis_canvas.draw()
+        if self.is_tab_built(self.theoretical_g_acceleration_frame):
+            self.clear_theoretical_g_acceleration_tab()
+        if self.is_tab_built(self.theoretical_non_g_acceleration_frame):
+            self.clear_theoretical_non_g_acceleration_tab()
+        if self.is_tab_built(self.theoretical_acceleration_distribution_frame):
+            self.clear_theoretical_acceleration_distribution_tab()
+        self.pending_field_model = None
+        if self.is_tab_built(self.theoretical_field_map_frame):
+            self.clear_theoretical_field_map_tab()
+        self.clear_spectrum_plots("Theoretical")
+
+    def clear_theoretical_g_acceleration_tab(self):
+        self.clear_time_series_plot(self.theoretical_g_acceleration_ax, self.theoretical_g_acceleration_canvas)
+        self.clear_time_series_plot(self.theoretical_g_components_ax, self.theoretical_g_components_canvas)
+
+    def clear_theoretical_non_g_acceleration_tab(self):
+        self.clear_time_series_plot(self.theoretical_non_g_acceleration_ax, self.theoretical_non_g_acceleration_canvas)
+        self.clear_time_series_plot(self.theoretical_non_g_components_ax, self.theoretical_non_g_components_canvas)
+
+    def clear_theoretical_acceleration_distribution_tab(self):
+        self.clear_distribution_plot(self.theoretical_acceleration_distribution_ax, self.theoretical_acceleration_distribution_canvas)
+        self.clear_distribution_plot(self.theoretical_acceleration_distribution_analysis_ax, self.theoretical_acceleration_distribution_analysis_canvas)
+
+    def clear_theoretical_field_map_tab(self):
+        self.field_values = None
+        self.field_images = None
+        self.theoretical_field_map_figure.clear()
+        ax = self.theoretical_field_map_figure.add_subplot(1, 1, 1)
+        ax.set_title("Time-Averaged Non-Gravitational Acceleration")
+        ax.set_axis_off()
+        self.draw_canvas(self.theoretical_field_map_canvas)
 
     def clear_experimental_plots(self):
-        self.experimental_g_acceleration_ax_left.clear()
-        self.experimental_g_acceleration_ax_left.set_title("Time-Averaged Gravitational Acceleration")
-        self.experimental_g_acceleration_ax_left.set_xlabel('Time (h)')
-        self.experimental_g_acceleration_ax_left.set_ylabel('Acceleration (g)')
-        self.experimental_g_acceleration_canvas_left.draw()
-
-        self.experimental_g_acceleration_ax_right.clear()
-        self.experimental_g_acceleration_ax_right.set_title("Time-Averaged Gravitational Acceleration")
-        self.experimental_g_acceleration_ax_right.set_xlabel('Time (h)')
-        self.experimental_g_acceleration_ax_right.set_ylabel('Acceleration (g)')
-        self.experimental_g_acceleration_canvas_right.draw()
-
-        self.experimental_acceleration_distribution_ax.clear()
-        self.configure_3d_axes(self.experimental_acceleration_distribution_ax, "Orientation Distribution")
-        self.experimental_acceleration_distribution_canvas.draw()
-
-        self.experimental_acceleration_distribution_analysis_ax.clear()
-        self.configure_3d_axes(self.experimental_acceleration_distribution_analysis_ax, "Orientation Distribution")
-        self.experimental_acceleration_distribution_analysis_canvas.draw()
+        if self.is_tab_built(self.experimental_g_acceleration_frame):
+            self.clear_experimental_g_acceleration_tab()
+        if self.is_tab_built(self.experimental_acceleration_distribution_frame):
+            self.clear_experimental_acceleration_distribution_tab()
+        self.clear_spectrum_plots("Experimental")
+
+    def clear_experimental_g_acceleration_tab(self):
+        self.clear_time_series_plot(self.experimental_g_acceleration_ax_left, self.experimental_g_acceleration_canvas_left)
+        self.clear_time_series_plot(self.experimental_g_acceleration_ax_right, self.experimental_g_acceleration_canvas_right)
+
+    def clear_experimental_acceleration_distribution_tab(self):
+        self.clear_distribution_plot(self.experimental_acceleration_distribution_ax, self.experimental_acceleration_distribution_canvas)
+        self.clear_distribution_plot(self.experimental_acceleration_distribution_analysis_ax, self.experimental_acceleration_distribution_analysis_canvas)
+
+    def clear_spectrum_plots(self, mode):
+        self.pending_spectra.discard(mode)
+        self.spectra.pop(mode, None)
+        if self.is_tab_built(self.spectrum_frame(mode)):
+            for ax, canvas in self.spectrum_axes(mode):
+                self.clear_time_series_plot(ax, canvas)
+
+    def clear_time_series_plot(self, ax, canvas):
+        self.window_sources.pop(ax, None)
+        for line in ax.lines:
+            line.set_data([], [])
+        remove_legend(ax)
+        self.draw_canvas(canvas)
+
+    def clear_distribution_plot(self, ax, canvas):
+        if ax in self.distribution_animations:
+            self.distribution_animations[ax]["points"] = None
+        self.remove_dwell_mesh(ax)
+        for line in ax.lines:
+            line.set_data_3d([], [], [])
+        remove_legend(ax)
+        self.draw_canvas(canvas)
 
     def import_data(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                try:
-                    self.experimental_data = import_sci_spinner_format_data(file_path)
-                    messagebox.showinfo("Success", "CSV file uploaded successfully.")
-                except ValueError:
-                    with open(file_path, 'r') as file:
-                        main_array = file.read().replace("   ", " ").replace('\t', ' ').replace('\n', ' ').replace(',', ' ').split(' ')
-                    self.experimental_data = main_array
-                    messagebox.showinfo("Success", "CSV file uploaded successfully.")
+                self.experimental_data = load_experimental_data(file_path)
+                messagebox.showinfo("Success", "CSV file uploaded successfully.")
             except FileNotFoundError:
                 messagebox.showerror("File Error", f"File not found: {file_path}")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
+    def start_batch(self):
+        from batch import expand_inputs, run_batch
+
+        directory = filedialog.askdirectory()
+        if not directory:
+            return
+        try:
+            start_analysis = self.start_analysis_exp_entry.get()
+            end_analysis = self.end_analysis_exp_entry.get()
+            start_analysis = float(start_analysis) if start_analysis else None
+            end_analysis = float(end_analysis) if end_analysis else None
+            if start_analysis is not None and end_analysis is not None and end_analysis <= start_analysis:
+                raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
+            files = expand_inputs([directory])
+            if not files:
+                raise ValueError(f"No CSV files found in {directory}")
+        except ValueError as ve:
+            messagebox.showerror("Error", str(ve))
+            return
+
+        self.batch_button.config(state=tk.DISABLED)
+        self.status_var.set(f"Batch: 0/{len(files)} files")
+        backend = self.backend_var.get()
+        self.run_in_background(lambda report: run_batch(files, start_analysis, end_analysis, backend, progress=lambda done, total, row: report(f"Batch: {done}/{total} files")), self.finish_batch)
+
+    def finish_batch(self, rows, error):
+        self.batch_button.config(state=tk.NORMAL)
+        if error is not None:
+            self.status_var.set("")
+            messagebox.showerror("Error", error)
+            return
+        failed = sum("error" in row for row in rows)
+        self.status_var.set(f"Batch: {len(rows)} files, {failed} failed")
+        self.show_batch_summary(rows)
+
+    def run_in_background(self, work, on_done):
+        messages = queue.Queue()
+
+        def target():
+            try:
+                messages.put(("done", work(lambda text: messages.put(("progress", text)))))
+            except Exception as e:
+                messages.put(("error", str(e)))
+
+        threading.Thread(target=target, daemon=True).start()
+        self.master.after(100, self.poll_background, messages, on_done)
+
+    def poll_background(self, messages, on_done):
+        while not messages.empty():
+            kind, value = messages.get()
+            if kind == "progress":
+                self.status_var.set(value)
+            elif kind == "error":
+                on_done(None, value)
+                return
+            else:
+                on_done(value, None)
+                return
+        self.master.after(100, self.poll_background, messages, on_done)
+
+    def show_batch_summary(self, rows):
+        from batch import SUMMARY_FIELDS, format_value
+
+        window = tk.Toplevel(self.master)
+        window.title("Batch Summary")
+        window.iconphoto(False, self.favicon)
+        headings = ["File", "Samples", "Duration (h)", "Magnitude", "Magnitude (analysis)", "Distribution", "Distribution (analysis)", "Error"]
+        tree = ttk.Treeview(window, columns=SUMMARY_FIELDS, show="headings", height=min(max(len(rows), 5), 25))
+        for field, heading in zip(SUMMARY_FIELDS, headings):
+            tree.heading(field, text=heading)
+            tree.column(field, width=300 if field == "error" else 110, anchor=tk.W if field in ("file", "error") else tk.E)
+        for row in rows:
+            tree.insert("", tk.END, values=[os.path.basename(row["file"])] + [format_value(row.get(field)) for field in SUMMARY_FIELDS[1:]])
+        scrollbar = ttk.Scrollbar(window, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        export_button = tk.Button(window, text="Export CSV", command=lambda: self.export_batch_summary(rows), font=("Calibri", 11), bg="#aeb0b5", activebackground="#d6d7d9")
+        export_button.pack(side=tk.BOTTOM, pady=(5, 5))
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+    def export_batch_summary(self, rows):
+        from batch import write_summary_csv
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            try:
+                write_summary_csv(file_path, rows)
+                messagebox.showinfo("Success", "Data exported successfully.")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def toggle_live_stream(self):
+        if getattr(self, 'live_reader', None) is not None:
+            self.stop_live_stream()
+            return
+        spec = simpledialog.askstring("Live Stream", "Source (tcp://host:port, udp://host:port, or a file/named pipe path):", parent=self.master)
+        if spec:
+            try:
+                self.start_live_stream(spec.strip())
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def start_live_stream(self, spec):
+        from streaming import DEFAULT_REFRESH_HZ, StreamAccumulator, StreamReader, open_source
+
+        self.cancel_refinement()
+        self.session_results = None
+        self.live_accumulator = StreamAccumulator(self.backend_var.get())
+        self.live_reader = StreamReader(open_source(spec)).start()
+        self.ensure_tabs_built(self.experimental_g_acceleration_frame, self.experimental_acceleration_distribution_frame)
+        self.clear_experimental_plots()
+        self.live_magnitude_line = self.magnitude_artists(self.experimental_g_acceleration_ax_left)["line"]
+        self.live_component_lines = self.component_artists(self.experimental_g_acceleration_ax_right)
+        update_legend(self.experimental_g_acceleration_ax_right, self.live_component_lines)
+        self.live_path_line = self.distribution_artists(self.experimental_acceleration_distribution_ax)["path"]
+        self.live_button.config(text="Stop Live Stream")
+        self.status_var.set(f"Live: waiting for samples from {spec}")
+        self.live_interval = 1000 // DEFAULT_REFRESH_HZ
+        self.master.after(self.live_interval, self.update_live_stream, self.live_reader)
+
+    def update_live_stream(self, reader):
+        import numpy as np
+
+        if reader is not self.live_reader:
+            return
+        accumulator = self.live_accumulator
+        samples = reader.drain()
+        if len(samples):
+            accumulator.update(samples)
+            history = accumulator.history
+            time_in_hours, averages = history.time[:history.size], history.values[:, :history.size]
+            self.live_magnitude_line.set_data(time_in_hours, np.sqrt(np.sum(averages**2, axis=0)))
+            self.live_magnitude_line.set_label(f"Magnitude: {accumulator.mean_magnitude:.3g}")
+            update_legend(self.experimental_g_acceleration_ax_left, [self.live_magnitude_line])
+            for line, values in zip(self.live_component_lines, averages):
+                line.set_data(time_in_hours, values)
+            for ax in (self.experimental_g_acceleration_ax_left, self.experimental_g_acceleration_ax_right):
+                rescale(ax)
+            self.live_path_line.set_data_3d(*accumulator.path.values())
+            self.set_distribution_label(self.experimental_acceleration_distribution_ax, f"Distribution: {accumulator.distribution}")
+            self.draw_canvas(self.experimental_g_acceleration_canvas_left)
+            self.draw_canvas(self.experimental_g_acceleration_canvas_right)
+            self.draw_canvas(self.experimental_acceleration_distribution_canvas)
+            self.status_var.set(f"Live: {accumulator.count} samples, magnitude {accumulator.mean_magnitude:.3g}, distribution {accumulator.distribution}")
+        if reader.finished:
+            self.stop_live_stream()
+            if reader.error is not None:
+                messagebox.showerror("Error", str(reader.error))
+        else:
+            self.master.after(self.live_interval, self.update_live_stream, reader)
+
+    def stop_live_stream(self):
+        self.live_reader.stop()
+        self.live_reader = None
+        self.live_button.config(text="Live Stream")
+
+    def start_optimizer(self):
+        from optimizer import OperatingPointOptimizer
+
+        if self.mode_var.get() != "Theoretical":
+            self.mode_var.set("Theoretical")
+            self.switch_mode("Theoretical")
+        if not self.simulation_duration_entry.get():
+            messagebox.showerror("Error", "Set the simulation duration (and distance from center) to recommend an operating point.")
+            return
+        try:
+            duration_hours = float(self.simulation_duration_entry.get())
+            distance_cm = float(self.distance_entry.get()) if self.distance_entry.get() else 0.0
+        except ValueError:
+            messagebox.showerror("Error", "Simulation duration and distance from center must be numbers.")
+            return
+        backend = self.backend_var.get()
+        self.status_var.set("Optimizer: screening candidates")
+        self.run_in_background(lambda report: OperatingPointOptimizer(distance_cm, duration_hours, backend=backend).run(progress=lambda stride, done, total: report(f"Optimizer: {done}/{total} candidates at 1/{stride} resolution" if total else f"Optimizer: refining at 1/{stride} resolution")), self.finish_optimizer)
+
+    def finish_optimizer(self, result, error):
+        if error is not None:
+            self.status_var.set("")
+            messagebox.showerror("Error", error)
+            return
+        best = result["best"]
+        self.status_var.set(f"Optimizer: {result['evaluations']} evaluations, {result['pruned']} pruned")
+        summary = (f"Inner: {best['inner_rpm']:g} rpm\nOuter: {best['outer_rpm']:g} rpm\n"
+                   f"Gravitational acceleration: {best['g_magnitude']:.3g} g\n"
+                   f"Non-gravitational acceleration: {best['non_g_magnitude']:.3g} g\n"
+                   f"Distribution: {best['distribution']}\n\nApply these settings?")
+        if messagebox.askyesno("Recommended Operating Point", summary):
+            for entry, value in ((self.inner_velocity_entry, best['inner_rpm']), (self.outer_velocity_entry, best['outer_rpm']),
+                                 (self.inner_position_entry, best['inner_position']), (self.outer_position_entry, best['outer_position'])):
+                entry.delete(0, tk.END)
+                entry.insert(0, f"{value:g}")
+
+    def start_identification(self):
+        from identification import fit_parameters
+
+        try:
+            if not getattr(self, 'experimental_data', None):
+                raise ValueError("Upload a CSV file in Experimental mode to identify its parameters.")
+            time_in_hours, x, y, z = experimental_arrays(self.experimental_data)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.status_var.set("Fit: estimating initial parameters")
+        self.run_in_background(lambda report: fit_parameters(time_in_hours, x, y, z, progress=lambda stage, total, info: report(f"Fit: stage {stage}/{total}, {info['span_hours']:.3g} h, RMS {info['rms']:.3g} g")), self.finish_identification)
+
+    def finish_identification(self, result, error):
+        if error is not None:
+            self.status_var.set("")
+            messagebox.showerror("Error", error)
+            return
+        self.status_var.set(f"Fit: RMS residual {result['rms']:.3g} g")
+        summary = (f"Inner: {result['inner_rpm']:.4g} rpm, initial position {result['inner_position']:.4g}°\n"
+                   f"Outer: {result['outer_rpm']:.4g} rpm, initial position {result['outer_position']:.4g}°\n"
+                   f"Sensor offset: ({result['offset_x']:.3g}, {result['offset_y']:.3g}, {result['offset_z']:.3g}) cm\n"
+                   f"RMS residual: {result['rms']:.3g} g\n\nApply these settings and compare with theory?")
+        if messagebox.askyesno("Identified Parameters", summary):
+            for entry, value in ((self.inner_velocity_entry, result['inner_rpm']), (self.outer_velocity_entry, result['outer_rpm']),
+                                 (self.inner_position_entry, result['inner_position']), (self.outer_position_entry, result['outer_position'])):
+                entry.delete(0, tk.END)
+                entry.insert(0, f"{value:.6g}")
+            self.compare_with_theory()
+
+    def save_session(self):
+        import numpy as np
+        from session import SESSION_EXTENSION, save_session
+
+        file_path = filedialog.asksaveasfilename(defaultextension=SESSION_EXTENSION, filetypes=[("Session files", "*" + SESSION_EXTENSION)])
+        if not file_path:
+            return
+        try:
+            state = {
+                "entries": {name: getattr(self, f"{name}_entry").get() for name in SESSION_ENTRIES},
+                "last": {name: getattr(self, f"last_{name}") for name in SESSION_LAST},
+                "results": None,
+            }
+            arrays = {}
+            if self.session_results is not None:
+                mode, results = self.session_results
+                state["results"] = mode
+                arrays.update({f"results/{name}": values for name, values in results.items()})
+            data = getattr(self, 'experimental_data', None)
+            if data and not (self.session_results and self.session_results[0] == "Experimental" and data is self.last_experimental_data):
+                time_in_hours, x, y, z = experimental_arrays(data)
+                arrays["data/time_in_hours"] = time_in_hours
+                arrays["data/measurements"] = np.vstack([x, y, z])
+            save_session(file_path, state, arrays)
+            self.status_var.set(f"Session saved to {file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def open_session(self, file_path=None):
+        from session import SESSION_EXTENSION, load_session
+
+        file_path = file_path or filedialog.askopenfilename(filetypes=[("Session files", "*" + SESSION_EXTENSION)])
+        if not file_path:
+            return
+        try:
+            state, arrays = load_session(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.cancel_refinement()
+        mode = state["results"] or state["last"]["mode"]
+        self.mode_var.set(mode)
+        self.switch_mode(mode)
+        for name, value in state["entries"].items():
+            entry = getattr(self, f"{name}_entry")
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+        for name, value in state["last"].items():
+            setattr(self, f"last_{name}", value)
+
+        results = {name.split("/", 1)[1]: arrays[name] for name in arrays.names if name.startswith("results/")}
+        if "data/time_in_hours" in arrays:
+            self.experimental_data = (arrays["data/time_in_hours"], *arrays["data/measurements"])
+        elif state["results"] == "Experimental":
+            self.experimental_data = (results["time_in_hours"], *results["measurements"])
+        self.last_experimental_data = getattr(self, 'experimental_data', None) if state["results"] == "Experimental" else None
+
+        self.session_results = (state["results"], results) if state["results"] else None
+        if state["results"] == "Theoretical":
+            self.update_theoretical_plots(results, self.session_model())
+        elif state["results"] == "Experimental":
+            self.update_experimental_plots(results, self.last_start_analysis_exp, self.last_end_analysis_exp)
+        self.status_var.set(f"Session restored from {file_path}")
+
+    def session_model(self):
+        from math_model import MathModel
+
+        delta_m = (self.last_distance or 0.0) / 100
+        return MathModel(self.last_inner_velocity or 0.0, self.last_outer_velocity or 0.0, delta_m, delta_m, delta_m,
+                         self.last_simulation_duration, self.last_inner_position or 0.0, self.last_outer_position or 0.0)
+
+    def compare_with_theory(self):
+        from comparison import compare
+        from math_model import MathModel
+
+        try:
+            if not getattr(self, 'experimental_data', None):
+                raise ValueError("Upload a CSV file in Experimental mode to compare with theory.")
+            if not any([self.inner_velocity_entry.get(), self.outer_velocity_entry.get()]):
+                raise ValueError("Set the angular velocities in Theoretical mode to compare with theory.")
+            time_in_hours, x, y, z = experimental_arrays(self.experimental_data)
+            delta_m = (float(self.distance_entry.get()) if self.distance_entry.get() else 0.0) / 100
+            inner_rpm = float(self.inner_velocity_entry.get()) if self.inner_velocity_entry.get() else 0.0
+            outer_rpm = float(self.outer_velocity_entry.get()) if self.outer_velocity_entry.get() else 0.0
+            theta_1_init = float(self.inner_position_entry.get()) if self.inner_position_entry.get() else 0.0
+            theta_2_init = float(self.outer_position_entry.get()) if self.outer_position_entry.get() else 0.0
+            model = MathModel(inner_rpm, outer_rpm, delta_m, delta_m, delta_m, time_in_hours[-1] - time_in_hours[0], theta_1_init, theta_2_init)
+            with self.instrumentation.stage("comparison", len(time_in_hours)):
+                result = compare(model, time_in_hours, x, y, z)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.show_comparison(result)
+
+    def show_comparison(self, result):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from comparison import stats_text
+
+        window = tk.Toplevel(self.master)
+        window.title("Theory vs. Experiment")
+        window.iconphoto(False, self.favicon)
+        figure = Figure(figsize=(10, 7))
+        time_in_hours = result["time_in_hours"]
+        series = [(f"{label} Component", measured, theory) for label, measured, theory in zip("XYZ", result["measured"], result["theory"])]
+        series.append(("Time-Averaged Magnitude", result["measured_magnitude"], result["theory_magnitude"]))
+        for k, (title, measured, theory) in enumerate(series):
+            ax = figure.add_subplot(2, 2, k + 1)
+            ax.plot(time_in_hours, measured, color='#0066B2', linewidth=0.8, label='Experiment')
+            ax.plot(time_in_hours, theory, color='#EC1C24', linewidth=0.8, linestyle='--', label='Theory')
+            ax.set_title(title)
+            ax.set_xlabel('Time (h)')
+            ax.set_ylabel('Acceleration (g)')
+            ax.legend()
+        figure.tight_layout()
+
+        tk.Label(window, text=stats_text(result["stats"]), font=("Calibri", 10), justify=tk.LEFT, anchor=tk.W).pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=(0, 5))
+        toolbar_frame = tk.Frame(window)
+        toolbar_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        canvas = FigureCanvasTkAgg(figure, window)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        window.comparison_toolbar = self.create_toolbar(canvas, toolbar_frame, lambda: self.export_comparison(result))
+        canvas.draw()
+
+    def export_comparison(self, result):
+        from comparison import write_comparison_csv
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            try:
+                write_comparison_csv(file_path, result)
+                messagebox.showinfo("Success", "Data exported successfully.")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def start_convergence_report(self):
+        from convergence import DEFAULT_THRESHOLD, DEFAULT_WINDOWS_HOURS, convergence
+
+        if self.session_results is None:
+            messagebox.showerror("Error", "Run the theoretical model or process a CSV file first.")
+            return
+        windows = simpledialog.askstring("Convergence Report", "Sliding window lengths (h):", initialvalue=" ".join(f"{hours:g}" for hours in DEFAULT_WINDOWS_HOURS), parent=self.master)
+        if windows is None:
+            return
+        threshold = simpledialog.askfloat("Convergence Report", "Converged below (g):", initialvalue=DEFAULT_THRESHOLD, minvalue=0.0, parent=self.master)
+        if threshold is None:
+            return
+        try:
+            windows_hours = [float(value) for value in windows.replace(",", " ").split()]
+        except ValueError:
+            messagebox.showerror("Error", "Window lengths must be numbers in hours.")
+            return
+        mode, results = self.session_results
+        if mode == "Theoretical":
+            time_values, components, scale = results["time_array"], results["g_array"], 3600
+        else:
+            time_values, components, scale = results["time_in_hours"], results["measurements"], 1
+        self.status_var.set("Convergence: computing sliding-window averages")
+        self.run_in_background(lambda report: convergence(time_values, components, windows_hours, threshold, scale=scale), self.finish_convergence_report)
+
+    def finish_convergence_report(self, result, error):
+        if error is not None:
+            self.status_var.set("")
+            messagebox.showerror("Error", error)
+            return
+        settled = result["stats"]["cumulative"]["settled_hours"]
+        self.status_var.set("Convergence: cumulative average " + ("never settles" if settled is None else f"settled at {settled:.3g} h"))
+        self.show_convergence_report(result)
+
+    def show_convergence_report(self, result):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from convergence import report_text
+
+        window = tk.Toplevel(self.master)
+        window.title("Convergence Report")
+        window.iconphoto(False, self.favicon)
+        figure = Figure(figsize=(10, 6))
+        ax = figure.add_subplot(111)
+        ax.plot(result["time_in_hours"], result["cumulative"], color='#0066B2', linewidth=1.2, label='Cumulative')
+        for hours, values in zip(result["windows_hours"], result["rolling"]):
+            ax.plot(result["time_in_hours"], values, linewidth=0.8, label=f'{hours:g} h Window')
+        ax.axhline(result["stats"]["threshold"], color='#EC1C24', linewidth=0.8, linestyle='--', label='Threshold')
+        ax.set_yscale('log')
+        ax.set_title('Time-Averaged Gravitational Acceleration')
+        ax.set_xlabel('Time (h)')
+        ax.set_ylabel('Magnitude (g)')
+        ax.legend()
+        figure.tight_layout()
+
+        tk.Label(window, text=report_text(result["stats"]), font=("Calibri", 10), justify=tk.LEFT, anchor=tk.W).pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=(0, 5))
+        toolbar_frame = tk.Frame(window)
+        toolbar_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        canvas = FigureCanvasTkAgg(figure, window)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        window.convergence_toolbar = self.create_toolbar(canvas, toolbar_frame, lambda: self.export_convergence_report(result))
+        canvas.draw()
+
+    def export_convergence_report(self, result):
+        from convergence import write_convergence_csv
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            try:
+                write_convergence_csv(file_path, result)
+                messagebox.showinfo("Success", "Data exported successfully.")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def start_coverage_profile(self):
+        from sphere_index import DEFAULT_LEVELS, coverage_profile
+
+        if self.session_results is None:
+            messagebox.showerror("Error", "Run the theoretical model or process a CSV file first.")
+            return
+        levels = simpledialog.askinteger("Coverage Profile", "Finest sphere level:", initialvalue=DEFAULT_LEVELS, minvalue=0, maxvalue=10, parent=self.master)
+        if levels is None:
+            return
+        mode, results = self.session_results
+        components = results["g_array"] if mode == "Theoretical" else results["measurements"]
+        self.status_var.set("Coverage: indexing samples on the sphere")
+        self.run_in_background(lambda report: coverage_profile(components, levels), self.finish_coverage_profile)
+
+    def finish_coverage_profile(self, profile, error):
+        if error is not None:
+            self.status_var.set("")
+            messagebox.showerror("Error", error)
+            return
+        self.status_var.set(f"Coverage: {100 * profile[-1]['coverage']:.1f}% of {profile[-1]['cells']} cells at level {profile[-1]['level']}")
+        self.show_coverage_profile(profile)
+
+    def show_coverage_profile(self, profile):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from sphere_index import profile_text
+
+        window = tk.Toplevel(self.master)
+        window.title("Coverage Profile")
+        window.iconphoto(False, self.favicon)
+        figure = Figure(figsize=(8, 5))
+        ax = figure.add_subplot(111)
+        ax.plot([entry["cell_degrees"] for entry in profile], [100 * entry["coverage"] for entry in profile], color='#0066B2', marker='o')
+        ax.set_xscale('log')
+        ax.invert_xaxis()
+        ax.set_ylim(0, 105)
+        ax.set_title('Sphere Coverage vs. Resolution')
+        ax.set_xlabel('Cell Size (deg)')
+        ax.set_ylabel('Coverage (%)')
+        figure.tight_layout()
+
+        tk.Label(window, text=profile_text(profile), font=("Calibri", 10), justify=tk.LEFT, anchor=tk.W).pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=(0, 5))
+        toolbar_frame = tk.Frame(window)
+        toolbar_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        canvas = FigureCanvasTkAgg(figure, window)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        window.coverage_toolbar = self.create_toolbar(canvas, toolbar_frame, lambda: self.export_coverage_profile(profile))
+        canvas.draw()
+
+    def export_coverage_profile(self, profile):
+        from sphere_index import write_coverage_csv
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if file_path:
+            try:
+                write_coverage_csv(file_path, profile)
+                messagebox.showinfo("Success", "Data exported successfully.")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
     def process_experimental_data(self, main_array, start_analysis, end_analysis, is_sci_spinner_format=False):
+        import numpy as np
+
         if is_sci_spinner_format:
             time_in_hours, x, y, z = main_array
         else:
-            datetime_str = []
-            x, y, z = [], [], []
-            for k in range(0, len(main_array) - 4, 5):
-                try:
-                    dt = parser.parse(main_array[k] + " " + main_array[k + 1])
-                except ValueError:
-                    dt = parser.parse(main_array[k + 1] + " " + main_array[k])
-                datetime_str.append(dt)
-                x.append(float(main_array[k + 2]))
-                y.append(float(main_array[k + 3]))
-                z.append(float(main_array[k + 4]))
-            time_in_seconds = [(dt - datetime_str[0]).total_seconds() for dt in datetime_str]
-            time_in_hours = [t / 3600 for t in time_in_seconds]
-
-        if not time_in_hours or not any(x) or not any(y) or not any(z):
+            with self.instrumentation.stage("parse", len(main_array) // 5):
+                time_in_hours, x, y, z = parse_date_time_data(main_array)
+
+        if len(time_in_hours) == 0 or not any(x) or not any(y) or not any(z):
             messagebox.showerror(
                 "Error",
                 "Invalid CSV file format.\n\n"
@@ -884,9 +1507,9 @@ class GUI:
             if end_analysis <= start_analysis:
                 raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
 
-        path_vis = PathVisualization("experimental", x, y, z)
-        distribution_score = path_vis.get_distribution()
-        self.update_experimental_plots(x, y, z, time_in_hours, start_analysis, end_analysis, distribution_score)
+        results = {"time_in_hours": np.asarray(time_in_hours, dtype=np.float64), "measurements": np.vstack([x, y, z]).astype(np.float64)}
+        self.session_results = ("Experimental", results)
+        self.update_experimental_plots(results, start_analysis, end_analysis)
 
     def process_experimental_data_submission(self):
         try:
@@ -902,6 +1525,7 @@ class GUI:
                 self.process_experimental_data(self.experimental_data, start_analysis, end_analysis, is_sci_spinner_format=True)
             else:
                 self.process_experimental_data(self.experimental_data, start_analysis, end_analysis)
+            return True
 
         except ValueError as ve:
             if "Upload a CSV file" in str(ve):
@@ -923,89 +1547,124 @@ class GUI:
                 )
         except Exception as e:
             messagebox.showerror("Error", str(e))
+        return False
 
     def animate_distribution(self, ax, canvas, x_data, y_data, z_data, color, label):
-        ax.clear()
-        self.configure_3d_axes(ax, "Orientation Distribution")
-        line, = ax.plot([], [], [], color=color, linewidth=1)
-
-        path_vis = PathVisualization("animated", x_data, y_data, z_data)
-        distribution_score = path_vis.get_distribution()
+        line = self.distribution_artists(ax, color)["path"]
+        self.set_distribution_label(ax, label)
+        self.start_distribution_animation(ax, line, (x_data, y_data, z_data))
+        self.draw_canvas(canvas)
+
+    def start_distribution_animation(self, ax, line, points):
+        import matplotlib.animation as animation
+
+        state = self.distribution_animations.setdefault(ax, {"points": None, "first_frame": 0, "frame": 0})
+        state["points"] = points
+        state["first_frame"] = state["frame"] + 1
+        line.set_data_3d([], [], [])
+        if "animation" in state:
+            state["animation"].resume()
+            return
 
         def update(num):
-            line.set_data(x_data[:num], y_data[:num])
-            line.set_3d_properties(z_data[:num])
+            state["frame"] = num
+            if state["points"] is None:
+                state["animation"].pause()
+            elif len(state["points"][0]):
+                count = (num - state["first_frame"]) % len(state["points"][0])
+                line.set_data_3d(*(values[:count] for values in state["points"]))
             return line,
 
-        ax.legend([f"Distribution: {distribution_score}"])
-        ani = animation.FuncAnimation(ax.figure, update, frames=len(x_data), interval=10, blit=False)
-        canvas.draw()
-
-    def update_experimental_plots(self, x, y, z, time_in_hours, start_analysis, end_analysis, distribution_score):
-        self.experimental_g_acceleration_ax_left.clear()
-        self.experimental_g_acceleration_ax_left.set_title("Time-Averaged Gravitational Acceleration")
-
-        x_time_avg = np.cumsum(x) / np.arange(1, len(x) + 1)
-        y_time_avg = np.cumsum(y) / np.arange(1, len(y) + 1)
-        z_time_avg = np.cumsum(z) / np.arange(1, len(z) + 1)
-        magnitude = np.sqrt(x_time_avg**2 + y_time_avg**2 + z_time_avg**2)
-        avg_mag_full = np.mean(magnitude)
+        state["animation"] = animation.FuncAnimation(ax.figure, update, interval=10, blit=True, cache_frame_data=False)
+
+    def update_experimental_plots(self, results, start_analysis, end_analysis):
+        from compute_backend import magnitude_mean
+        from path_visualization import PathVisualization
+
+        samples = len(results["time_in_hours"])
+        backend = self.get_compute_backend()
+        self.ensure_tabs_built(self.experimental_g_acceleration_frame, self.experimental_acceleration_distribution_frame)
+        graph = self.analysis_graph("Experimental", results, start_analysis, end_analysis)
+        graph.add("averages", backend.time_average, ["measurements"], samples)
+        graph.add("segment_ids", lambda measurements: PathVisualization("experimental", *measurements, backend=backend).get_segment_ids(),
+                  ["measurements"], samples, label="scoring")
+        graph.add("g magnitude", magnitude_mean, ["averages"], samples)
+        graph.add("g window", self.magnitude_window, ["averages", "window", "window indices"])
+        graph.add("render g magnitude", self.update_experimental_g_acceleration_plot, ["time_in_hours", "averages", "g magnitude", "g window"], samples, main_thread=True)
+        graph.add("render g components", self.update_experimental_g_components_plot, ["time_in_hours", "averages"], samples, main_thread=True)
+        graph.add("render distribution", lambda time_in_hours, measurements, segment_ids, distribution: self.draw_experimental_orientation_distribution(
+            {"time_in_hours": time_in_hours, "measurements": measurements, "segment_ids": segment_ids, "distribution": distribution}),
+                  ["time_in_hours", "measurements", "segment_ids", "distribution"], samples, main_thread=True)
+        graph.run()
+        results.update({name: graph.values[name] for name in ("averages", "segment_ids", "distribution")})
+        self.queue_spectrum("Experimental")
+
+    def update_experimental_g_acceleration_plot(self, time_in_hours, averages, magnitude, window):
+        import numpy as np
+        from compute_backend import decimated
+
+        x_time_avg, y_time_avg, z_time_avg = decimated(averages, PLOT_MAX_POINTS)
+        self.update_magnitude_plot(self.experimental_g_acceleration_ax_left, self.experimental_g_acceleration_canvas_left,
+                                   decimated(time_in_hours, PLOT_MAX_POINTS), np.sqrt(x_time_avg**2 + y_time_avg**2 + z_time_avg**2), f"Magnitude: {magnitude:.3g}", window,
+                                   {"mode": "Experimental", "name": "Gravitational", "averages": averages, "time": time_in_hours, "scale": 1})
+
+    def update_experimental_g_components_plot(self, time_in_hours, averages):
+        from compute_backend import decimated
+
+        self.update_components_plot(self.experimental_g_acceleration_ax_right, self.experimental_g_acceleration_canvas_right,
+                                    decimated(time_in_hours, PLOT_MAX_POINTS), decimated(averages, PLOT_MAX_POINTS))
+
+    def analysis_graph(self, mode, results, start_analysis, end_analysis):
+        from compute_backend import analysis_indices, count_distribution
+        from stage_graph import StageGraph
 
-        self.experimental_g_acceleration_ax_left.plot(time_in_hours, magnitude, color='#0066B2', label=f"Magnitude: {avg_mag_full:.3g}")
-        
-        if start_analysis is not None and end_analysis is not None:
-            start_seg = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_seg = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            self.experimental_g_acceleration_ax_left.axvline(x=start_analysis, color='#EC1C24', linestyle='--')
-            self.experimental_g_acceleration_ax_left.axvline(x=end_analysis, color='#EC1C24', linestyle='--')
-            avg_mag_analysis = np.mean(magnitude[start_seg:end_seg])
-            self.experimental_g_acceleration_ax_left.plot(time_in_hours[start_seg:end_seg], magnitude[start_seg:end_seg], color='#EC1C24', label=f"Magnitude: {avg_mag_analysis:.3g}")
-
-        self.experimental_g_acceleration_ax_left.legend()
-        self.experimental_g_acceleration_ax_left.set_xlabel('Time (h)')
-        self.experimental_g_acceleration_ax_left.set_ylabel('Acceleration (g)')
-        self.experimental_g_acceleration_canvas_left.draw()
-
-        self.experimental_g_acceleration_ax_right.clear()
-        self.experimental_g_acceleration_ax_right.set_title('Time-Averaged Gravitational Acceleration')
-        self.experimental_g_acceleration_ax_right.plot(time_in_hours, x_time_avg, label='X', color='#6EAE39')
-        self.experimental_g_acceleration_ax_right.plot(time_in_hours, y_time_avg, label='Y', color='#EF7A35')
-        self.experimental_g_acceleration_ax_right.plot(time_in_hours, z_time_avg, label='Z', color='mediumorchid')
-        self.experimental_g_acceleration_ax_right.set_xlabel('Time (h)')
-        self.experimental_g_acceleration_ax_right.set_ylabel('Acceleration (g)')
-        self.experimental_g_acceleration_ax_right.legend()
-        self.experimental_g_acceleration_canvas_right.draw()
-
-        self.experimental_acceleration_distribution_ax.clear()
-        self.experimental_acceleration_distribution_ax.plot(x, y, z, color='#0066b2', linewidth=1)
-        self.configure_3d_axes(self.experimental_acceleration_distribution_ax, "Orientation Distribution")
-        self.experimental_acceleration_distribution_ax.legend([f"Distribution: {distribution_score}"])
-        self.experimental_acceleration_distribution_canvas.draw()
-
-        self.experimental_acceleration_distribution_analysis_ax.clear()
-        if start_analysis is not None and end_analysis is not None:
-            start_seg = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_seg = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            sliced_x, sliced_y, sliced_z = x[start_seg:end_seg], y[start_seg:end_seg], z[start_seg:end_seg]
-            path_vis_analysis = PathVisualization("experimental", sliced_x, sliced_y, sliced_z)
-            distribution_score_analysis = path_vis_analysis.get_distribution()
-            self.animate_distribution(
-                self.experimental_acceleration_distribution_analysis_ax,
-                self.experimental_acceleration_distribution_analysis_canvas,
-                sliced_x, sliced_y, sliced_z,
-                color='#ec1c24',
-                label=f"Distribution: {distribution_score_analysis}"
-            )
+        if mode == "Theoretical":
+            time_values, scale, points = results["time_array"], 3600, "g_array"
+            ax, canvas = self.theoretical_acceleration_distribution_analysis_ax, self.theoretical_acceleration_distribution_analysis_canvas
         else:
-            self.configure_3d_axes(self.experimental_acceleration_distribution_analysis_ax, "Orientation Distribution")
-            self.experimental_acceleration_distribution_analysis_canvas.draw()
+            time_values, scale, points = results["time_in_hours"], 1, "measurements"
+            ax, canvas = self.experimental_acceleration_distribution_analysis_ax, self.experimental_acceleration_distribution_analysis_canvas
+
+        graph = StageGraph(self.instrumentation)
+        for name, value in results.items():
+            graph.set(name, value)
+        graph.set("window", None if start_analysis is None or end_analysis is None else (start_analysis, end_analysis))
+        graph.add("distribution", count_distribution, ["segment_ids"], len(time_values), label="scoring (distribution)")
+        graph.add("window indices", lambda window: None if window is None else analysis_indices(time_values, *window, scale), ["window"])
+        graph.add("window score", lambda segment_ids, indices: None if indices is None else count_distribution(segment_ids[indices[0]:indices[1]]),
+                  ["segment_ids", "window indices"], label="scoring (window)")
+        graph.add("render distribution (window)", lambda points, indices, score: self.draw_window_distribution(ax, canvas, points, indices, score),
+                  [points, "window indices", "window score"], main_thread=True)
+        return graph
+
+    def magnitude_window(self, averages, window, indices):
+        from compute_backend import magnitude_mean
+
+        if window is None:
+            return None
+        return (*window, f"Magnitude: {magnitude_mean(averages, *indices):.3g}")
+
+    def draw_window_distribution(self, ax, canvas, points, indices, score):
+        if indices is None:
+            self.clear_distribution_plot(ax, canvas)
+            return
+        start, end = indices
+        self.animate_distribution(ax, canvas, *(values[start:end] for values in points), color='#ec1c24', label=f"Distribution: {score}")
 
     def start_simulation(self):
+        profile = ProfileCapture() if self.profile_var.get() else None
+        self.cancel_refinement()
+        self.run_estimate = None
+        self.instrumentation.start_run(self.mode_var.get(), backend=self.backend_var.get())
+        status = "error"
         try:
-            if self.mode_var.get() == "Theoretical":
-                self.process_theoretical_data()
-            elif self.mode_var.get() == "Experimental":
-                self.process_experimental_data_submission()
+            with profile or nullcontext():
+                if self.mode_var.get() == "Theoretical":
+                    status = "ok" if self.process_theoretical_data() else "cancelled"
+                elif self.mode_var.get() == "Experimental":
+                    status = "ok" if self.process_experimental_data_submission() else "error"
+            if status != "ok":
+                return
 
             self.last_start_analysis_theo = float(self.start_analysis_theo_entry.get()) if self.start_analysis_theo_entry.get() else None
             self.last_end_analysis_theo = float(self.end_analysis_theo_entry.get()) if self.end_analysis_theo_entry.get() else None
@@ -1022,10 +1681,25 @@ class GUI:
 
         except ValueError as ve:
             messagebox.showerror("Error", str(ve))
+        except MemoryError:
+            messagebox.showerror("Error", "The run ran out of memory. Enable Out-of-Core Storage in the Mode menu or shorten the simulation, "
+                                          "and lower the Memory Budget so that runs this large are caught before they start.")
         except Exception as e:
             messagebox.showerror("Error", str(e))
+        finally:
+            self.instrumentation.finish_run(status)
+            if status == "ok" and profile is None and self.run_estimate is not None:
+                self.record_run_estimate()
+            self.status_var.set(self.instrumentation.summary_text())
+            if profile is not None:
+                self.profile_var.set(False)
+                messagebox.showinfo("Profile", f"Profile saved to:\n{profile.report_path}\n{profile.profile_path}")
 
     def process_theoretical_data(self):
+        from math_model import MathModel
+        from path_visualization import PathVisualization
+        from progressive import preview_strides
+
         start_analysis = self.start_analysis_theo_entry.get()
         end_analysis = self.end_analysis_theo_entry.get()
         start_analysis = float(start_analysis) if start_analysis else None
@@ -1051,174 +1725,617 @@ class GUI:
         delta_m = delta_cm / 100
         delta_x, delta_y, delta_z = delta_m, delta_m, delta_m
 
-        theoretical_model = MathModel(inner_rpm, outer_rpm, delta_x, delta_y, delta_z, duration_hours, theta_1_init, theta_2_init)
-        time_array, g_array, a_array = theoretical_model.calculate_acceleration()
-
-        g_x_avg = np.cumsum(g_array[0]) / np.arange(1, len(g_array[0]) + 1)
-        g_y_avg = np.cumsum(g_array[1]) / np.arange(1, len(g_array[1]) + 1)
-        g_z_avg = np.cumsum(g_array[2]) / np.arange(1, len(g_array[2]) + 1)
-        g_magnitude = np.sqrt(g_x_avg**2 + g_y_avg**2 + g_z_avg**2)
-        avg_g_magnitude = np.mean(g_magnitude)
-
-        a_x_avg = np.cumsum(a_array[0]) / np.arange(1, len(a_array[0]) + 1)
-        a_y_avg = np.cumsum(a_array[1]) / np.arange(1, len(a_array[1]) + 1)
-        a_z_avg = np.cumsum(a_array[2]) / np.arange(1, len(a_array[2]) + 1)
-        a_magnitude = np.sqrt(a_x_avg**2 + a_y_avg**2 + a_z_avg**2)
-        avg_a_magnitude = np.mean(a_magnitude)
-
-        self.update_theoretical_g_acceleration_plot(time_array, g_magnitude, avg_g_magnitude)
-        self.update_theoretical_g_components_plot(time_array, g_x_avg, g_y_avg, g_z_avg)
-        self.update_theoretical_non_g_acceleration_plot(time_array, a_magnitude, avg_a_magnitude)
-        self.update_theoretical_non_g_components_plot(time_array, a_x_avg, a_y_avg, a_z_avg)
-        self.update_theoretical_acceleration_distribution_plot(g_array, time_array)
-
-    def update_theoretical_g_acceleration_plot(self, time_array, g_magnitude, avg_g_magnitude):
-        time_in_hours = time_array / 3600
-        self.theoretical_g_acceleration_ax.clear()
-        self.theoretical_g_acceleration_ax.set_title("Time-Averaged Gravitational Acceleration")
-        self.theoretical_g_acceleration_ax.plot(time_in_hours, g_magnitude, color='#0066b2', label=f"Magnitude: {avg_g_magnitude:.3g}")
-
-        start_analysis = self.start_analysis_theo_entry.get()
-        end_analysis = self.end_analysis_theo_entry.get()
-        start_analysis = float(start_analysis) if start_analysis else None
-        end_analysis = float(end_analysis) if end_analysis else None
-
-        if start_analysis is not None and end_analysis is not None:
-            self.theoretical_g_acceleration_ax.axvline(x=start_analysis, color='#EC1C24', linestyle='--')
-            self.theoretical_g_acceleration_ax.axvline(x=end_analysis, color='#EC1C24', linestyle='--')
-            start_index = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_index = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            avg_g_magnitude_analysis = np.mean(g_magnitude[start_index:end_index])
-            self.theoretical_g_acceleration_ax.plot(time_in_hours[start_index:end_index], g_magnitude[start_index:end_index], color='#EC1C24', label=f"Magnitude: {avg_g_magnitude_analysis:.3g}")
-
-        self.theoretical_g_acceleration_ax.legend()
-        self.theoretical_g_acceleration_ax.set_xlabel('Time (h)')
-        self.theoretical_g_acceleration_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_g_acceleration_canvas.draw()
-
-    def update_theoretical_g_components_plot(self, time_array, g_x_avg, g_y_avg, g_z_avg):
-        time_in_hours = time_array / 3600
-        self.theoretical_g_components_ax.clear()
-        self.theoretical_g_components_ax.set_title("Time-Averaged Gravitational Acceleration")
-        self.theoretical_g_components_ax.plot(time_in_hours, g_x_avg, label='X', color='#6EAE39')
-        self.theoretical_g_components_ax.plot(time_in_hours, g_y_avg, label='Y', color='#EF7A35')
-        self.theoretical_g_components_ax.plot(time_in_hours, g_z_avg, label='Z', color='mediumorchid')
-        self.theoretical_g_components_ax.legend()
-        self.theoretical_g_components_ax.set_xlabel('Time (h)')
-        self.theoretical_g_components_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_g_components_canvas.draw()
-
-    def update_theoretical_non_g_acceleration_plot(self, time_array, a_magnitude, avg_a_magnitude):
-        time_in_hours = time_array / 3600
-        self.theoretical_non_g_acceleration_ax.clear()
-        self.theoretical_non_g_acceleration_ax.set_title("Time-Averaged Non-Gravitational Acceleration")
-        self.theoretical_non_g_acceleration_ax.plot(time_in_hours, a_magnitude, color='#0066b2', label=f"Magnitude: {avg_a_magnitude:.3g}")
-
-        start_analysis = self.start_analysis_theo_entry.get()
-        end_analysis = self.end_analysis_theo_entry.get()
-        start_analysis = float(start_analysis) if start_analysis else None
-        end_analysis = float(end_analysis) if end_analysis else None
+        scratch_dir = self.new_scratch_dir() if self.out_of_core_var.get() else None
+        theoretical_model = MathModel(inner_rpm, outer_rpm, delta_x, delta_y, delta_z, duration_hours, theta_1_init, theta_2_init, scratch_dir=scratch_dir)
+        sphere_coords = PathVisualization("theoretical", [], [], [])._create_sphere()
+        backend = self.get_compute_backend()
+        if not self.check_memory_budget(theoretical_model, backend):
+            return False
+        strides = preview_strides(theoretical_model) if self.progressive_var.get() else []
+        if strides:
+            self.session_results = None
+            self.run_estimate = None
+            self.status_var.set(f"Preview from 1 in {strides[0]} samples...")
+            self.refinement = {"cancel": threading.Event(), "scratch_dir": theoretical_model.scratch_dir}
+            theoretical_model.cancel_event = self.refinement["cancel"]
+            self.refine_theoretical(theoretical_model, sphere_coords, backend, strides, self.refinement, first=True)
+            return True
+        time_array, g_array, a_array, g_avg, a_avg, segment_ids = backend.run(theoretical_model, sphere_coords, self.instrumentation)
+        results = {"time_array": time_array, "g_array": g_array, "g_avg": g_avg, "a_avg": a_avg, "segment_ids": segment_ids}
+        self.session_results = ("Theoretical", results)
+        self.update_theoretical_plots(results, theoretical_model)
+        return True
+
+    def check_memory_budget(self, model, backend):
+        from memory_budget import budget_bytes, disk_fits, estimate_run, estimate_text, load_calibration, lower_sample_interval
+
+        calibration = load_calibration()
+        budget = budget_bytes(calibration)
+        estimate = estimate_run(model.sample_count(), backend.name, model.scratch_dir is not None, calibration)
+        if budget is None or estimate["peak_bytes"] <= budget:
+            self.run_estimate = (backend.name, model.scratch_dir is not None, model.sample_count())
+            return True
+
+        disk_estimate = estimate_run(model.sample_count(), backend.name, True, calibration)
+        on_disk = model.scratch_dir is None and disk_estimate["peak_bytes"] <= budget and disk_fits(disk_estimate, self.scratch_root)
+        interval = lower_sample_interval(model.duration_hours, model.sample_interval, backend.name, budget, calibration)
+        message = f"This run is expected to exceed the memory budget.\n\n{estimate_text(estimate, budget)}\n\n"
+        if on_disk and interval:
+            use_disk = messagebox.askyesnocancel("Memory Budget", message + f"Yes: store the results on disk ({estimate_text(disk_estimate)})\n"
+                                                 f"No: sample every {interval:g} s instead of every {model.sample_interval:g} s\nCancel: do not run")
+        elif on_disk:
+            use_disk = messagebox.askokcancel("Memory Budget", message + f"Store the results on disk instead?\n({estimate_text(disk_estimate)})") or None
+        elif interval:
+            use_disk = False if messagebox.askokcancel("Memory Budget", message + f"Sample every {interval:g} s instead of every {model.sample_interval:g} s?") else None
+        else:
+            use_disk = False if messagebox.askokcancel("Memory Budget", message + "Neither on-disk storage nor a lower sample rate fits the budget. Run anyway?") else None
+            interval = model.sample_interval
+        if use_disk is None:
+            return False
+        if use_disk:
+            model.scratch_dir = self.new_scratch_dir()
+        else:
+            model.sample_interval = interval
+        self.run_estimate = (backend.name, model.scratch_dir is not None, model.sample_count())
+        return True
+
+    def record_run_estimate(self):
+        from memory_budget import record_run
+
+        wall_time = sum(stage["wall_time"] for stage in self.instrumentation.stages)
+        record_run(*self.run_estimate, self.instrumentation.run_peak_bytes(), wall_time)
+        self.run_estimate = None
+
+    def set_memory_budget(self):
+        from memory_budget import budget_bytes, physical_memory_bytes, set_budget_mb
+
+        current = budget_bytes()
+        physical = physical_memory_bytes()
+        prompt = "Peak memory budget per run (GB, 0 for half of physical memory):"
+        if physical is not None:
+            prompt += f"\nThis machine has {physical / 2**30:.3g} GB."
+        value = simpledialog.askfloat("Memory Budget", prompt, initialvalue=round(current / 2**30, 2) if current else 0.0, minvalue=0.0, parent=self.master)
+        if value is not None:
+            set_budget_mb(value * 1024 or None)
+
+    def show_theoretical_preview(self, preview, model=None):
+        from progressive import estimate_text
+
+        estimates = preview["estimates"]
+        self.update_theoretical_plots(preview, model)
+        self.set_magnitude_label(self.theoretical_g_acceleration_ax, self.theoretical_g_acceleration_canvas, f"Magnitude: {estimate_text(*estimates['g_magnitude'])} (preview)")
+        self.set_magnitude_label(self.theoretical_non_g_acceleration_ax, self.theoretical_non_g_acceleration_canvas, f"Magnitude: {estimate_text(*estimates['non_g_magnitude'])} (preview)")
+        self.set_distribution_label(self.theoretical_acceleration_distribution_ax, f"Distribution: {estimate_text(*estimates['distribution'], digits=4)} (preview)")
+        self.draw_canvas(self.theoretical_acceleration_distribution_canvas)
+        self.status_var.set(f"Preview from {len(preview['time_array'])} samples (1 in {preview['stride']}), refining...")
+
+    def refine_theoretical(self, model, sphere_coords, backend, strides, refinement, first=False):
+        from instrumentation import NullInstrumentation
+        from progressive import preview_run
+
+        def work(report):
+            model.check_cancelled()
+            if strides:
+                report(f"Preview: 1 in {strides[0]} samples")
+                return preview_run(model, strides[0], sphere_coords, backend)
+            report("Preview: computing exact results")
+            return dict(zip(("time_array", "g_array", "a_array", "g_avg", "a_avg", "segment_ids"), backend.run(model, sphere_coords, NullInstrumentation())))
+
+        self.run_in_background(work, lambda result, error: self.finish_refinement(model, sphere_coords, backend, strides, refinement, first, result, error))
+
+    def finish_refinement(self, model, sphere_coords, backend, strides, refinement, first, result, error):
+        if refinement is not self.refinement:
+            if refinement["scratch_dir"] is not None:
+                shutil.rmtree(refinement["scratch_dir"], ignore_errors=True)
+            return
+        if error is not None:
+            self.refinement = None
+            self.status_var.set("")
+            messagebox.showerror("Error", error)
+            return
+        if strides:
+            self.show_theoretical_preview(result, model if first else None)
+            self.refine_theoretical(model, sphere_coords, backend, strides[1:], refinement)
+            return
+        self.refinement = model.cancel_event = None
+        results = {name: result[name] for name in ("time_array", "g_array", "g_avg", "a_avg", "segment_ids")}
+        self.session_results = ("Theoretical", results)
+        self.update_theoretical_plots(results, None)
+        self.status_var.set(f"Exact results: {len(results['time_array'])} samples")
+
+    def update_theoretical_plots(self, results, model):
+        from compute_backend import magnitude_mean
+
+        samples = len(results["time_array"])
+        self.ensure_tabs_built(self.theoretical_g_acceleration_frame, self.theoretical_non_g_acceleration_frame, self.theoretical_acceleration_distribution_frame)
+        graph = self.analysis_graph("Theoretical", results, *self.entered_window("Theoretical"))
+        graph.add("g magnitude", magnitude_mean, ["g_avg"], samples)
+        graph.add("non-g magnitude", magnitude_mean, ["a_avg"], samples)
+        graph.add("g window", self.magnitude_window, ["g_avg", "window", "window indices"])
+        graph.add("non-g window", self.magnitude_window, ["a_avg", "window", "window indices"])
+        graph.add("render g magnitude", self.update_theoretical_g_acceleration_plot, ["time_array", "g_avg", "g magnitude", "g window"], samples, main_thread=True)
+        graph.add("render g components", self.update_theoretical_g_components_plot, ["time_array", "g_avg"], samples, main_thread=True)
+        graph.add("render non-g magnitude", self.update_theoretical_non_g_acceleration_plot, ["time_array", "a_avg", "non-g magnitude", "non-g window"], samples, main_thread=True)
+        graph.add("render non-g components", self.update_theoretical_non_g_components_plot, ["time_array", "a_avg"], samples, main_thread=True)
+        graph.add("render distribution", lambda time_array, g_array, segment_ids, distribution: self.draw_theoretical_orientation_distribution(
+            {"time_array": time_array, "g_array": g_array, "segment_ids": segment_ids, "distribution": distribution}),
+                  ["time_array", "g_array", "segment_ids", "distribution"], samples, main_thread=True)
+        graph.run()
+        results["distribution"] = graph.values["distribution"]
+        self.queue_spectrum("Theoretical")
+        if model is not None:
+            self.pending_field_model = model
+            if self.notebook.select() == str(self.theoretical_field_map_frame):
+                self.update_field_map_plot()
+
+    def spectrum_frame(self, mode):
+        return self.theoretical_spectrum_frame if mode == "Theoretical" else self.experimental_spectrum_frame
+
+    def spectrum_axes(self, mode):
+        if mode == "Theoretical":
+            return ((self.theoretical_spectrum_ax, self.theoretical_spectrum_canvas), (self.theoretical_spectrum_analysis_ax, self.theoretical_spectrum_analysis_canvas))
+        return ((self.experimental_spectrum_ax, self.experimental_spectrum_canvas), (self.experimental_spectrum_analysis_ax, self.experimental_spectrum_analysis_canvas))
+
+    def queue_spectrum(self, mode):
+        self.pending_spectra.add(mode)
+        if self.notebook.select() == str(self.spectrum_frame(mode)):
+            self.update_spectrum_plots(mode)
+
+    def update_spectrum_plots(self, mode):
+        from compute_backend import analysis_indices
+        from spectrum import spectrum
+
+        self.pending_spectra.discard(mode)
+        results = self.mode_results(mode)
+        if results is None:
+            self.clear_spectrum_plots(mode)
+            return
+        if mode == "Theoretical":
+            time_values, components, scale = results["time_array"], results["g_array"], 3600
+        else:
+            time_values, components, scale = results["time_in_hours"], results["measurements"], 1
+        start_analysis, end_analysis = self.entered_window(mode)
+        try:
+            with self.instrumentation.stage("spectrum", len(time_values)):
+                spectra = [spectrum(time_values, components, seconds_per_unit=3600 / scale)]
+                if start_analysis is not None:
+                    start_index, end_index = analysis_indices(time_values, start_analysis, end_analysis, scale)
+                    if end_index - start_index >= 2:
+                        spectra.append(spectrum(time_values, components, start_index, end_index, 3600 / scale))
+        except ValueError as ve:
+            messagebox.showerror("Error", str(ve))
+            return
+        self.spectra[mode] = spectra
+        self.ensure_tabs_built(self.spectrum_frame(mode))
+        for (ax, canvas), result in zip(self.spectrum_axes(mode), spectra + [None]):
+            if result is None:
+                self.clear_time_series_plot(ax, canvas)
+            else:
+                self.update_spectrum_plot(ax, canvas, result)
+
+    def update_spectrum_plot(self, ax, canvas, result):
+        from spectrum import component_label
+
+        lines = self.component_artists(ax)
+        for line, values, entry in zip(lines, result["psd"], result["stats"]["components"]):
+            line.set_data(result["frequencies"][1:], values[1:])
+            line.set_label(component_label(entry))
+        update_legend(ax, lines)
+        rescale(ax)
+        self.draw_canvas(canvas)
+
+    def update_field_map_plot(self):
+        from field_map import FIELD_GRID_POINTS, field_grid, offset_grid
+
+        model, self.pending_field_model = self.pending_field_model, None
+        half_extent = max(abs(model.delta_x), abs(model.delta_y), abs(model.delta_z))
+        if half_extent == 0:
+            self.clear_theoretical_field_map_tab()
+            self.theoretical_field_map_figure.axes[0].text(0.5, 0.5, "Set a distance from center to map the field across the sample volume.", ha='center', va='center')
+            self.draw_canvas(self.theoretical_field_map_canvas)
+            return
 
-        if start_analysis is not None and end_analysis is not None:
-            self.theoretical_non_g_acceleration_ax.axvline(x=start_analysis, color='#EC1C24', linestyle='--')
-            self.theoretical_non_g_acceleration_ax.axvline(x=end_analysis, color='#EC1C24', linestyle='--')
-            start_index = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_index = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            avg_a_magnitude_analysis = np.mean(a_magnitude[start_index:end_index])
-            self.theoretical_non_g_acceleration_ax.plot(time_in_hours[start_index:end_index], a_magnitude[start_index:end_index], color='#EC1C24', label=f"Magnitude: {avg_a_magnitude_analysis:.3g}")
-
-        self.theoretical_non_g_acceleration_ax.legend()
-        self.theoretical_non_g_acceleration_ax.set_xlabel('Time (h)')
-        self.theoretical_non_g_acceleration_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_non_g_acceleration_canvas.draw()
-
-    def update_theoretical_non_g_components_plot(self, time_array, a_x_avg, a_y_avg, a_z_avg):
-        time_in_hours = time_array / 3600
-        self.theoretical_non_g_components_ax.clear()
-        self.theoretical_non_g_components_ax.set_title("Time-Averaged Non-Gravitational Acceleration")
-        self.theoretical_non_g_components_ax.plot(time_in_hours, a_x_avg, label='X', color='#6EAE39')
-        self.theoretical_non_g_components_ax.plot(time_in_hours, a_y_avg, label='Y', color='#EF7A35')
-        self.theoretical_non_g_components_ax.plot(time_in_hours, a_z_avg, label='Z', color='mediumorchid')
-        self.theoretical_non_g_components_ax.legend()
-        self.theoretical_non_g_components_ax.set_xlabel('Time (h)')
-        self.theoretical_non_g_components_ax.set_ylabel('Acceleration (g)')
-        self.theoretical_non_g_components_canvas.draw()
-
-    def update_theoretical_acceleration_distribution_plot(self, g_array, time_array):
-        self.theoretical_acceleration_distribution_ax.clear()
-        self.theoretical_acceleration_distribution_ax.plot(g_array[0], g_array[1], g_array[2], color='#0066b2', linewidth=1)
-        self.configure_3d_axes(self.theoretical_acceleration_distribution_ax, "Orientation Distribution")
-        distribution_score = PathVisualization("theoretical", g_array[0], g_array[1], g_array[2]).get_distribution()
-        self.theoretical_acceleration_distribution_ax.legend([f"Distribution: {distribution_score}"])
-        self.theoretical_acceleration_distribution_canvas.draw()
-
-        self.theoretical_acceleration_distribution_analysis_ax.clear()
-        start_analysis = self.start_analysis_theo_entry.get()
-        end_analysis = self.end_analysis_theo_entry.get()
-        start_analysis = float(start_analysis) if start_analysis else None
-        end_analysis = float(end_analysis) if end_analysis else None
+        with self.instrumentation.stage("field map", FIELD_GRID_POINTS**3):
+            self.field_axis, self.field_values = field_grid(model, half_extent)
+        _, self.field_offsets = offset_grid(half_extent)
+        step = (self.field_axis[1] - self.field_axis[0]) * 100
+        self.field_slice_scale.config(from_=float(self.field_axis[0] * 100), to=float(self.field_axis[-1] * 100), resolution=float(step))
+        self.field_slice_var.set(0.0)
+        self.draw_field_map_slices()
 
-        if start_analysis is not None and end_analysis is not None:
-            time_in_hours = time_array / 3600
-            start_index = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_index = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            sliced_x, sliced_y, sliced_z = g_array[0][start_index:end_index], g_array[1][start_index:end_index], g_array[2][start_index:end_index]
-            path_vis_analysis = PathVisualization("theoretical", sliced_x, sliced_y, sliced_z)
-            distribution_score_analysis = path_vis_analysis.get_distribution()
-            self.animate_distribution(
-                self.theoretical_acceleration_distribution_analysis_ax,
-                self.theoretical_acceleration_distribution_analysis_canvas,
-                sliced_x, sliced_y, sliced_z,
-                color='#ec1c24',
-                label=f"Distribution: {distribution_score_analysis}"
-            )
-        else:
-            self.configure_3d_axes(self.theoretical_acceleration_distribution_analysis_ax, "Orientation Distribution")
-            self.theoretical_acceleration_distribution_analysis_canvas.draw()
+    def draw_field_map_slices(self, value=None):
+        if self.field_values is None:
+            return
+        axis, values = self.field_axis * 100, self.field_values
+        index = min(max(int(round((self.field_slice_var.get() - axis[0]) / (axis[1] - axis[0]))), 0), len(axis) - 1)
+        offset = axis[index]
+        extent = [axis[0], axis[-1], axis[0], axis[-1]]
+        slices = [
+            (f"XY Plane (z = {offset:.3g} cm)", values[:, :, index].T, 'X (cm)', 'Y (cm)'),
+            (f"XZ Plane (y = {offset:.3g} cm)", values[:, index, :].T, 'X (cm)', 'Z (cm)'),
+            (f"YZ Plane (x = {offset:.3g} cm)", values[index, :, :].T, 'Y (cm)', 'Z (cm)'),
+        ]
+
+        figure = self.theoretical_field_map_figure
+        if self.field_images is None:
+            figure.clear()
+            self.field_images = []
+            for k, (_, _, x_label, y_label) in enumerate(slices):
+                ax = figure.add_subplot(1, 3, k + 1)
+                self.field_images.append(ax.imshow(values[:, :, 0], origin='lower', cmap='viridis', interpolation='bilinear'))
+                ax.set_xlabel(x_label)
+                ax.set_ylabel(y_label)
+            figure.colorbar(self.field_images[-1], ax=figure.axes, orientation='horizontal', shrink=0.6, label='Time-Averaged Non-Gravitational Acceleration (g)')
+        for image, (title, data, _, _) in zip(self.field_images, slices):
+            image.set_data(data)
+            image.set_extent(extent)
+            image.set_clim(values.min(), values.max())
+            image.axes.set_title(title)
+        figure.suptitle(f"Time-Averaged Non-Gravitational Acceleration (mean {values.mean():.3g} g, max {values.max():.3g} g)")
+        self.draw_canvas(self.theoretical_field_map_canvas)
+
+    def update_theoretical_g_acceleration_plot(self, time_array, g_avg, avg_g_magnitude, window):
+        import numpy as np
+        from compute_backend import decimated
+
+        time_in_hours = decimated(time_array, PLOT_MAX_POINTS) / 3600
+        g_magnitude = np.sqrt(np.sum(decimated(g_avg, PLOT_MAX_POINTS)**2, axis=0))
+        self.update_magnitude_plot(self.theoretical_g_acceleration_ax, self.theoretical_g_acceleration_canvas, time_in_hours, g_magnitude,
+                                   f"Magnitude: {avg_g_magnitude:.3g}", window,
+                                   {"mode": "Theoretical", "name": "Gravitational", "averages": g_avg, "time": time_array, "scale": 3600})
+
+    def update_theoretical_g_components_plot(self, time_array, g_avg):
+        from compute_backend import decimated
+
+        time_in_hours = decimated(time_array, PLOT_MAX_POINTS) / 3600
+        self.update_components_plot(self.theoretical_g_components_ax, self.theoretical_g_components_canvas, time_in_hours, decimated(g_avg, PLOT_MAX_POINTS))
+
+    def update_theoretical_non_g_acceleration_plot(self, time_array, a_avg, avg_a_magnitude, window):
+        import numpy as np
+        from compute_backend import decimated
+
+        time_in_hours = decimated(time_array, PLOT_MAX_POINTS) / 3600
+        a_magnitude = np.sqrt(np.sum(decimated(a_avg, PLOT_MAX_POINTS)**2, axis=0))
+        self.update_magnitude_plot(self.theoretical_non_g_acceleration_ax, self.theoretical_non_g_acceleration_canvas, time_in_hours, a_magnitude,
+                                   f"Magnitude: {avg_a_magnitude:.3g}", window,
+                                   {"mode": "Theoretical", "name": "Non-Gravitational", "averages": a_avg, "time": time_array, "scale": 3600})
+
+    def update_theoretical_non_g_components_plot(self, time_array, a_avg):
+        from compute_backend import decimated
+
+        time_in_hours = decimated(time_array, PLOT_MAX_POINTS) / 3600
+        self.update_components_plot(self.theoretical_non_g_components_ax, self.theoretical_non_g_components_canvas, time_in_hours, decimated(a_avg, PLOT_MAX_POINTS))
+
+    def magnitude_artists(self, ax):
+        from matplotlib.widgets import SpanSelector
+
+        if ax not in self.plot_artists:
+            line, = ax.plot([], [], color='#0066b2')
+            bounds = [ax.plot([], [], color='#EC1C24', linestyle='--', transform=ax.get_xaxis_transform())[0] for _ in range(2)]
+            window, = ax.plot([], [], color='#EC1C24')
+            selector = SpanSelector(ax, lambda vmin, vmax: self.select_analysis_window(ax, vmin, vmax), 'horizontal', useblit=True, button=1,
+                                    onmove_callback=lambda vmin, vmax: self.preview_analysis_window(ax, vmin, vmax), props=dict(facecolor='#EC1C24', alpha=0.15))
+            self.plot_artists[ax] = {"line": line, "bounds": bounds, "window": window, "selector": selector}
+        return self.plot_artists[ax]
+
+    def component_artists(self, ax):
+        if ax not in self.plot_artists:
+            self.plot_artists[ax] = [ax.plot([], [], label=label, color=color)[0] for label, color in COMPONENT_STYLES]
+        return self.plot_artists[ax]
+
+    def distribution_artists(self, ax, color='#0066b2'):
+        if ax not in self.plot_artists:
+            path, = ax.plot([], [], [], color=color, linewidth=1)
+            overlay, = ax.plot([], [], [], color='#ec1c24', linewidth=0.5)
+            self.plot_artists[ax] = {"path": path, "overlay": overlay, "mesh": None, "colorbar": None}
+        return self.plot_artists[ax]
+
+    def update_magnitude_plot(self, ax, canvas, time_in_hours, magnitude, label, window=None, source=None):
+        artists = self.magnitude_artists(ax)
+        artists["line"].set_data(time_in_hours, magnitude)
+        artists["line"].set_label(label)
+        self.show_analysis_window(ax, window)
+        if source is not None:
+            self.window_sources[ax] = dict(source, canvas=canvas, sums=None)
+        rescale(ax)
+        self.draw_canvas(canvas)
+
+    def show_analysis_window(self, ax, window):
+        from compute_backend import analysis_indices
+
+        artists = self.magnitude_artists(ax)
+        if window is None:
+            for line in (artists["window"], *artists["bounds"]):
+                line.set_data([], [])
+            update_legend(ax, [artists["line"]])
+            return
+        start_analysis, end_analysis, window_label = window
+        time_in_hours, magnitude = artists["line"].get_data()
+        start_index, end_index = analysis_indices(time_in_hours, start_analysis, end_analysis)
+        for line, bound in zip(artists["bounds"], (start_analysis, end_analysis)):
+            line.set_data([bound, bound], [0, 1])
+        artists["window"].set_data(time_in_hours[start_index:end_index], magnitude[start_index:end_index])
+        artists["window"].set_label(window_label)
+        update_legend(ax, [artists["line"], artists["window"]])
+
+    def analysis_window_means(self, source, start_analysis, end_analysis):
+        from compute_backend import analysis_indices, prefix_sums, window_means
+
+        if source["sums"] is None:
+            source["sums"] = prefix_sums(source["averages"])
+        return window_means(source["sums"], *analysis_indices(source["time"], start_analysis, end_analysis, source["scale"]))
+
+    def clamped_window(self, ax, vmin, vmax):
+        time_in_hours = self.plot_artists[ax]["line"].get_xdata()
+        return max(vmin, float(time_in_hours[0])), min(vmax, float(time_in_hours[-1]))
+
+    def preview_analysis_window(self, ax, vmin, vmax):
+        source = self.window_sources.get(ax)
+        if source is None:
+            return
+        start_analysis, end_analysis = self.clamped_window(ax, vmin, vmax)
+        parts = []
+        for other, other_source in self.window_sources.items():
+            if other_source["mode"] != source["mode"]:
+                continue
+            means = self.analysis_window_means(other_source, start_analysis, end_analysis)
+            self.show_analysis_window(other, (start_analysis, end_analysis, f"Magnitude: {means[0]:.3g}"))
+            parts.append(f"{other_source['name']} {means[0]:.3g} g (X {means[1]:.3g}, Y {means[2]:.3g}, Z {means[3]:.3g})")
+            if other is not ax:
+                self.draw_canvas(other_source["canvas"])
+
+        artists = self.plot_artists[ax]
+        first_move = not artists["window"].get_animated()
+        for artist in (artists["window"], *artists["bounds"], ax.get_legend()):
+            artist.set_animated(True)
+        if first_move:
+            legend = ax.get_legend()
+            legend.set_loc(tuple(ax.transAxes.inverted().transform(legend.get_window_extent().p0)))
+            ax.figure.canvas.draw()
+        artists["selector"].update()
+        self.status_var.set(f"Analysis window {start_analysis:.3g}-{end_analysis:.3g} h: " + "; ".join(parts))
+
+    def select_analysis_window(self, ax, vmin, vmax):
+        source = self.window_sources.get(ax)
+        if source is None:
+            return
+        artists = self.plot_artists[ax]
+        for artist in (artists["window"], *artists["bounds"], ax.get_legend()):
+            artist.set_animated(False)
+        ax.get_legend().set_loc('best')
+        start_analysis, end_analysis = (round(value, 3) for value in self.clamped_window(ax, vmin, vmax))
+        if end_analysis <= start_analysis:
+            start_analysis, end_analysis = self.entered_window(source["mode"])
+        self.apply_analysis_window(source["mode"], start_analysis, end_analysis)
+
+    def entered_window(self, mode):
+        suffix = "theo" if mode == "Theoretical" else "exp"
+        start_analysis = getattr(self, f"start_analysis_{suffix}_entry").get()
+        end_analysis = getattr(self, f"end_analysis_{suffix}_entry").get()
+        if not start_analysis or not end_analysis:
+            return None, None
+        return float(start_analysis), float(end_analysis)
+
+    def apply_analysis_window(self, mode, start_analysis, end_analysis):
+        results = self.mode_results(mode)
+        suffix = "theo" if mode == "Theoretical" else "exp"
+        for bound, value in (("start", start_analysis), ("end", end_analysis)):
+            entry = getattr(self, f"{bound}_analysis_{suffix}_entry")
+            entry.delete(0, tk.END)
+            entry.insert(0, "" if value is None else f"{value:g}")
+            setattr(self, f"last_{bound}_analysis_{suffix}", value)
+
+        for ax, source in self.window_sources.items():
+            if source["mode"] != mode:
+                continue
+            window = None
+            if start_analysis is not None:
+                window = (start_analysis, end_analysis, f"Magnitude: {self.analysis_window_means(source, start_analysis, end_analysis)[0]:.3g}")
+            self.show_analysis_window(ax, window)
+            self.draw_canvas(source["canvas"])
+
+        if results is None:
+            return
+        self.ensure_tabs_built(self.theoretical_acceleration_distribution_frame if mode == "Theoretical" else self.experimental_acceleration_distribution_frame)
+        self.analysis_graph(mode, results, start_analysis, end_analysis).run("render distribution (window)")
+        self.queue_spectrum(mode)
+
+    def update_components_plot(self, ax, canvas, time_in_hours, components):
+        lines = self.component_artists(ax)
+        for line, values in zip(lines, components):
+            line.set_data(time_in_hours, values)
+        update_legend(ax, lines)
+        rescale(ax)
+        self.draw_canvas(canvas)
+
+    def set_magnitude_label(self, ax, canvas, label):
+        line = self.magnitude_artists(ax)["line"]
+        line.set_label(label)
+        ax.get_legend().get_texts()[0].set_text(label)
+        self.draw_canvas(canvas)
+
+    def set_distribution_label(self, ax, label):
+        path = self.distribution_artists(ax)["path"]
+        path.set_label(label)
+        update_legend(ax, [path])
+
+    def has_plot_data(self, ax):
+        if self.distribution_animations.get(ax, {}).get("points") is not None:
+            return True
+        if ax.name == '3d':
+            return any(len(line.get_data_3d()[0]) for line in ax.lines)
+        return any(len(line.get_xdata()) for line in ax.lines)
+
+    def draw_theoretical_orientation_distribution(self, results):
+        time_array = results["time_array"]
+        sample_interval = float(time_array[1] - time_array[0]) if len(time_array) > 1 else 0.0
+        self.draw_orientation_distribution(self.theoretical_acceleration_distribution_ax, self.theoretical_acceleration_distribution_canvas,
+                                           results["g_array"], results["segment_ids"], sample_interval, results["distribution"])
+
+    def draw_experimental_orientation_distribution(self, results):
+        import numpy as np
+
+        time_in_seconds = np.asarray(results["time_in_hours"]) * 3600
+        durations = np.diff(time_in_seconds, append=time_in_seconds[-1])
+        self.draw_orientation_distribution(self.experimental_acceleration_distribution_ax, self.experimental_acceleration_distribution_canvas,
+                                           results["measurements"], results["segment_ids"], durations, results["distribution"])
+
+    def redraw_orientation_distribution(self):
+        if self.session_results is None:
+            return
+        mode, results = self.session_results
+        if mode == "Theoretical" and self.is_tab_built(self.theoretical_acceleration_distribution_frame):
+            self.draw_theoretical_orientation_distribution(results)
+        elif mode == "Experimental" and self.is_tab_built(self.experimental_acceleration_distribution_frame):
+            self.draw_experimental_orientation_distribution(results)
+
+    def draw_orientation_distribution(self, ax, canvas, points, segment_ids, durations, score):
+        from matplotlib.colors import LogNorm
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+        from compute_backend import decimated
+        from path_visualization import PathVisualization
+
+        view = self.distribution_view_var.get()
+        artists = self.distribution_artists(ax)
+        self.remove_dwell_mesh(ax)
+        artists["path"].set_data_3d(*(decimated(points, PLOT_MAX_POINTS) if view == "path" else ([], [], [])))
+        artists["overlay"].set_data_3d(*(decimated(points, DENSITY_PATH_POINTS) if view == "density+path" else ([], [], [])))
+        if view != "path":
+            cells, dwell = PathVisualization("density", [], [], []).dwell_cells(segment_ids, durations)
+            positive = dwell > 0
+            mesh = Poly3DCollection(cells[positive], cmap='viridis', edgecolor='none', alpha=0.9)
+            mesh.set_array(dwell[positive])
+            if positive.any():
+                mesh.set_norm(LogNorm(vmin=dwell[positive].min(), vmax=max(dwell[positive].max(), dwell[positive].min() * 1.01)))
+            artists["mesh"] = ax.add_collection3d(mesh, autolim=False)
+            artists["colorbar"] = ax.figure.colorbar(mesh, ax=ax, shrink=0.6, pad=0.1, label='Dwell Time (s)')
+        self.set_distribution_label(ax, f"Distribution: {score}")
+        self.draw_canvas(canvas)
+
+    def remove_dwell_mesh(self, ax):
+        artists = self.plot_artists.get(ax)
+        if artists is not None and artists["mesh"] is not None:
+            artists["colorbar"].remove()
+            artists["mesh"].remove()
+            artists["mesh"] = artists["colorbar"] = None
 
     def open_url(self, url):
         webbrowser.open_new(url)
 
-def import_sci_spinner_format_data(file_path):
-    try:
-        time_in_seconds = []
-        x = []
-        y = []
-        z = []
-
-        with open(file_path, 'r') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                time_in_seconds.append(float(row['timestamp']))
-                x.append(float(row['x_acc']))
-                y.append(float(row['y_acc']))
-                z.append(float(row['z_acc']))
-
-        time_in_hours = [t / 3600 for t in time_in_seconds]
-
-        def normalize_vectors(x, y, z):
-            g_const = 9.80665
-            normalized_x = np.array(x) / g_const
-            normalized_y = np.array(y) / g_const
-            normalized_z = np.array(z) / g_const
-            return normalized_x, normalized_y, normalized_z
-
-        x, y, z = normalize_vectors(x, y, z)
-        return time_in_hours, x, y, z
-
-    except KeyError:
-        raise ValueError(
-            "Error",
-            "Invalid CSV file format.\n\n"
-            "Supported CSV file formats:\n"
-            "(1) Date (yyyy-mm-dd), Time (hh:mm:ss), X, Y, Z\n"
-            "     Example: 2001-11-21, 1:00:00, 0.5, 0.5, 0.5\n\n"
-            "OR\n\n"
-            "(2) Time (s), X, Y, Z\n"
-            "     Example: 3600, 0.5, 0.5, 0.5"
-        )
+def configure_3d_axes(ax, title):
+    import numpy as np
+
+    ax.set_xlabel('X (g)')
+    ax.set_ylabel('Y (g)')
+    ax.set_zlabel('Z (g)')
+    ax.set_xlim(1, -1)
+    ax.set_ylim(1, -1)
+    ax.set_zlim(-1, 1)
+    ax.set_xticks([-1, -0.5, 0, 0.5, 1])
+    ax.set_yticks([-1, -0.5, 0, 0.5, 1])
+    ax.set_zticks([-1, -0.5, 0, 0.5, 1])
+    ax.set_title(title)
+    ax.set_box_aspect([1, 1, 1])
+    ax.grid(False)
+
+    ax.xaxis.set_pane_color((1.0, 1.0, 1.0, 0.0)) 
+    ax.yaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))  
+    ax.zaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))  
+
+    u = np.linspace(0, 2 * np.pi, 25)
+    v = np.linspace(0, np.pi, 25)
+    x = np.outer(np.cos(u), np.sin(v))
+    y = np.outer(np.sin(u), np.sin(v))
+    z = np.outer(np.ones(np.size(u)), np.cos(v))
+    ax.plot_wireframe(x, y, z, color='#aeb0b5', linewidth=0.5, alpha=0.5, label='_nolegend_')
+
+def update_legend(ax, handles):
+    legend = ax.get_legend()
+    if legend is None or len(legend.get_texts()) != len(handles):
+        ax.legend(handles=handles)
+    else:
+        for text, handle in zip(legend.get_texts(), handles):
+            text.set_text(handle.get_label())
+
+def configure_spectrum_axes(ax):
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('Frequency (Hz)')
+    ax.set_ylabel('PSD (g²/Hz)')
+
+def remove_legend(ax):
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+
+def rescale(ax):
+    ax.relim()
+    ax.set_autoscale_on(True)
+    ax.autoscale_view()
+
+def chunked(function, length):
+    from compute_backend import RESULT_CHUNK_SIZE
+
+    for start in range(0, length, RESULT_CHUNK_SIZE):
+        yield from function(slice(start, start + RESULT_CHUNK_SIZE)).tolist()
+
+def result_hours(results):
+    if "time_array" in results:
+        return chunked(lambda s: results["time_array"][s] / 3600, len(results["time_array"]))
+    return chunked(lambda s: results["time_in_hours"][s], len(results["time_in_hours"]))
+
+def chunked_magnitude(averages):
+    import numpy as np
+
+    return chunked(lambda s: np.sqrt(np.sum(np.asarray(averages[:, s])**2, axis=0)), averages.shape[1])
+
+def chunked_components(values):
+    return [chunked(lambda s, i=i: values[i, s], values.shape[1]) for i in range(3)]
+
+def write_magnitude_csv(file_path, time_data, magnitude):
+    with open(file_path, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Time (h)", "Acceleration (g)"])
+        writer.writerows(zip(time_data, magnitude))
+
+def write_components_csv(file_path, time_data, x_data, y_data, z_data):
+    with open(file_path, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
+        writer.writerows(zip(time_data, x_data, y_data, z_data))
+
+def save_distribution_animation(file_path, x, y, z):
+    import matplotlib.animation as animation
+    from matplotlib.animation import FFMpegWriter
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 6), dpi=100)
+    ax = fig.add_subplot(111, projection='3d')
+    configure_3d_axes(ax, "Orientation Distribution")
+    line, = ax.plot([], [], [], color='#ec1c24', linewidth=1)
+
+    def update(num):
+        line.set_data_3d(x[:num], y[:num], z[:num])
+        return line,
+
+    ani = animation.FuncAnimation(fig, update, frames=len(x), interval=10, blit=False)
+    writer = FFMpegWriter(fps=10, metadata=dict(artist='NASA'), bitrate=1800)
+    ani.save(file_path, writer=writer)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    arg_parser = argparse.ArgumentParser(description="Kinematics Model")
+    arg_parser.add_argument("--backend", choices=["auto", "numpy", "numba", "parallel", "recurrence"], default="auto", help="compute backend for the model and distribution scoring")
+    arg_parser.add_argument("--log-file", default=DEFAULT_LOG_FILE, help="JSON lines file for per-stage timings")
+    arg_parser.add_argument("--profile", action="store_true", help="capture a cProfile/tracemalloc report of the first run")
+    arg_parser.add_argument("--session", help="restore a saved session file on startup")
+    arg_parser.add_argument("--scratch-dir", help="store simulation results in memory-mapped files under this directory")
+    arg_parser.add_argument("--startup-report", help="write the measured time-to-interactive to this JSON file")
+    arg_parser.add_argument("--exit-after-startup", action="store_true", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
     root = tk.Tk()
-    gui = GUI(root)
+    gui = GUI(root, backend=args.backend, log_file=args.log_file, profile_next_run=args.profile, scratch_root=args.scratch_dir)
+    if args.session:
+        root.after_idle(lambda: gui.open_session(args.session))
+    if args.startup_report:
+        root.after_idle(lambda: gui.report_startup(args.startup_report, args.exit_after_startup))
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,120 @@
+import numpy as np
+from math_model import rotating_frame_acceleration
+
+PARAMETERS = ("inner_rpm", "outer_rpm", "inner_position", "outer_position", "offset_x", "offset_y", "offset_z")
+INITIAL_SPAN_SECONDS = 600.0
+SPAN_GROWTH = 4.0
+STAGE_SAMPLES = 20000
+FINAL_SAMPLES = 200000
+SPECTRUM_SPAN_SECONDS = 1800.0
+SPECTRUM_PADDING = 8
+OFFSET_PRIOR = 1e-4
+COMPLEX_STEP = 1e-20
+CHUNK_SAMPLES = 65536
+
+def model_acceleration(time_array, inner_rpm, outer_rpm, inner_position, outer_position, offset_x, offset_y, offset_z):
+    inner_rad_sec = inner_rpm * np.pi / 30
+    outer_rad_sec = outer_rpm * np.pi / 30
+    theta_1 = outer_rad_sec * time_array + outer_position * np.pi / 180
+    theta_2 = inner_rad_sec * time_array + inner_position * np.pi / 180
+    g_prime, a_prime = rotating_frame_acceleration(np.cos(theta_1), np.sin(theta_1), np.cos(theta_2), np.sin(theta_2), inner_rad_sec, outer_rad_sec, offset_x, offset_y, offset_z)
+    return g_prime + a_prime
+
+def parameter_values(params):
+    values = np.asarray(params, dtype=np.float64).copy()
+    values[4:] /= 100
+    return values
+
+def evaluate(params, time_array):
+    return model_acceleration(time_array, *parameter_values(params))
+
+def jacobian(params, time_array):
+    columns = np.empty((3, len(time_array), len(params)))
+    steps = parameter_values(params).astype(np.complex128) + 1j * COMPLEX_STEP * np.diag([1, 1, 1, 1, 0.01, 0.01, 0.01])
+    steps = steps[:, :, None]
+    for start in range(0, len(time_array), CHUNK_SAMPLES):
+        chunk = time_array[start:start + CHUNK_SAMPLES]
+        columns[:, start:start + len(chunk)] = np.moveaxis(model_acceleration(chunk, *steps.transpose(1, 0, 2)).imag / COMPLEX_STEP, 0, -1)
+    return columns.reshape(-1, len(params))
+
+def decimate(time_in_seconds, measured, span, samples):
+    end = np.searchsorted(time_in_seconds, time_in_seconds[0] + span, side='right')
+    stride = max(1, -(-end // samples))
+    return time_in_seconds[:end:stride], measured[:, :end:stride]
+
+def peak_frequency(signal, dt):
+    padded = len(signal) * SPECTRUM_PADDING
+    if np.iscomplexobj(signal):
+        spectrum = np.abs(np.fft.fft(signal, padded))
+        frequencies = np.fft.fftfreq(padded, dt)
+    else:
+        spectrum = np.abs(np.fft.rfft(signal, padded))
+        frequencies = np.fft.rfftfreq(padded, dt)
+    k = int(np.argmax(spectrum))
+    left, right = spectrum[k - 1], spectrum[(k + 1) % len(spectrum)]
+    denominator = left - 2 * spectrum[k] + right
+    shift = 0.5 * (left - right) / denominator if denominator else 0.0
+    return frequencies[k] + shift / (padded * dt)
+
+def initial_guess(time_in_seconds, measured):
+    span = min(SPECTRUM_SPAN_SECONDS, time_in_seconds[-1] - time_in_seconds[0])
+    dt = max(float(np.median(np.diff(time_in_seconds))), 1e-3)
+    t = np.arange(time_in_seconds[0], time_in_seconds[0] + span, dt)
+    x, y, z = (np.interp(t, time_in_seconds, component) for component in measured)
+    t = t - time_in_seconds[0]
+
+    outer_rad_sec = 2 * np.pi * abs(peak_frequency(y, dt))
+    design = np.column_stack([np.sin(outer_rad_sec * t), np.cos(outer_rad_sec * t), np.ones_like(t)])
+    sin_weight, cos_weight, _ = np.linalg.lstsq(design, y, rcond=None)[0]
+    outer_phase = np.arctan2(cos_weight, sin_weight)
+
+    c1 = np.cos(outer_rad_sec * t + outer_phase)
+    rotating = (z - 1j * x) * c1
+    inner_rad_sec = 2 * np.pi * peak_frequency(rotating, dt)
+    inner_phase = np.angle(np.sum(rotating * np.exp(-1j * inner_rad_sec * t)))
+    return np.array([inner_rad_sec * 30 / np.pi, outer_rad_sec * 30 / np.pi, np.degrees(inner_phase), np.degrees(outer_phase), 0.0, 0.0, 0.0])
+
+def residuals(params, time_array, measured):
+    return np.concatenate([evaluate(params, time_array).ravel() - measured, OFFSET_PRIOR * params[4:]])
+
+def residual_jacobian(params, time_array):
+    return np.vstack([jacobian(params, time_array), np.hstack([np.zeros((3, 4)), OFFSET_PRIOR * np.eye(3)])])
+
+def stage_spans(duration_seconds):
+    spans = []
+    span = min(INITIAL_SPAN_SECONDS, duration_seconds)
+    while span < duration_seconds:
+        spans.append(span)
+        span *= SPAN_GROWTH
+    return spans + [duration_seconds]
+
+def fit_parameters(time_in_hours, x, y, z, initial=None, progress=None):
+    from scipy.optimize import least_squares
+
+    time_in_seconds = (np.asarray(time_in_hours, dtype=np.float64) - time_in_hours[0]) * 3600
+    measured = np.vstack([x, y, z]).astype(np.float64)
+    if len(time_in_seconds) < 10 or time_in_seconds[-1] <= 0:
+        raise ValueError("The log is too short to identify the rotation parameters.")
+
+    params = initial_guess(time_in_seconds, measured) if initial is None else np.asarray(initial, dtype=np.float64)
+    spans = stage_spans(time_in_seconds[-1])
+    stages = []
+    for k, span in enumerate(spans):
+        samples = FINAL_SAMPLES if k == len(spans) - 1 else STAGE_SAMPLES
+        t, values = decimate(time_in_seconds, measured, span, samples)
+        solution = least_squares(residuals, params, jac=lambda p, *args: residual_jacobian(p, t), args=(t, values.ravel()), x_scale='jac', method='lm')
+        params = solution.x
+        stages.append({
+            "span_hours": float(span / 3600),
+            "samples": len(t),
+            "rms": float(np.sqrt(np.mean(solution.fun[:-3]**2))),
+            "evaluations": int(solution.nfev),
+        })
+        if progress:
+            progress(k + 1, len(spans), stages[-1])
+
+    params[2:4] = np.mod(params[2:4], 360)
+    result = {name: float(value) for name, value in zip(PARAMETERS, params)}
+    result["rms"] = stages[-1]["rms"]
+    result["stages"] = stages
+    return result
@@ -0,0 +1,224 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, nullcontext
+
+DEFAULT_LOG_DIR = os.path.join(os.path.expanduser("~"), ".kinematics_model")
+DEFAULT_LOG_FILE = os.path.join(DEFAULT_LOG_DIR, "pipeline.jsonl")
+
+def peak_rss_bytes():
+    peak = _proc_status_bytes("VmHWM")
+    if peak is not None:
+        return peak
+    try:
+        import resource
+    except ImportError:
+        counters = _windows_memory_counters()
+        return None if counters is None else counters.PeakWorkingSetSize
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def current_rss_bytes():
+    current = _proc_status_bytes("VmRSS")
+    if current is not None or sys.platform != "win32":
+        return current
+    counters = _windows_memory_counters()
+    return None if counters is None else counters.WorkingSetSize
+
+def reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", 'w') as file:
+            file.write("5")
+    except OSError:
+        pass
+
+def _proc_status_bytes(field):
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+def _windows_memory_counters():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD), ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t), ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    handle = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        return None
+    return counters
+
+def _pipeline_logger(log_file):
+    logger = logging.getLogger(f"kinematics_model.pipeline.{log_file}")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+class NullInstrumentation:
+    def stage(self, name, samples=None):
+        return nullcontext({"stage": name, "samples": samples})
+
+class PipelineInstrumentation(NullInstrumentation):
+    def __init__(self, log_file=DEFAULT_LOG_FILE, track_memory=False):
+        self.log_file = log_file
+        self.track_memory = track_memory
+        self.logger = _pipeline_logger(log_file) if log_file else None
+        self.run_id = None
+        self.mode = None
+        self.stages = []
+        self.run_start = None
+        self.params = {}
+        self.traced_base = None
+        self.traced_peak = 0
+        self.rss_base = None
+        self._started_tracing = False
+        self._lock = threading.Lock()
+        self._active = []
+
+    def start_run(self, mode, **params):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.mode = mode
+        self.stages = []
+        self.run_start = time.perf_counter()
+        self.params = params
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            self._started_tracing = True
+        self.traced_base = tracemalloc.get_traced_memory()[0] if self.track_memory else None
+        self.traced_peak = 0
+        reset_peak_rss()
+        self.rss_base = current_rss_bytes()
+
+    @contextmanager
+    def stage(self, name, samples=None):
+        record = {"stage": name, "samples": samples}
+        overlapped = [False]
+        tracing = tracemalloc.is_tracing()
+        with self._lock:
+            if tracing and not self._active:
+                tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0] if tracing else None
+            for other in self._active:
+                other[0] = True
+            overlapped[0] = bool(self._active)
+            self._active.append(overlapped)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["wall_time"] = time.perf_counter() - start
+            with self._lock:
+                self._active = [other for other in self._active if other is not overlapped]
+                if tracing and tracemalloc.is_tracing():
+                    _, peak = tracemalloc.get_traced_memory()
+                    record["peak_alloc_mb"] = None if overlapped[0] else max(peak - base, 0) / 2**20
+                    self.traced_peak = max(self.traced_peak, peak)
+                else:
+                    peak = peak_rss_bytes()
+                    record["peak_rss_mb"] = peak / 2**20 if peak is not None else None
+                self.stages.append(record)
+            self._log("stage", **record)
+
+    def run_peak_bytes(self):
+        if self.traced_base is not None and self.traced_peak:
+            return max(self.traced_peak - self.traced_base, 0)
+        peak = peak_rss_bytes()
+        if peak is None or self.rss_base is None:
+            return None
+        return max(peak - self.rss_base, 0)
+
+    def finish_run(self, status="ok"):
+        peak = peak_rss_bytes()
+        run_peak = self.run_peak_bytes()
+        summary = {
+            "status": status,
+            "wall_time": time.perf_counter() - self.run_start if self.run_start is not None else None,
+            "stages": len(self.stages),
+            "peak_rss_mb": peak / 2**20 if peak is not None else None,
+            "run_peak_mb": run_peak / 2**20 if run_peak is not None else None,
+            "params": self.params,
+        }
+        self._log("run", **summary)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return summary
+
+    def summary_text(self):
+        if not self.stages:
+            return ""
+        total = sum(stage["wall_time"] for stage in self.stages)
+        parts = []
+        for stage in sorted(self.stages, key=lambda s: s["wall_time"], reverse=True)[:4]:
+            text = f"{stage['stage']} {stage['wall_time']:.2f} s"
+            if stage.get("peak_alloc_mb") is not None:
+                text += f" / {stage['peak_alloc_mb']:.0f} MB"
+            if stage.get("max_error") is not None:
+                text += f" (max error {stage['max_error']:.1e} g)"
+            parts.append(text)
+        return f"{self.mode}: {total:.2f} s total  |  " + "  |  ".join(parts)
+
+    def _log(self, event, **fields):
+        if self.logger:
+            self.logger.info(json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "run_id": self.run_id, "mode": self.mode, "event": event, **fields}, default=str))
+
+class ProfileCapture:
+    def __init__(self, output_dir=DEFAULT_LOG_DIR, top=40):
+        self.output_dir = output_dir
+        self.top = top
+        self.profile_path = None
+        self.report_path = None
+
+    def __enter__(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.was_tracing = tracemalloc.is_tracing()
+        if not self.was_tracing:
+            tracemalloc.start(10)
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if not self.was_tracing:
+            tracemalloc.stop()
+
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.profile_path = os.path.join(self.output_dir, f"profile-{stamp}.prof")
+        self.report_path = os.path.join(self.output_dir, f"profile-{stamp}.txt")
+        self.profiler.dump_stats(self.profile_path)
+
+        stats_stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stats_stream).sort_stats("cumulative").print_stats(self.top)
+        with open(self.report_path, 'w') as file:
+            file.write("cProfile (cumulative)\n")
+            file.write(stats_stream.getvalue())
+            file.write("\ntracemalloc (top allocations)\n")
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                file.write(f"{stat}\n")
+        return False
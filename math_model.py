@@ -1,29 +1,104 @@
+import os
 import numpy as np
 import math as m
 
+CHUNK_SAMPLES = 1 << 20
+ANCHOR_INTERVAL = 4096
+ERROR_CHECK_STRIDE = 61
+
+def rotating_frame_acceleration(c1, s1, c2, s2, inner_rad_sec, outer_rad_sec, delta_x, delta_y, delta_z):
+    r0 = delta_x * c2 + delta_z * s2
+    r1 = delta_y * c1 + delta_x * s1 * s2 - delta_z * s1 * c2
+    r2 = delta_y * s1 - delta_x * c1 * s2 + delta_z * c1 * c2
+    w1, w2 = inner_rad_sec * c1, inner_rad_sec * s1
+    w_dot_1, w_dot_2 = -outer_rad_sec * w2, outer_rad_sec * w1
+
+    u0, u1, u2 = w1 * r2 - w2 * r1, w2 * r0 - outer_rad_sec * r2, outer_rad_sec * r1 - w1 * r0
+    a0 = -(w_dot_1 * r2 - w_dot_2 * r1 + w1 * u2 - w2 * u1)
+    a1 = -(w_dot_2 * r0 + w2 * u0 - outer_rad_sec * u2)
+    a2 = -(-w_dot_1 * r0 + outer_rad_sec * u1 - w1 * u0)
+    a_y = c1 * a1 + s1 * a2
+    a_z = -s1 * a1 + c1 * a2
+
+    g_prime = np.stack(np.broadcast_arrays(-s2 * c1, s1, c2 * c1), axis=-2)
+    a_prime = np.stack([c2 * a0 - s2 * a_z, a_y, s2 * a0 + c2 * a_z], axis=-2) / 9.8
+    return g_prime, a_prime
+
 class MathModel:
-    def __init__(self, inner_rpm, outer_rpm, delta_x, delta_y, delta_z, duration_hours, theta_2_init, theta_1_init):
+    def __init__(self, inner_rpm, outer_rpm, delta_x, delta_y, delta_z, duration_hours, theta_2_init, theta_1_init, sample_interval=0.1, scratch_dir=None):
         self.inner_rpm = inner_rpm  
         self.outer_rpm = outer_rpm 
         self.delta_x = delta_x      
         self.delta_y = delta_y      
         self.delta_z = delta_z      
         self.duration_hours = duration_hours
+        self.sample_interval = sample_interval
+        self.scratch_dir = scratch_dir
+        self.cancel_event = None
         self.theta_2_init = self.deg_to_rad(theta_2_init)
         self.theta_1_init = self.deg_to_rad(theta_1_init)    
         self.pi_over_30 = np.pi / 30 
         self.g = np.array([[0], [0], [9.8]]) 
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["cancel_event"] = None
+        return state
+
+    def check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ValueError("Run cancelled.")
+
     def deg_to_rad(self, degrees):
         return np.radians(degrees)
     
     def rpm_to_rad_sec(self, rpm):
         return rpm * self.pi_over_30
 
-    def calculate_acceleration(self):
+    def allocate(self, name, shape, dtype=np.float64):
+        if self.scratch_dir is None:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.scratch_dir, f"{name}.dat"), dtype=dtype, mode='w+', shape=shape)
+
+    def sample_count(self):
+        end_time_in_seconds = int(self.duration_hours * 3600)
+        return m.floor(end_time_in_seconds / self.sample_interval) + 1
+
+    def time_step(self):
+        samples = self.sample_count()
+        return int(self.duration_hours * 3600) / (samples - 1) if samples > 1 else 0.0
+
+    def time_at(self, indices):
+        values = np.asarray(indices, dtype=np.float64) * self.time_step()
+        values[np.asarray(indices) == self.sample_count() - 1] = int(self.duration_hours * 3600)
+        return values
+
+    def time_values(self, start, end):
+        return self.time_at(np.arange(start, end))
+
+    def time_array(self):
         start_time_in_seconds = 0
         end_time_in_seconds = int(self.duration_hours * 3600) 
-        time_array = np.linspace(start_time_in_seconds, end_time_in_seconds, m.floor(end_time_in_seconds / 0.1) + 1)
+        samples = self.sample_count()
+        if self.scratch_dir is None or samples < 2:
+            return np.linspace(start_time_in_seconds, end_time_in_seconds, samples)
+
+        time_array = self.allocate("time", (samples,))
+        for start in range(0, samples, CHUNK_SAMPLES):
+            self.check_cancelled()
+            time_array[start:start + CHUNK_SAMPLES] = self.time_values(start, min(start + CHUNK_SAMPLES, samples))
+        return time_array
+
+    def calculate_acceleration(self, time_array=None):
+        if time_array is None and self.scratch_dir is not None:
+            time_array = self.time_array()
+            g_prime, a_prime = self.allocate("g", (3, len(time_array))), self.allocate("a", (3, len(time_array)))
+            for start in range(0, len(time_array), CHUNK_SAMPLES):
+                self.check_cancelled()
+                _, g_prime[:, start:start + CHUNK_SAMPLES], a_prime[:, start:start + CHUNK_SAMPLES] = self.calculate_acceleration(time_array[start:start + CHUNK_SAMPLES])
+            return time_array, g_prime, a_prime
+
+        time_array = self.time_array() if time_array is None else np.asarray(time_array, dtype=np.float64)
 
         inner_rad_sec = self.rpm_to_rad_sec(self.inner_rpm) 
         outer_rad_sec = self.rpm_to_rad_sec(self.outer_rpm)  
@@ -69,4 +144,71 @@ class MathModel:
         a_prime = np.einsum('ijk,jk->ik', R_y_T, np.einsum('ijk,jk->ik', R_x_T, a)) / 9.8
         g_prime = np.einsum('ijk,jk->ik', R_y_T, np.einsum('ijk,jk->ik', R_x_T, self.g)) / 9.8
 
-        return time_array, g_prime, a_prime
\ No newline at end of file
+        return time_array, g_prime, a_prime
+
+    def rotation_phasors(self, rad_sec, angle_init, start, end, anchor_interval=ANCHOR_INTERVAL):
+        first = start - start % anchor_interval
+        anchors = np.exp(1j * (rad_sec * self.time_at(np.arange(first, end, anchor_interval)) + angle_init))
+        steps = np.exp(1j * rad_sec * self.time_step() * np.arange(anchor_interval))
+        return (anchors[:, None] * steps[None, :]).ravel()[start - first:end - first]
+
+    def acceleration_from_rotation(self, rotation_1, rotation_2):
+        return rotating_frame_acceleration(rotation_1.real, rotation_1.imag, rotation_2.real, rotation_2.imag,
+                                           self.rpm_to_rad_sec(self.inner_rpm), self.rpm_to_rad_sec(self.outer_rpm), self.delta_x, self.delta_y, self.delta_z)
+
+    def calculate_acceleration_recurrence(self, anchor_interval=ANCHOR_INTERVAL):
+        time_array = self.time_array()
+        samples = len(time_array)
+        inner_rad_sec = self.rpm_to_rad_sec(self.inner_rpm)
+        outer_rad_sec = self.rpm_to_rad_sec(self.outer_rpm)
+        g_prime, a_prime = self.allocate("g", (3, samples)), self.allocate("a", (3, samples))
+        for start in range(0, samples, CHUNK_SAMPLES):
+            self.check_cancelled()
+            end = min(start + CHUNK_SAMPLES, samples)
+            rotation_1 = self.rotation_phasors(outer_rad_sec, self.theta_1_init, start, end, anchor_interval)
+            rotation_2 = self.rotation_phasors(inner_rad_sec, self.theta_2_init, start, end, anchor_interval)
+            g_prime[:, start:end], a_prime[:, start:end] = self.acceleration_from_rotation(rotation_1, rotation_2)
+
+        max_error = 0.0
+        for start in range(0, samples, CHUNK_SAMPLES):
+            self.check_cancelled()
+            check = np.unique(np.concatenate([np.arange(start, min(start + CHUNK_SAMPLES, samples), ERROR_CHECK_STRIDE),
+                                              np.arange(start + anchor_interval - 1, min(start + CHUNK_SAMPLES, samples), anchor_interval)]))
+            _, g_exact, a_exact = self.calculate_acceleration(self.time_at(check))
+            max_error = max(max_error, float(np.max(np.abs(g_prime[:, check] - g_exact))), float(np.max(np.abs(a_prime[:, check] - a_exact))))
+        return time_array, g_prime, a_prime, max_error
+
+    def calculate_field_basis(self, time_array=None):
+        time_array = self.time_array() if time_array is None else np.asarray(time_array, dtype=np.float64)
+
+        inner_rad_sec = self.rpm_to_rad_sec(self.inner_rpm)
+        outer_rad_sec = self.rpm_to_rad_sec(self.outer_rpm)
+
+        theta_1 = outer_rad_sec * time_array + self.theta_1_init
+        theta_2 = inner_rad_sec * time_array + self.theta_2_init
+        cos_1, sin_1 = np.cos(theta_1), np.sin(theta_1)
+        cos_2, sin_2 = np.cos(theta_2), np.sin(theta_2)
+        zeros = np.zeros_like(time_array)
+
+        w = np.array([outer_rad_sec * np.ones_like(time_array), inner_rad_sec * cos_1, inner_rad_sec * sin_1])
+        w_dot = np.array([zeros, -outer_rad_sec * inner_rad_sec * sin_1, outer_rad_sec * inner_rad_sec * cos_1])
+
+        r_basis = np.array([
+            [cos_2, sin_1 * sin_2, -cos_1 * sin_2],
+            [zeros, cos_1, sin_1],
+            [sin_2, -sin_1 * cos_2, cos_1 * cos_2]
+        ])
+
+        basis = np.empty((3, 3, len(time_array)))
+        for j, r in enumerate(r_basis):
+            w_cross_r = np.cross(w.T, r.T).T
+            a = -(np.cross(w_dot.T, r.T).T + np.cross(w.T, w_cross_r.T).T)
+            a_x = a[0]
+            a_y = cos_1 * a[1] + sin_1 * a[2]
+            a_z = -sin_1 * a[1] + cos_1 * a[2]
+            basis[0, j] = cos_2 * a_x - sin_2 * a_z
+            basis[1, j] = a_y
+            basis[2, j] = sin_2 * a_x + cos_2 * a_z
+        basis /= 9.8
+
+        return time_array, basis
@@ -0,0 +1,132 @@
+import json
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+from instrumentation import DEFAULT_LOG_DIR
+from math_model import CHUNK_SAMPLES
+
+CALIBRATION_FILE = os.path.join(DEFAULT_LOG_DIR, "memory_calibration.json")
+RESULT_BYTES_PER_SAMPLE = 112
+TRANSIENT_BYTES_PER_SAMPLE = {"numpy": 400, "recurrence": 400, "parallel": 400, "numba": 16}
+SECONDS_PER_SAMPLE = {"numpy": 8e-6, "recurrence": 8e-6, "parallel": 4e-6, "numba": 5e-6}
+DEFAULT_BUDGET_FRACTION = 0.5
+CALIBRATION_RUNS = 20
+MIN_CALIBRATION_SAMPLES = 100000
+DISK_HEADROOM = 1.1
+SAMPLE_INTERVALS = (0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+def physical_memory_bytes():
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong), ("ullTotalPhys", ctypes.c_ulonglong),
+                        ("ullAvailPhys", ctypes.c_ulonglong), ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong), ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys
+    return None
+
+def load_calibration(file_path=CALIBRATION_FILE):
+    try:
+        with open(file_path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_calibration(calibration, file_path=CALIBRATION_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(calibration, file, indent=2)
+    os.replace(temp_path, file_path)
+
+def budget_bytes(calibration=None):
+    calibration = load_calibration() if calibration is None else calibration
+    if calibration.get("budget_mb"):
+        return calibration["budget_mb"] * 2**20
+    physical = physical_memory_bytes()
+    return None if physical is None else physical * DEFAULT_BUDGET_FRACTION
+
+def set_budget_mb(budget_mb, file_path=CALIBRATION_FILE):
+    calibration = load_calibration(file_path)
+    calibration["budget_mb"] = budget_mb
+    save_calibration(calibration, file_path)
+
+def storage_key(backend_name, on_disk):
+    return f"{backend_name}/{'disk' if on_disk else 'memory'}"
+
+def model_peak_bytes(samples, backend_name, on_disk):
+    transient = TRANSIENT_BYTES_PER_SAMPLE.get(backend_name, max(TRANSIENT_BYTES_PER_SAMPLE.values()))
+    if on_disk:
+        return transient * min(samples, CHUNK_SAMPLES)
+    return (RESULT_BYTES_PER_SAMPLE + transient) * samples
+
+def estimate_run(samples, backend_name, on_disk=False, calibration=None):
+    calibration = load_calibration() if calibration is None else calibration
+    runs = calibration.get("runs", {}).get(storage_key(backend_name, on_disk), [])
+    peak = model_peak_bytes(samples, backend_name, on_disk)
+    seconds = SECONDS_PER_SAMPLE.get(backend_name, max(SECONDS_PER_SAMPLE.values())) * samples
+    if runs:
+        peak *= max(run["peak_ratio"] for run in runs)
+        seconds = statistics.median(run["seconds_per_sample"] for run in runs) * samples
+    return {
+        "samples": samples,
+        "storage": "disk" if on_disk else "memory",
+        "peak_bytes": peak,
+        "disk_bytes": RESULT_BYTES_PER_SAMPLE * samples if on_disk else 0,
+        "seconds": seconds,
+        "calibrated_runs": len(runs),
+    }
+
+def record_run(backend_name, on_disk, samples, peak_bytes, wall_time, file_path=CALIBRATION_FILE):
+    if samples < MIN_CALIBRATION_SAMPLES or not peak_bytes or not wall_time:
+        return
+    calibration = load_calibration(file_path)
+    runs = calibration.setdefault("runs", {}).setdefault(storage_key(backend_name, on_disk), [])
+    runs.append({
+        "samples": samples,
+        "peak_bytes": peak_bytes,
+        "peak_ratio": peak_bytes / model_peak_bytes(samples, backend_name, on_disk),
+        "seconds_per_sample": wall_time / samples,
+    })
+    del runs[:-CALIBRATION_RUNS]
+    save_calibration(calibration, file_path)
+
+def lower_sample_interval(duration_hours, sample_interval, backend_name, budget, calibration=None):
+    for interval in SAMPLE_INTERVALS:
+        if interval <= sample_interval:
+            continue
+        samples = math.floor(int(duration_hours * 3600) / interval) + 1
+        if estimate_run(samples, backend_name, False, calibration)["peak_bytes"] <= budget:
+            return interval
+    return None
+
+def disk_fits(estimate, directory=None):
+    return shutil.disk_usage(directory or tempfile.gettempdir()).free >= estimate["disk_bytes"] * DISK_HEADROOM
+
+def format_bytes(value):
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.3g} {unit}"
+        value /= 1024
+    return f"{value:.3g} TB"
+
+def estimate_text(estimate, budget=None):
+    text = f"{estimate['samples']} samples: peak memory about {format_bytes(estimate['peak_bytes'])}"
+    if budget is not None:
+        text += f" (budget {format_bytes(budget)})"
+    text += f", about {estimate['seconds']:.3g} s"
+    if estimate["disk_bytes"]:
+        text += f", {format_bytes(estimate['disk_bytes'])} on disk"
+    return text
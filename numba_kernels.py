@@ -0,0 +1,79 @@
+import numba
+import numpy as np
+
+@numba.njit(cache=True, nogil=True)
+def nearest_segment(px, py, pz, vertices, table, counts):
+    if pz > 0:
+        code = 0
+    else:
+        code = 4
+    if py > 0:
+        code += 0 if px > 0 else 1
+    else:
+        code += 3 if px > 0 else 2
+
+    base = vertices.shape[0] + 1
+    best = np.full(3, base - 1, dtype=np.int64)
+    best_dist = np.full(3, np.inf)
+    for j in range(counts[code]):
+        v = table[code, j]
+        d = np.sqrt((px - vertices[v, 0])**2 + (py - vertices[v, 1])**2 + (pz - vertices[v, 2])**2)
+        if d < best_dist[2]:
+            if d < best_dist[1]:
+                best[2], best_dist[2] = best[1], best_dist[1]
+                if d < best_dist[0]:
+                    best[1], best_dist[1] = best[0], best_dist[0]
+                    best[0], best_dist[0] = v, d
+                else:
+                    best[1], best_dist[1] = v, d
+            else:
+                best[2], best_dist[2] = v, d
+    return (best[0] * base + best[1]) * base + best[2]
+
+@numba.njit(cache=True, nogil=True)
+def segment_kernel(x, y, z, vertices, table, counts, out):
+    for i in range(x.shape[0]):
+        out[i] = nearest_segment(x[i], y[i], z[i], vertices, table, counts)
+
+@numba.njit(cache=True, nogil=True)
+def fused_kernel(time_array, inner_rad_sec, outer_rad_sec, theta_1_init, theta_2_init, dx, dy, dz,
+                  vertices, table, counts, g_out, a_out, g_avg_out, a_avg_out, segment_out):
+    g_sum_x = g_sum_y = g_sum_z = 0.0
+    a_sum_x = a_sum_y = a_sum_z = 0.0
+    for i in range(time_array.shape[0]):
+        t = time_array[i]
+        theta_1 = outer_rad_sec * t + theta_1_init
+        theta_2 = inner_rad_sec * t + theta_2_init
+        s1, c1 = np.sin(theta_1), np.cos(theta_1)
+        s2, c2 = np.sin(theta_2), np.cos(theta_2)
+
+        wx, wy, wz = outer_rad_sec, inner_rad_sec * c1, inner_rad_sec * s1
+        wdy, wdz = -outer_rad_sec * inner_rad_sec * s1, outer_rad_sec * inner_rad_sec * c1
+        rx = dx * c2 + dz * s2
+        ry = dy * c1 + dx * s1 * s2 - dz * s1 * c2
+        rz = dy * s1 - dx * c1 * s2 + dz * c1 * c2
+
+        cx, cy, cz = wy * rz - wz * ry, wz * rx - wx * rz, wx * ry - wy * rx
+        ax = -((wdy * rz - wdz * ry) + (wy * cz - wz * cy))
+        ay = -((wdz * rx) + (wz * cx - wx * cz))
+        az = -((-wdy * rx) + (wx * cy - wy * cx))
+
+        bx, by, bz = ax, c1 * ay + s1 * az, -s1 * ay + c1 * az
+        a_out[0, i] = (c2 * bx - s2 * bz) / 9.8
+        a_out[1, i] = by / 9.8
+        a_out[2, i] = (s2 * bx + c2 * bz) / 9.8
+        g_out[0, i] = -s2 * c1
+        g_out[1, i] = s1
+        g_out[2, i] = c2 * c1
+
+        n = i + 1
+        g_sum_x += g_out[0, i]
+        g_sum_y += g_out[1, i]
+        g_sum_z += g_out[2, i]
+        a_sum_x += a_out[0, i]
+        a_sum_y += a_out[1, i]
+        a_sum_z += a_out[2, i]
+        g_avg_out[0, i], g_avg_out[1, i], g_avg_out[2, i] = g_sum_x / n, g_sum_y / n, g_sum_z / n
+        a_avg_out[0, i], a_avg_out[1, i], a_avg_out[2, i] = a_sum_x / n, a_sum_y / n, a_sum_z / n
+
+        segment_out[i] = nearest_segment(g_out[0, i], g_out[1, i], g_out[2, i], vertices, table, counts)
@@ -0,0 +1,131 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from compute_backend import count_distribution, get_backend
+from math_model import MathModel
+from path_visualization import PathVisualization
+
+STAGE_SAMPLES = (1000, 20000, None)
+STAGE_TOLERANCES = (0.25, 0.1, 0.0)
+STAGE_KEEP = (4, 2, 1)
+REFINE_LEVELS = 2
+DEFAULT_WEIGHTS = (1.0, 1.0, 0.01)
+COVERAGE_REFERENCE_POINTS = 100000
+
+def rpm_values(start, stop, step):
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+def candidate_grid(inner_range, outer_range, step, angle_step=None):
+    angles = [0.0] if not angle_step else [float(angle) for angle in np.arange(0, 360, angle_step)]
+    return [(float(inner), float(outer), inner_position, outer_position)
+            for inner in rpm_values(*inner_range, step) for outer in rpm_values(*outer_range, step)
+            for inner_position in angles for outer_position in angles]
+
+def reference_distribution(sphere_coords, backend, points=COVERAGE_REFERENCE_POINTS):
+    index = np.arange(points) + 0.5
+    phi = np.arccos(1 - 2 * index / points)
+    theta = np.pi * (1 + 5**0.5) * index
+    return count_distribution(backend.segment_ids(np.cos(theta) * np.sin(phi), np.sin(theta) * np.sin(phi), np.cos(phi), sphere_coords))
+
+class OperatingPointOptimizer:
+    def __init__(self, distance_cm, duration_hours, weights=DEFAULT_WEIGHTS, backend=None, workers=None):
+        self.delta_m = distance_cm / 100
+        self.duration_hours = duration_hours
+        self.weights = weights
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = get_backend(backend)
+        self.sphere_coords = PathVisualization("optimizer", [], [], [], backend=self.backend)._create_sphere()
+        self.max_distribution = reference_distribution(self.sphere_coords, self.backend)
+        self.evaluations = 0
+        self.pruned = 0
+
+    def stride(self, samples):
+        if samples is None:
+            return 1
+        return max(1, int(self.duration_hours * 36000 // samples))
+
+    def evaluate(self, candidate, stride=1, incumbent=None):
+        inner_rpm, outer_rpm, inner_position, outer_position = candidate
+        model = MathModel(inner_rpm, outer_rpm, self.delta_m, self.delta_m, self.delta_m, self.duration_hours, inner_position, outer_position, sample_interval=0.1 * stride)
+        time_array, g_array, a_array = model.calculate_acceleration()
+        g_magnitude = float(np.mean(np.sqrt(np.sum(self.backend.time_average(g_array)**2, axis=0))))
+        a_magnitude = float(np.mean(np.sqrt(np.sum(self.backend.time_average(a_array)**2, axis=0))))
+        bound = self.weights[0] * g_magnitude + self.weights[1] * a_magnitude
+        result = {
+            "inner_rpm": inner_rpm,
+            "outer_rpm": outer_rpm,
+            "inner_position": inner_position,
+            "outer_position": outer_position,
+            "stride": stride,
+            "g_magnitude": g_magnitude,
+            "non_g_magnitude": a_magnitude,
+        }
+        if incumbent is not None and bound > incumbent:
+            result["cost"] = bound
+            result["pruned"] = True
+            return result
+
+        distribution = count_distribution(self.backend.segment_ids(g_array[0], g_array[1], g_array[2], self.sphere_coords))
+        coverage = distribution / min(len(time_array), self.max_distribution)
+        result["distribution"] = distribution
+        result["coverage"] = coverage
+        result["cost"] = bound + self.weights[2] * (1 - coverage)
+        return result
+
+    def evaluate_all(self, candidates, stride=1, incumbent=None):
+        with ThreadPoolExecutor(self.workers) as executor:
+            results = list(executor.map(lambda candidate: self.evaluate(candidate, stride, incumbent), candidates))
+        self.evaluations += len(results)
+        self.pruned += sum(1 for result in results if result.get("pruned"))
+        return results
+
+    def run_stage(self, candidates, stride, tolerance, keep, progress=None):
+        results = []
+        incumbent = None
+        for start in range(0, len(candidates), self.workers):
+            batch = self.evaluate_all(candidates[start:start + self.workers], stride, incumbent * (1 + tolerance) if incumbent is not None else None)
+            results.extend(batch)
+            costs = [result["cost"] for result in batch if not result.get("pruned")]
+            if costs:
+                incumbent = min(costs + ([incumbent] if incumbent is not None else []))
+            if progress:
+                progress(stride, len(results), len(candidates))
+        return sorted((r for r in results if not r.get("pruned")), key=lambda r: r["cost"])[:keep]
+
+    def refine(self, best, step, stride, inner_range, outer_range, progress=None):
+        for _ in range(REFINE_LEVELS):
+            improved = True
+            while improved:
+                improved = False
+                neighbours = [(best["inner_rpm"] + di * step, best["outer_rpm"] + do * step, best["inner_position"], best["outer_position"])
+                              for di in (-1, 0, 1) for do in (-1, 0, 1) if di or do]
+                neighbours = [c for c in neighbours if inner_range[0] <= c[0] <= inner_range[1] and outer_range[0] <= c[1] <= outer_range[1] and (c[0] > 0 or c[1] > 0)]
+                for result in self.evaluate_all(neighbours, stride, best["cost"]):
+                    if not result.get("pruned") and result["cost"] < best["cost"]:
+                        best, improved = result, True
+                if progress:
+                    progress(stride, 0, 0)
+            step /= 2
+        return best
+
+    def run(self, inner_range=(0.5, 10.0), outer_range=(0.5, 10.0), step=0.5, angle_step=None, finalists=5, refine=True, progress=None):
+        candidates = candidate_grid(inner_range, outer_range, step, angle_step)
+        for samples, tolerance, keep in zip(STAGE_SAMPLES, STAGE_TOLERANCES, STAGE_KEEP):
+            survivors = self.run_stage(candidates, self.stride(samples), tolerance, keep * finalists, progress)
+            candidates = [(r["inner_rpm"], r["outer_rpm"], r["inner_position"], r["outer_position"]) for r in survivors]
+
+        best = survivors[0]
+        if refine:
+            stride = self.stride(STAGE_SAMPLES[1])
+            refined = self.refine(self.evaluate_all(candidates[:1], stride)[0], step / 2, stride, inner_range, outer_range, progress)
+            refined = self.evaluate_all([(refined["inner_rpm"], refined["outer_rpm"], refined["inner_position"], refined["outer_position"])])[0]
+            if refined["cost"] < best["cost"]:
+                best = refined
+                survivors = [refined] + survivors[:finalists - 1]
+        return {
+            "best": best,
+            "finalists": survivors,
+            "evaluations": self.evaluations,
+            "pruned": self.pruned,
+            "weights": list(self.weights),
+        }
@@ -1,13 +1,19 @@
 import numpy as np
+from compute_backend import count_distribution, get_backend, segment_totals, segment_vertices
+from sphere_index import DEFAULT_LEVELS, coverage_profile
 
 class PathVisualization:
-    def __init__(self, id_, x, y, z):
+    def __init__(self, id_, x, y, z, backend=None):
         self.id_ = id_
         self.x = x
         self.y = y
         self.z = z
-        self.path_coords = list(zip(x, y, z))
         self.num_points = 1000
+        self.backend = get_backend(backend)
+
+    @property
+    def path_coords(self):
+        return list(zip(self.x, self.y, self.z))
 
     def _create_sphere(self):
         golden_r = (np.sqrt(5.0) + 1.0) / 2.0
@@ -72,7 +78,25 @@ class PathVisualization:
 
     def get_distribution(self):
         sphere_coords = self._create_sphere()
-        return self._get_distribution_num(sphere_coords)
+        return count_distribution(self.get_segment_ids(sphere_coords))
+
+    def get_segment_ids(self, sphere_coords=None):
+        if sphere_coords is None:
+            sphere_coords = self._create_sphere()
+        return self.backend.segment_ids(self.x, self.y, self.z, sphere_coords)
+
+    def get_coverage_profile(self, levels=DEFAULT_LEVELS):
+        return coverage_profile(np.vstack([self.x, self.y, self.z]), levels)
+
+    def dwell_cells(self, segment_ids, durations, sphere_coords=None):
+        if sphere_coords is None:
+            sphere_coords = self._create_sphere()
+        vertices = np.asarray(sphere_coords, dtype=np.float64)
+        ids, dwell = segment_totals(segment_ids, durations)
+        corners = np.sort(segment_vertices(ids, len(vertices)), axis=1)
+        complete = corners[:, 2] < len(vertices)
+        cells, inverse = np.unique(corners[complete], axis=0, return_inverse=True)
+        return vertices[cells], np.bincount(inverse.ravel(), weights=dwell[complete], minlength=len(cells))
 
     def format_time(self, time):
         return [t / 3600 for t in time]
\ No newline at end of file
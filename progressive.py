@@ -0,0 +1,81 @@
+import numpy as np
+from comparison import time_average
+from compute_backend import magnitude_mean
+
+PREVIEW_SAMPLES = 20000
+REFINE_FACTOR = 4
+PERIOD_SAMPLES = 4
+MIN_STRIDE = 11
+ERROR_GROUPS = 4
+
+def is_prime(value):
+    return value > 1 and all(value % divisor for divisor in range(2, int(value**0.5) + 1))
+
+def next_prime(value):
+    while not is_prime(value):
+        value += 1
+    return value
+
+def previous_prime(value):
+    while value >= MIN_STRIDE and not is_prime(value):
+        value -= 1
+    return value
+
+def preview_strides(model, first_samples=PREVIEW_SAMPLES, factor=REFINE_FACTOR):
+    samples = model.sample_count()
+    if samples < 2:
+        return []
+    fastest = (abs(model.inner_rpm) + abs(model.outer_rpm)) / 60
+    limit = samples if fastest == 0 else int(1 / (fastest * PERIOD_SAMPLES * model.time_step()))
+    stride = next_prime(-(-samples // first_samples))
+    strides = []
+    while stride >= MIN_STRIDE:
+        strides.append(stride)
+        if stride <= limit:
+            break
+        stride = previous_prime(max(stride // factor, limit))
+    return strides
+
+def magnitude_estimate(components, averages, groups=ERROR_GROUPS):
+    value = magnitude_mean(averages)
+    group_values = np.array([magnitude_mean(time_average(components[:, k::groups])) for k in range(groups)])
+    spread = np.std(group_values, ddof=1) / np.sqrt(groups)
+    bias = (group_values.mean() - value) / (groups - 1)
+    return float(value), float(np.hypot(spread, bias))
+
+def distribution_estimate(segment_ids):
+    _, counts = np.unique(segment_ids, return_counts=True)
+    singletons, doubletons = np.count_nonzero(counts == 1), np.count_nonzero(counts == 2)
+    if doubletons:
+        ratio = singletons / doubletons
+        return float(len(counts) + singletons * ratio / 2), float(np.sqrt(doubletons * (ratio**4 / 4 + ratio**3 + ratio**2 / 2)))
+    return float(len(counts) + singletons * (singletons - 1) / 2), float(np.sqrt(singletons * (singletons - 1) / 2))
+
+def preview_run(model, stride, sphere_coords, backend):
+    time_array = model.time_at(np.arange(0, model.sample_count(), stride))
+    _, g_array, a_array = model.calculate_acceleration(time_array)
+    g_avg, a_avg = time_average(g_array), time_average(a_array)
+    segment_ids = backend.segment_ids(g_array[0], g_array[1], g_array[2], sphere_coords)
+    return {
+        "time_array": time_array,
+        "g_array": g_array,
+        "g_avg": g_avg,
+        "a_avg": a_avg,
+        "segment_ids": segment_ids,
+        "stride": stride,
+        "estimates": {
+            "g_magnitude": magnitude_estimate(g_array, g_avg),
+            "non_g_magnitude": magnitude_estimate(a_array, a_avg),
+            "distribution": distribution_estimate(segment_ids),
+        },
+    }
+
+def estimate_text(value, error, digits=3):
+    return f"{value:.{digits}g} ± {error:.2g}"
+
+def preview_summary(result):
+    summary = {"stride": result["stride"], "samples": len(result["time_array"])}
+    for name, (value, error) in result["estimates"].items():
+        summary[name] = value
+        summary[name + "_error"] = error
+    return summary
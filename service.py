@@ -0,0 +1,370 @@
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from flask import Flask, Response, jsonify, request, send_file, url_for
+from batch import log_results, log_summary
+from cli import theoretical_summary
+from compute_backend import BACKENDS, DEFAULT_BACKEND, RESULT_CHUNK_SIZE, available_backends, decimated, get_backend
+from instrumentation import DEFAULT_LOG_DIR, NullInstrumentation
+from math_model import MathModel
+from path_visualization import PathVisualization
+from session import SESSION_EXTENSION, load_session, save_session
+
+DEFAULT_CACHE_DIR = os.path.join(DEFAULT_LOG_DIR, "service_cache")
+DEFAULT_CACHE_BYTES = 4 * 2**30
+DEFAULT_POINTS = 2000
+MAX_POINTS = 100000
+SYNC_MAX_SAMPLES = 200000
+UPLOAD_BYTES_PER_SAMPLE = 40
+MAX_UPLOAD_BYTES = 2 * 2**30
+JOB_HISTORY = 1000
+THEORETICAL_FIELDS = ("inner_rpm", "outer_rpm", "inner_position", "outer_position", "distance", "duration", "start_analysis", "end_analysis")
+
+progress_queue = None
+
+def set_progress_queue(queue):
+    global progress_queue
+    progress_queue = queue
+
+def report(job_id, progress, message):
+    if progress_queue is not None:
+        progress_queue.put((job_id, progress, message))
+
+class JobInstrumentation(NullInstrumentation):
+    def __init__(self, job_id, start, end):
+        self.job_id = job_id
+        self.start = start
+        self.end = end
+        self.stages = 0
+
+    def stage(self, name, samples=None):
+        report(self.job_id, self.start + (self.end - self.start) * (1 - 0.5**self.stages), name)
+        self.stages += 1
+        return super().stage(name, samples)
+
+def optional_float(values, name):
+    value = values.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number.")
+
+def backend_name(values):
+    name = str(values.get("backend") or DEFAULT_BACKEND).lower()
+    if name != "auto" and name not in BACKENDS:
+        raise ValueError(f"Unknown compute backend: {name}")
+    return name
+
+def theoretical_params(values):
+    params = {name: optional_float(values, name) for name in THEORETICAL_FIELDS}
+    if not params["duration"] or params["duration"] <= 0 or (params["inner_rpm"] is None and params["outer_rpm"] is None):
+        raise ValueError("Set angular velocities and simulation duration.")
+    for name in ("inner_rpm", "outer_rpm", "inner_position", "outer_position", "distance"):
+        params[name] = params[name] or 0.0
+    check_window(params["start_analysis"], params["end_analysis"])
+    if params["end_analysis"] is not None and params["end_analysis"] > params["duration"]:
+        raise ValueError("Upper bound for time period of analysis must be ≤ the simulation duration.")
+    params["backend"] = backend_name(values)
+    return params
+
+def check_window(start_analysis, end_analysis):
+    if (start_analysis is None) != (end_analysis is None):
+        raise ValueError("Set both bounds of the time period of analysis.")
+    if start_analysis is not None and end_analysis <= start_analysis:
+        raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
+
+def theoretical_model(params):
+    delta_m = params["distance"] / 100
+    return MathModel(params["inner_rpm"], params["outer_rpm"], delta_m, delta_m, delta_m, params["duration"], params["inner_position"], params["outer_position"])
+
+def cache_key(kind, params):
+    return hashlib.sha256(json.dumps({"kind": kind, "params": params}, sort_keys=True).encode()).hexdigest()
+
+def run_theoretical_job(job_id, params, result_path):
+    model = theoretical_model(params)
+    backend = get_backend(params["backend"])
+    sphere_coords = PathVisualization("service", [], [], [], backend=backend)._create_sphere()
+    time_array, g_array, a_array, g_avg, a_avg, segment_ids = backend.run(model, sphere_coords, JobInstrumentation(job_id, 0.05, 0.85))
+    report(job_id, 0.9, "summary")
+    summary = theoretical_summary(backend.name, time_array, g_avg, a_avg, segment_ids, params["start_analysis"], params["end_analysis"])
+    report(job_id, 0.95, "saving")
+    arrays = {"time_array": time_array, "g_array": g_array, "a_array": a_array, "g_avg": g_avg, "a_avg": a_avg, "segment_ids": segment_ids}
+    save_session(result_path, {"kind": "theoretical", "params": params, "summary": summary}, arrays)
+
+def run_experimental_job(job_id, params, result_path):
+    report(job_id, 0.05, "import")
+    results = log_results(params["file_path"], params["start_analysis"], params["end_analysis"], params["backend"])
+    report(job_id, 0.8, "summary")
+    summary = log_summary(params["file_name"], results, params["start_analysis"], params["end_analysis"])
+    report(job_id, 0.95, "saving")
+    save_session(result_path, {"kind": "experimental", "params": params, "summary": summary}, results)
+
+JOB_FUNCTIONS = {"theoretical": run_theoretical_job, "experimental": run_experimental_job}
+
+def magnitude(values):
+    return np.sqrt(np.sum(values**2, axis=0))
+
+def result_series(state, arrays, points):
+    if state["kind"] == "theoretical":
+        g_avg, a_avg = decimated(arrays["g_avg"], points), decimated(arrays["a_avg"], points)
+        return {
+            "time_hours": (decimated(arrays["time_array"], points) / 3600).tolist(),
+            "g_magnitude": magnitude(g_avg).tolist(),
+            "non_g_magnitude": magnitude(a_avg).tolist(),
+            "g_avg": g_avg.tolist(),
+            "a_avg": a_avg.tolist(),
+        }
+    averages = decimated(arrays["averages"], points)
+    return {
+        "time_hours": decimated(arrays["time_in_hours"], points).tolist(),
+        "g_magnitude": magnitude(averages).tolist(),
+        "averages": averages.tolist(),
+    }
+
+def stream_npy(array):
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(header, np.lib.format.header_data_from_array_1_0(array))
+    yield header.getvalue()
+    flat = array.reshape(-1)
+    for start in range(0, len(flat), RESULT_CHUNK_SIZE):
+        yield np.ascontiguousarray(flat[start:start + RESULT_CHUNK_SIZE]).tobytes()
+
+class ResultCache:
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "uploads"), exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SESSION_EXTENSION)
+
+    def upload_path(self, digest):
+        return os.path.join(self.directory, "uploads", digest + ".csv")
+
+    def get(self, key):
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)
+        return path
+
+    def evict(self):
+        with self.lock:
+            entries = []
+            for directory, suffix in ((self.directory, SESSION_EXTENSION), (os.path.join(self.directory, "uploads"), ".csv")):
+                for name in os.listdir(directory):
+                    if name.endswith(suffix):
+                        stat = os.stat(os.path.join(directory, name))
+                        entries.append((stat.st_mtime, stat.st_size, os.path.join(directory, name)))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries)[:-1]:
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+
+class JobManager:
+    def __init__(self, cache, workers=None):
+        self.cache = cache
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.jobs = OrderedDict()
+        self.active = {}
+        self.lock = threading.Lock()
+        self.executor = None
+        self.queue = None
+
+    def start(self):
+        context = mp.get_context("spawn")
+        self.queue = context.Queue()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=set_progress_queue, initargs=(self.queue,))
+        threading.Thread(target=self.listen, daemon=True).start()
+
+    def listen(self):
+        while True:
+            job_id, progress, message = self.queue.get()
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is not None and job["status"] in ("queued", "running"):
+                    job.update(status="running", progress=round(progress, 3), message=message)
+
+    def submit(self, kind, key, params):
+        with self.lock:
+            if key in self.active:
+                return self.jobs[self.active[key]]
+            if self.executor is None:
+                self.start()
+            job_id = uuid.uuid4().hex
+            job = {"id": job_id, "kind": kind, "key": key, "status": "queued", "progress": 0.0, "message": "queued", "submitted": time.time()}
+            self.jobs[job_id] = job
+            self.active[key] = job_id
+            while len(self.jobs) > JOB_HISTORY:
+                self.jobs.popitem(last=False)
+            future = job["future"] = self.executor.submit(JOB_FUNCTIONS[kind], job_id, params, self.cache.path(key))
+        future.add_done_callback(lambda future: self.finish(job, future))
+        return job
+
+    def finish(self, job, future):
+        error = future.exception()
+        with self.lock:
+            self.active.pop(job["key"], None)
+            if error is None:
+                job.update(status="done", progress=1.0, message="done", finished=time.time())
+            else:
+                job.update(status="error", message="error", error=str(error) or type(error).__name__, finished=time.time())
+        if error is None:
+            self.cache.evict()
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+def create_app(cache_dir=DEFAULT_CACHE_DIR, workers=None, cache_bytes=DEFAULT_CACHE_BYTES):
+    app = Flask(__name__)
+    app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
+    cache = ResultCache(cache_dir, cache_bytes)
+    jobs = JobManager(cache, workers)
+    app.extensions["kinematics_jobs"] = jobs
+
+    def job_json(job):
+        fields = {name: job[name] for name in ("id", "kind", "status", "progress", "message") if name in job}
+        fields["status_url"] = url_for("job_status", job_id=job["id"])
+        if job["status"] == "done":
+            fields["result_url"] = url_for("result", key=job["key"])
+            fields["arrays_url"] = url_for("result_arrays", key=job["key"])
+        if "error" in job:
+            fields["error"] = job["error"]
+        return fields
+
+    def result_json(key, points):
+        state, arrays = load_session(cache.path(key))
+        return {
+            "key": key,
+            "kind": state["kind"],
+            "params": {name: value for name, value in state["params"].items() if name != "file_path"},
+            "summary": state["summary"],
+            "series": result_series(state, arrays, points),
+            "arrays_url": url_for("result_arrays", key=key),
+            "arrays": {name: url_for("result_array", key=key, name=name) for name in arrays.names},
+        }
+
+    def requested_points():
+        points = request.args.get("points", DEFAULT_POINTS, type=int)
+        if points is None or not 2 <= points <= MAX_POINTS:
+            raise ValueError(f"points must be between 2 and {MAX_POINTS}.")
+        return points
+
+    def dispatch(kind, key, params, samples, wait):
+        points = requested_points()
+        if cache.get(key):
+            return jsonify(result_json(key, points))
+        job = jobs.submit(kind, key, params)
+        if wait is None:
+            wait = samples <= SYNC_MAX_SAMPLES
+        if not wait:
+            return jsonify(job_json(job)), 202, {"Location": url_for("job_status", job_id=job["id"])}
+        error = job["future"].exception()
+        if error is not None:
+            return jsonify(error=str(error) or type(error).__name__), 400
+        return jsonify(result_json(key, points))
+
+    def wait_flag():
+        value = request.args.get("wait")
+        return None if value is None else value.lower() in ("1", "true", "yes")
+
+    @app.errorhandler(ValueError)
+    def bad_request(error):
+        return jsonify(error=str(error)), 400
+
+    @app.get("/api/health")
+    def health():
+        return jsonify(status="ok", backends=available_backends(), workers=jobs.workers)
+
+    @app.post("/api/theoretical")
+    def theoretical():
+        params = theoretical_params(request.get_json(silent=True) or request.form)
+        samples = theoretical_model(params).sample_count()
+        return dispatch("theoretical", cache_key("theoretical", params), params, samples, wait_flag())
+
+    @app.post("/api/experimental")
+    def experimental():
+        upload = request.files.get("file")
+        if upload is None or not upload.filename:
+            raise ValueError("Upload a CSV file.")
+        params = {name: optional_float(request.form, name) for name in ("start_analysis", "end_analysis")}
+        check_window(params["start_analysis"], params["end_analysis"])
+        params["backend"] = backend_name(request.form)
+
+        temp_path = os.path.join(cache.directory, "uploads", uuid.uuid4().hex + ".part")
+        digest = hashlib.sha256()
+        with open(temp_path, 'wb') as file:
+            for chunk in iter(lambda: upload.stream.read(RESULT_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                file.write(chunk)
+        file_path = cache.upload_path(digest.hexdigest())
+        os.replace(temp_path, file_path)
+
+        params.update(file_name=upload.filename, file_path=file_path, sha256=digest.hexdigest())
+        key = cache_key("experimental", {name: value for name, value in params.items() if name not in ("file_name", "file_path")})
+        return dispatch("experimental", key, params, os.path.getsize(file_path) // UPLOAD_BYTES_PER_SAMPLE, wait_flag())
+
+    @app.get("/api/jobs/<job_id>")
+    def job_status(job_id):
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify(error="Unknown job."), 404
+        return jsonify(job_json(job))
+
+    @app.get("/api/results/<key>")
+    def result(key):
+        if not cache.get(key):
+            return jsonify(error="Unknown or expired result."), 404
+        return jsonify(result_json(key, requested_points()))
+
+    @app.get("/api/results/<key>/arrays")
+    def result_arrays(key):
+        path = cache.get(key)
+        if not path:
+            return jsonify(error="Unknown or expired result."), 404
+        return send_file(path, mimetype="application/zip", as_attachment=True, download_name=key + SESSION_EXTENSION)
+
+    @app.get("/api/results/<key>/arrays/<name>")
+    def result_array(key, name):
+        if not cache.get(key):
+            return jsonify(error="Unknown or expired result."), 404
+        _, arrays = load_session(cache.path(key))
+        if name not in arrays:
+            return jsonify(error="Unknown array."), 404
+        return Response(stream_npy(arrays[name]), mimetype="application/octet-stream", headers={"Content-Disposition": f"attachment; filename={name}.npy"})
+
+    return app
+
+if __name__ == "__main__":
+    mp.freeze_support()
+    arg_parser = argparse.ArgumentParser(description="Kinematics Model HTTP service")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8050)
+    arg_parser.add_argument("--workers", type=int, help="size of the compute worker pool (default: CPU count - 1)")
+    arg_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="directory for cached results and uploads")
+    arg_parser.add_argument("--cache-gb", type=float, default=DEFAULT_CACHE_BYTES / 2**30, help="evict least recently used results above this size")
+    args = arg_parser.parse_args()
+    app = create_app(args.cache_dir, args.workers, int(args.cache_gb * 2**30))
+    try:
+        app.run(host=args.host, port=args.port, threaded=True)
+    finally:
+        app.extensions["kinematics_jobs"].shutdown()
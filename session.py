@@ -0,0 +1,82 @@
+import json
+import os
+import struct
+import zipfile
+import numpy as np
+
+SESSION_FORMAT = 1
+SESSION_EXTENSION = ".kms"
+STATE_MEMBER = "session.json"
+ARRAY_ALIGNMENT = 64
+ALIGNMENT_EXTRA_ID = 0xD935
+ZIP64_THRESHOLD = 2**31 - 2**20
+
+def is_compressible(array):
+    return array.dtype.kind in "biu"
+
+def write_array_member(archive, name, array):
+    array = np.asarray(array)
+    info = zipfile.ZipInfo(name + ".npy", date_time=(1980, 1, 1, 0, 0, 0))
+    large = array.nbytes > ZIP64_THRESHOLD
+    if is_compressible(array):
+        info.compress_type = zipfile.ZIP_DEFLATED
+    else:
+        info.compress_type = zipfile.ZIP_STORED
+        header_end = archive.fp.tell() + 30 + len(info.filename.encode()) + 4 + (20 if large else 0)
+        padding = -header_end % ARRAY_ALIGNMENT
+        info.extra = struct.pack('<HH', ALIGNMENT_EXTRA_ID, padding) + bytes(padding)
+    with archive.open(info, 'w', force_zip64=large) as member:
+        np.lib.format.write_array(member, array, allow_pickle=False)
+
+def save_session(file_path, state, arrays):
+    state = dict(state, format=SESSION_FORMAT, arrays=sorted(arrays))
+    temp_path = file_path + ".tmp"
+    with zipfile.ZipFile(temp_path, 'w', allowZip64=True) as archive:
+        archive.writestr(STATE_MEMBER, json.dumps(state, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+        for name in sorted(arrays):
+            write_array_member(archive, name, arrays[name])
+    os.replace(temp_path, file_path)
+
+class SessionArrays:
+    def __init__(self, file_path, names):
+        self.file_path = file_path
+        self.names = list(names)
+        self.cache = {}
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __getitem__(self, name):
+        if name not in self.names:
+            raise KeyError(name)
+        if name not in self.cache:
+            self.cache[name] = self.load(name)
+        return self.cache[name]
+
+    def load(self, name):
+        with zipfile.ZipFile(self.file_path) as archive:
+            info = archive.getinfo(name + ".npy")
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    return np.lib.format.read_array(member, allow_pickle=False)
+
+        with open(self.file_path, 'rb') as file:
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', file.read(4))
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+            offset = file.tell()
+        if not np.prod(shape):
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.file_path, dtype=dtype, mode='r', offset=offset, shape=shape, order='F' if fortran_order else 'C')
+
+def load_session(file_path):
+    with zipfile.ZipFile(file_path) as archive:
+        state = json.loads(archive.read(STATE_MEMBER))
+    if state.get("format", 0) > SESSION_FORMAT:
+        raise ValueError("This session file was written by a newer version.")
+    return state, SessionArrays(file_path, state["arrays"])
@@ -0,0 +1,75 @@
+import numpy as np
+from compute_backend import RESULT_CHUNK_SIZE
+
+DEFAULT_SEGMENT_SECONDS = 600.0
+OVERLAP = 0.5
+PEAK_COUNT = 3
+COMPONENT_NAMES = ("X", "Y", "Z")
+
+def sample_rate(time_values, start=0, end=None, seconds_per_unit=1.0):
+    end = len(time_values) if end is None else end
+    steps = np.diff(np.asarray(time_values[start:min(end, start + RESULT_CHUNK_SIZE + 1)], dtype=np.float64))
+    step = float(np.median(steps)) * seconds_per_unit if len(steps) else 0.0
+    if step <= 0:
+        raise ValueError("Timestamps must increase to compute a spectrum.")
+    return 1 / step
+
+def welch_psd(components, rate, start=0, end=None, segment_samples=None, overlap=OVERLAP):
+    from scipy.signal import welch
+
+    end = components.shape[-1] if end is None else end
+    samples = end - start
+    if samples < 2:
+        raise ValueError("At least two samples are needed for a spectrum.")
+    if segment_samples is None:
+        segment_samples = int(round(DEFAULT_SEGMENT_SECONDS * rate))
+    if segment_samples < 2:
+        raise ValueError("Spectrum segments must span at least two samples.")
+    segment_samples = min(segment_samples, samples)
+    overlap_samples = int(segment_samples * overlap)
+    step = segment_samples - overlap_samples
+    segments = (samples - overlap_samples) // step
+    per_chunk = max(1, RESULT_CHUNK_SIZE // step)
+    total = 0.0
+    for first in range(0, segments, per_chunk):
+        count = min(per_chunk, segments - first)
+        chunk_start = start + first * step
+        chunk = np.asarray(components[:, chunk_start:chunk_start + (count - 1) * step + segment_samples], dtype=np.float64)
+        frequencies, psd = welch(chunk, rate, window='hann', nperseg=segment_samples, noverlap=overlap_samples, detrend='constant', axis=-1)
+        total = total + psd * count
+    return frequencies, total / segments, segments, segment_samples
+
+def spectral_peaks(frequencies, psd, count=PEAK_COUNT):
+    from scipy.signal import find_peaks
+
+    peaks, _ = find_peaks(psd)
+    peaks = peaks[np.argsort(psd[peaks])[::-1][:count]]
+    return [{"frequency": float(frequencies[k]), "rpm": float(frequencies[k] * 60), "psd": float(psd[k])} for k in peaks]
+
+def spectrum(time_values, components, start=0, end=None, seconds_per_unit=1.0, segment_seconds=DEFAULT_SEGMENT_SECONDS):
+    rate = sample_rate(time_values, start, end, seconds_per_unit)
+    frequencies, psd, segments, segment_samples = welch_psd(components, rate, start, end, int(round(segment_seconds * rate)))
+    resolution = float(frequencies[1] - frequencies[0])
+    return {
+        "frequencies": frequencies,
+        "psd": psd,
+        "stats": {
+            "sample_rate": rate,
+            "segments": segments,
+            "segment_seconds": segment_samples / rate,
+            "resolution": resolution,
+            "components": [{"name": name, "rms": float(np.sqrt(np.sum(values[1:]) * resolution)), "peaks": spectral_peaks(frequencies, values)}
+                           for name, values in zip(COMPONENT_NAMES, psd)],
+        },
+    }
+
+def component_label(entry):
+    peak = f"peak {entry['peaks'][0]['frequency']:.3g} Hz" if entry["peaks"] else "no peak"
+    return f"{entry['name']}: {peak}, RMS {entry['rms']:.3g} g"
+
+def report_text(stats):
+    return f"{stats['segments']} segments of {stats['segment_seconds']:.3g} s, resolution {stats['resolution']:.3g} Hz ({60 * stats['resolution']:.3g} rpm)"
+
+def write_spectrum_csv(file_path, result):
+    header = ",".join(["Frequency (Hz)"] + [f"{name} PSD (g^2/Hz)" for name in COMPONENT_NAMES])
+    np.savetxt(file_path, np.column_stack([result["frequencies"], *result["psd"]]), delimiter=',', header=header, comments='', fmt='%.9g')
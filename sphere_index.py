@@ -0,0 +1,72 @@
+import numpy as np
+
+DEFAULT_LEVELS = 7
+INDEX_CHUNK_SIZE = 1 << 18
+FACE_COUNT = 20
+
+def icosahedron():
+    golden_r = (np.sqrt(5.0) + 1.0) / 2.0
+    vertices = np.array([(-1, golden_r, 0), (1, golden_r, 0), (-1, -golden_r, 0), (1, -golden_r, 0),
+                         (0, -1, golden_r), (0, 1, golden_r), (0, -1, -golden_r), (0, 1, -golden_r),
+                         (golden_r, 0, -1), (golden_r, 0, 1), (-golden_r, 0, -1), (-golden_r, 0, 1)], dtype=np.float64)
+    faces = np.array([(0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11), (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+                      (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9), (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1)])
+    return vertices / np.linalg.norm(vertices, axis=1, keepdims=True), faces
+
+def cell_count(level):
+    return FACE_COUNT * 4**level
+
+def face_frames():
+    vertices, faces = icosahedron()
+    corners = vertices[faces]
+    centers = corners.sum(axis=1)
+    return centers / np.linalg.norm(centers, axis=1, keepdims=True), np.linalg.inv(np.transpose(corners, (0, 2, 1)))
+
+def cell_ids(components, levels=DEFAULT_LEVELS):
+    points = np.asarray(components, dtype=np.float64)
+    centers, inverses = face_frames()
+    face = np.argmax(centers @ points, axis=0)
+    u, v, w = np.einsum('nij,jn->in', inverses[face], points)
+    total = u + v + w
+    total[total == 0] = 1.0
+    u, v, w = 2 * u / total, 2 * v / total, 2 * w / total
+    ids = face.astype(np.int64)
+    for _ in range(levels):
+        child = np.where(u >= 1, 0, np.where(v >= 1, 1, np.where(w >= 1, 2, 3)))
+        u -= child == 0
+        v -= child == 1
+        w -= child == 2
+        center = child == 3
+        u[center], v[center], w[center] = 1 - w[center], 1 - u[center], 1 - v[center]
+        u, v, w = 2 * u, 2 * v, 2 * w
+        ids = ids * 4 + child
+    return ids
+
+def visited_cells(components, levels=DEFAULT_LEVELS):
+    samples = components.shape[-1]
+    visited = np.zeros(cell_count(levels), dtype=bool)
+    for start in range(0, samples, INDEX_CHUNK_SIZE):
+        visited[cell_ids(components[:, start:start + INDEX_CHUNK_SIZE], levels)] = True
+    return visited
+
+def coverage_profile(components, levels=DEFAULT_LEVELS):
+    visited = visited_cells(components, levels)
+    profile = []
+    for level in range(levels, -1, -1):
+        cells = cell_count(level)
+        profile.append({
+            "level": level,
+            "cells": cells,
+            "cell_degrees": float(np.degrees(np.sqrt(4 * np.pi / cells))),
+            "visited": int(np.count_nonzero(visited)),
+            "coverage": float(np.count_nonzero(visited) / cells),
+        })
+        visited = visited.reshape(-1, 4).any(axis=1)
+    return profile[::-1]
+
+def profile_text(profile):
+    return "\n".join(f"Level {entry['level']}: {entry['visited']}/{entry['cells']} cells (~{entry['cell_degrees']:.3g}°), coverage {100 * entry['coverage']:.1f}%" for entry in profile)
+
+def write_coverage_csv(file_path, profile):
+    rows = [(entry["level"], entry["cells"], entry["cell_degrees"], entry["visited"], entry["coverage"]) for entry in profile]
+    np.savetxt(file_path, np.array(rows, dtype=np.float64), delimiter=',', header="Level,Cells,Cell Size (deg),Visited Cells,Coverage", comments='', fmt='%.9g')
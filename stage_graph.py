@@ -0,0 +1,67 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from instrumentation import NullInstrumentation
+
+class StageGraph:
+    def __init__(self, instrumentation=None, workers=None):
+        self.instrumentation = instrumentation or NullInstrumentation()
+        self.workers = workers or os.cpu_count() or 1
+        self.stages = {}
+        self.values = {}
+
+    def set(self, name, value):
+        for dependent in self.dependents(name):
+            self.values.pop(dependent, None)
+        self.values[name] = value
+
+    def add(self, name, function, inputs=(), samples=None, main_thread=False, label=None):
+        self.stages[name] = {"function": function, "inputs": tuple(inputs), "samples": samples, "main_thread": main_thread, "label": label or name}
+
+    def dependents(self, name):
+        found, frontier = set(), [name]
+        while frontier:
+            current = frontier.pop()
+            for stage, spec in self.stages.items():
+                if current in spec["inputs"] and stage not in found:
+                    found.add(stage)
+                    frontier.append(stage)
+        return found
+
+    def pending(self, targets):
+        needed, frontier = set(), list(targets)
+        while frontier:
+            name = frontier.pop()
+            if name in self.values or name in needed:
+                continue
+            if name not in self.stages:
+                raise ValueError(f"Unknown pipeline stage '{name}'.")
+            needed.add(name)
+            frontier.extend(self.stages[name]["inputs"])
+        return needed
+
+    def call(self, name):
+        spec = self.stages[name]
+        with self.instrumentation.stage(spec["label"], spec["samples"]):
+            return spec["function"](*(self.values[input_name] for input_name in spec["inputs"]))
+
+    def run(self, *targets):
+        needed = self.pending(targets or self.stages)
+        running = {}
+        with ThreadPoolExecutor(self.workers) as executor:
+            while needed or running:
+                ready = [name for name in self.stages if name in needed and all(input_name in self.values for input_name in self.stages[name]["inputs"])]
+                for name in ready:
+                    if not self.stages[name]["main_thread"]:
+                        needed.discard(name)
+                        running[executor.submit(self.call, name)] = name
+                inline = [name for name in ready if self.stages[name]["main_thread"]]
+                if inline:
+                    needed.discard(inline[0])
+                    self.values[inline[0]] = self.call(inline[0])
+                    continue
+                if not running:
+                    raise ValueError(f"Pipeline stages {', '.join(sorted(needed))} depend on each other.")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.values[running.pop(future)] = future.result()
+        return {name: self.values[name] for name in targets}
@@ -0,0 +1,226 @@
+import os
+import queue
+import socket
+import stat
+import threading
+import time
+import numpy as np
+from compute_backend import get_backend
+from path_visualization import PathVisualization
+
+G_CONST = 9.80665
+UNIT_SCALES = {"g": 1.0, "m/s2": 1 / G_CONST}
+DEFAULT_REFRESH_HZ = 10
+READ_TIMEOUT = 0.1
+HISTORY_POINTS = 20000
+PATH_POINTS = 5000
+
+def parse_samples(lines, scale=1.0):
+    rows = []
+    for line in lines:
+        fields = line.replace(',', ' ').replace('\t', ' ').split()
+        if len(fields) < 4:
+            continue
+        try:
+            rows.append([float(field) for field in fields[:4]])
+        except ValueError:
+            continue
+    samples = np.array(rows, dtype=np.float64).reshape(-1, 4)
+    samples[:, 1:] *= scale
+    return samples
+
+class FileSource:
+    def __init__(self, path, from_start=False):
+        self.path = path
+        self.from_start = from_start
+
+    def batches(self, stop_event):
+        is_pipe = stat.S_ISFIFO(os.stat(self.path).st_mode)
+        with open(self.path, 'r') as file:
+            if not self.from_start and not is_pipe:
+                file.seek(0, os.SEEK_END)
+            pending = ""
+            while not stop_event.is_set():
+                lines = []
+                chunk = file.readline()
+                while chunk:
+                    pending += chunk
+                    if pending.endswith('\n'):
+                        lines.append(pending)
+                        pending = ""
+                    chunk = file.readline() if len(lines) < 10000 else ""
+                if lines:
+                    yield lines
+                elif is_pipe:
+                    return
+                else:
+                    time.sleep(READ_TIMEOUT)
+
+class SocketSource:
+    def __init__(self, protocol, host, port):
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+
+    def batches(self, stop_event):
+        if self.protocol == "tcp":
+            sock = socket.create_connection((self.host, self.port), timeout=5)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind((self.host, self.port))
+        sock.settimeout(READ_TIMEOUT)
+        pending = b""
+        with sock:
+            while not stop_event.is_set():
+                try:
+                    data = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data and self.protocol == "tcp":
+                    return
+                lines = (pending + data).split(b'\n')
+                pending = lines.pop() if self.protocol == "tcp" else b""
+                yield [line.decode(errors='ignore') for line in lines]
+
+def open_source(spec, from_start=False):
+    for protocol in ("tcp", "udp"):
+        if spec.startswith(f"{protocol}://"):
+            host, _, port = spec[len(protocol) + 3:].rpartition(':')
+            return SocketSource(protocol, host or "127.0.0.1", int(port))
+    return FileSource(spec, from_start)
+
+class StreamReader:
+    def __init__(self, source, scale=1.0):
+        self.source = source
+        self.scale = scale
+        self.queue = queue.Queue()
+        self.stop_event = threading.Event()
+        self.finished = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        try:
+            for lines in self.source.batches(self.stop_event):
+                samples = parse_samples(lines, self.scale)
+                if len(samples):
+                    self.queue.put(samples)
+        except Exception as e:
+            self.error = e
+        self.queue.put(None)
+
+    def drain(self):
+        batches = []
+        while True:
+            try:
+                batch = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                self.finished = True
+            else:
+                batches.append(batch)
+        return np.concatenate(batches) if batches else np.empty((0, 4))
+
+class DecimatedHistory:
+    def __init__(self, max_points=HISTORY_POINTS):
+        self.time = np.empty(2 * max_points)
+        self.values = np.empty((3, 2 * max_points))
+        self.size = 0
+        self.stride = 1
+        self.seen = 0
+
+    def append(self, time_values, values):
+        positions = self.seen + np.arange(len(time_values))
+        self.seen += len(time_values)
+        index = np.flatnonzero(positions % self.stride == 0)
+        while self.size + len(index) > len(self.time):
+            kept = (self.size + 1) // 2
+            self.time[:kept] = self.time[:self.size:2]
+            self.values[:, :kept] = self.values[:, :self.size:2]
+            self.size = kept
+            self.stride *= 2
+            index = np.flatnonzero(positions % self.stride == 0)
+        self.time[self.size:self.size + len(index)] = time_values[index]
+        self.values[:, self.size:self.size + len(index)] = values[:, index]
+        self.size += len(index)
+
+class RingBuffer:
+    def __init__(self, capacity=PATH_POINTS, width=3):
+        self.data = np.zeros((width, capacity))
+        self.size = 0
+        self.head = 0
+
+    def extend(self, values):
+        capacity = self.data.shape[1]
+        values = values[:, -capacity:]
+        n = values.shape[1]
+        first = min(n, capacity - self.head)
+        self.data[:, self.head:self.head + first] = values[:, :first]
+        self.data[:, :n - first] = values[:, first:]
+        self.head = (self.head + n) % capacity
+        self.size = min(self.size + n, capacity)
+
+    def values(self):
+        if self.size < self.data.shape[1]:
+            return self.data[:, :self.size]
+        return np.concatenate([self.data[:, self.head:], self.data[:, :self.head]], axis=1)
+
+class StreamAccumulator:
+    def __init__(self, backend=None, sphere_coords=None, history_points=HISTORY_POINTS, path_points=PATH_POINTS):
+        self.backend = get_backend(backend)
+        self.sphere_coords = sphere_coords if sphere_coords is not None else PathVisualization("live", [], [], [], backend=self.backend)._create_sphere()
+        self.count = 0
+        self.sums = np.zeros(3)
+        self.averages = np.zeros(3)
+        self.magnitude_sum = 0.0
+        self.start_time = None
+        self.last_time = None
+        self.visited = set()
+        self.history = DecimatedHistory(history_points)
+        self.path = RingBuffer(path_points)
+
+    def update(self, samples):
+        if not len(samples):
+            return
+        if self.start_time is None:
+            self.start_time = samples[0, 0]
+        time_in_hours = (samples[:, 0] - self.start_time) / 3600
+        components = samples[:, 1:].T
+        cumulative = np.cumsum(components, axis=1) + self.sums[:, None]
+        averages = cumulative / (self.count + np.arange(1, len(samples) + 1))
+        magnitude = np.sqrt(np.sum(averages**2, axis=0))
+
+        self.sums = cumulative[:, -1].copy()
+        self.count += len(samples)
+        self.averages = averages[:, -1].copy()
+        self.magnitude_sum += float(np.sum(magnitude))
+        self.last_time = time_in_hours[-1]
+        segments = self.backend.segment_ids(components[0], components[1], components[2], self.sphere_coords)
+        self.visited.update(np.unique(segments).tolist())
+        self.history.append(time_in_hours, averages)
+        self.path.extend(components)
+
+    @property
+    def distribution(self):
+        return len(self.visited)
+
+    @property
+    def mean_magnitude(self):
+        return self.magnitude_sum / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            "samples": self.count,
+            "duration_hours": float(self.last_time) if self.last_time is not None else 0.0,
+            "average_components": self.averages.tolist(),
+            "g_magnitude": self.mean_magnitude,
+            "distribution": self.distribution,
+        }
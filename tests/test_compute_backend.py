@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from compute_backend import available_backends, count_distribution, get_backend
+from math_model import ANCHOR_INTERVAL, MathModel
+from path_visualization import PathVisualization
+
+TOLERANCE = 1e-9
+REFERENCE_HOURS = 0.1
+
+def reference_model(duration_hours=REFERENCE_HOURS, scratch_dir=None):
+    return MathModel(2.0, 3.3, 0.05, 0.04, 0.03, duration_hours, 10.0, 25.0, scratch_dir=scratch_dir)
+
+@pytest.fixture(scope="module")
+def reference():
+    time_array, g_array, a_array = reference_model().calculate_acceleration()
+    counts = np.arange(1, len(time_array) + 1)
+    path_vis = PathVisualization("reference", g_array[0], g_array[1], g_array[2], backend="numpy")
+    sphere_coords = path_vis._create_sphere()
+    return {
+        "arrays": (time_array, g_array, a_array, np.cumsum(g_array, axis=1) / counts, np.cumsum(a_array, axis=1) / counts),
+        "sphere_coords": sphere_coords,
+        "distribution": path_vis._get_distribution_num(sphere_coords),
+    }
+
+def check_run(backend, reference, model=None):
+    *arrays, segment_ids = backend.run(model or reference_model(), reference["sphere_coords"])
+    for fast, exact in zip(arrays, reference["arrays"]):
+        np.testing.assert_allclose(fast, exact, rtol=0, atol=TOLERANCE)
+    assert count_distribution(segment_ids) == reference["distribution"]
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backend_matches_model(name, reference):
+    check_run(get_backend(name), reference)
+
+@pytest.mark.parametrize("name", available_backends())
+def test_segment_ids_match_reference_distribution(name, reference):
+    g_array = reference["arrays"][1]
+    segment_ids = get_backend(name).segment_ids(g_array[0], g_array[1], g_array[2], reference["sphere_coords"])
+    assert len(segment_ids) == g_array.shape[1]
+    assert count_distribution(segment_ids) == reference["distribution"]
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_backend("abacus")
+
+@pytest.mark.parametrize("out_of_core", [False, True])
+def test_parallel_partitions_match_reference(out_of_core, reference, tmp_path):
+    backend = get_backend("parallel")
+    backend.workers, backend.min_samples, backend.block_size = 3, 0, 500
+    check_run(backend, reference, reference_model(scratch_dir=str(tmp_path) if out_of_core else None))
+
+@pytest.mark.parametrize("anchor_interval", [100, ANCHOR_INTERVAL])
+def test_recurrence_stays_exact_across_anchors(anchor_interval):
+    model = reference_model(duration_hours=0.5)
+    _, g_exact, a_exact = model.calculate_acceleration()
+    _, g_array, a_array, max_error = model.calculate_acceleration_recurrence(anchor_interval)
+    assert len(g_exact[0]) > 4 * anchor_interval
+    assert max_error < TOLERANCE
+    np.testing.assert_allclose(g_array, g_exact, rtol=0, atol=TOLERANCE)
+    np.testing.assert_allclose(a_array, a_exact, rtol=0, atol=TOLERANCE)
+
+def test_recurrence_backend_reports_error(reference):
+    backend = get_backend("recurrence")
+    backend.anchor_interval = 100
+    check_run(backend, reference)
+    assert backend.max_error < TOLERANCE
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from compute_backend import available_backends
+from path_visualization import PathVisualization
+
+def brute_force_dwell(path_vis, sphere_coords, durations):
+    octants = path_vis._split_sphere(sphere_coords)
+    index = {vertex: k for k, vertex in enumerate(sphere_coords)}
+    dwell = {}
+    for path_row, duration in zip(path_vis.path_coords, durations):
+        candidates = octants[path_vis._get_path_octant(path_row)]
+        nearest = sorted(candidates, key=lambda vertex: path_vis._get_distance_between(path_row, vertex))[:3]
+        cell = tuple(sorted(index[vertex] for vertex in nearest))
+        dwell[cell] = dwell.get(cell, 0.0) + duration
+    return dwell
+
+@pytest.mark.parametrize("name", available_backends())
+def test_dwell_cells_match_brute_force_grouping(name):
+    rng = np.random.default_rng(2)
+    x, y, z = rng.normal(size=(3, 1500))
+    durations = rng.uniform(0.05, 0.2, size=1500)
+    path_vis = PathVisualization("dwell", x, y, z, backend=name)
+    sphere_coords = path_vis._create_sphere()
+    expected = brute_force_dwell(path_vis, sphere_coords, durations)
+
+    cells, dwell = path_vis.dwell_cells(path_vis.get_segment_ids(sphere_coords), durations, sphere_coords)
+    vertices = np.asarray(sphere_coords)
+    cell_keys = sorted(expected)
+    np.testing.assert_array_equal(cells, vertices[np.array(cell_keys)])
+    np.testing.assert_allclose(dwell, [expected[cell] for cell in cell_keys])
+    assert dwell.sum() == pytest.approx(durations.sum())
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from session import ARRAY_ALIGNMENT, load_session, save_session
+
+def test_round_trip_memory_maps_float_arrays(tmp_path):
+    file_path = str(tmp_path / "run.kms")
+    g_array = np.random.default_rng(0).normal(size=(3, 1001))
+    time_array = np.linspace(0.0, 100.0, 1001)
+    segment_ids = np.arange(1001, dtype=np.int64) % 37
+    state = {"inner_rpm": 2.0, "backend": "numpy"}
+    save_session(file_path, state, {"g_array": g_array, "time_array": time_array, "segment_ids": segment_ids})
+
+    loaded_state, arrays = load_session(file_path)
+    assert loaded_state["inner_rpm"] == 2.0 and loaded_state["backend"] == "numpy"
+    assert sorted(loaded_state["arrays"]) == ["g_array", "segment_ids", "time_array"]
+    for name, expected in (("g_array", g_array), ("time_array", time_array)):
+        array = arrays[name]
+        assert isinstance(array, np.memmap)
+        assert array.offset % ARRAY_ALIGNMENT == 0
+        np.testing.assert_array_equal(array, expected)
+    assert not isinstance(arrays["segment_ids"], np.memmap)
+    np.testing.assert_array_equal(arrays["segment_ids"], segment_ids)
+
+def test_missing_array_raises_key_error(tmp_path):
+    file_path = str(tmp_path / "run.kms")
+    save_session(file_path, {}, {"time_array": np.zeros(4)})
+    _, arrays = load_session(file_path)
+    assert "g_array" not in arrays
+    with pytest.raises(KeyError):
+        arrays["g_array"]
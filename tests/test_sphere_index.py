@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from math_model import MathModel
+from sphere_index import cell_count, cell_ids, coverage_profile
+
+LEVELS = 5
+
+def random_directions(samples, seed=0):
+    points = np.random.default_rng(seed).normal(size=(3, samples))
+    return points / np.linalg.norm(points, axis=0)
+
+@pytest.fixture(scope="module")
+def path_directions():
+    _, g_array, _ = MathModel(2.0, 3.3, 0.05, 0.04, 0.03, 0.1, 10.0, 25.0).calculate_acceleration()
+    return g_array / np.linalg.norm(g_array, axis=0)
+
+def test_ids_are_hierarchical_and_in_range():
+    points = random_directions(20000)
+    parents = cell_ids(points, 0)
+    assert parents.min() >= 0 and parents.max() < cell_count(0)
+    for level in range(1, LEVELS + 1):
+        ids = cell_ids(points, level)
+        assert ids.min() >= 0 and ids.max() < cell_count(level)
+        np.testing.assert_array_equal(ids // 4, parents)
+        parents = ids
+
+def test_uniform_directions_reach_every_coarse_cell():
+    points = random_directions(50000, seed=1)
+    for level in range(3):
+        assert len(np.unique(cell_ids(points, level))) == cell_count(level)
+
+def test_coverage_profile_matches_direct_binning(path_directions):
+    profile = coverage_profile(path_directions, LEVELS)
+    assert [entry["level"] for entry in profile] == list(range(LEVELS + 1))
+    for entry in profile:
+        visited = len(np.unique(cell_ids(path_directions, entry["level"])))
+        assert entry["cells"] == cell_count(entry["level"])
+        assert entry["visited"] == visited
+        assert entry["coverage"] == pytest.approx(visited / entry["cells"])
@@ -0,0 +1,64 @@
+import threading
+import pytest
+from stage_graph import StageGraph
+
+def recording_graph(calls):
+    graph = StageGraph(workers=4)
+    graph.set("x", 2)
+
+    def stage(name, function):
+        def run(*args):
+            calls.append(name)
+            return function(*args)
+        return run
+
+    graph.add("double", stage("double", lambda x: 2 * x), ["x"])
+    graph.add("square", stage("square", lambda x: x * x), ["x"])
+    graph.add("total", stage("total", lambda a, b: a + b), ["double", "square"])
+    return graph
+
+def test_inputs_run_before_dependents():
+    calls = []
+    assert recording_graph(calls).run("total") == {"total": 8}
+    assert calls[-1] == "total"
+    assert sorted(calls[:2]) == ["double", "square"]
+
+def test_stages_are_memoized_and_invalidated():
+    calls = []
+    graph = recording_graph(calls)
+    graph.run("total")
+    graph.run("total", "double")
+    assert len(calls) == 3
+
+    graph.set("x", 3)
+    assert graph.run("total") == {"total": 15}
+    assert len(calls) == 6
+
+def test_main_thread_stages_run_on_the_caller():
+    threads = {}
+    graph = StageGraph(workers=2)
+    graph.add("worker", lambda: threads.setdefault("worker", threading.current_thread()))
+    graph.add("main", lambda value: threads.setdefault("main", threading.current_thread()), ["worker"], main_thread=True)
+    graph.run("main")
+    assert threads["main"] is threading.current_thread()
+    assert threads["worker"] is not threading.current_thread()
+
+@pytest.mark.parametrize("main_thread", [False, True])
+def test_stage_errors_propagate(main_thread):
+    def fail():
+        raise ZeroDivisionError("stage failed")
+
+    graph = StageGraph()
+    graph.add("broken", fail, main_thread=main_thread)
+    graph.add("after", lambda value: value, ["broken"])
+    with pytest.raises(ZeroDivisionError):
+        graph.run("after")
+
+def test_cycles_and_unknown_stages_are_rejected():
+    graph = StageGraph()
+    graph.add("a", lambda b: b, ["b"])
+    graph.add("b", lambda a: a, ["a"])
+    with pytest.raises(ValueError, match="depend on each other"):
+        graph.run("a")
+    with pytest.raises(ValueError, match="Unknown pipeline stage"):
+        graph.run("missing")